@@ -4,11 +4,16 @@ import logging
 import re
 import json
 import asyncio
+import codecs
 import html
+import time
 from dataclasses import dataclass
-from typing import Optional, Dict, Any, List, Tuple
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Optional, Dict, Any, List, Tuple, Mapping, Iterator
 import aiohttp
-from urllib.parse import urljoin as _urljoin
+from yarl import URL
+from urllib.parse import parse_qs, urlencode, urljoin as _urljoin, urlparse
 
 from .exceptions import InfoMentorAuthError, InfoMentorConnectionError
 
@@ -18,11 +23,31 @@ HUB_BASE_URL = "https://hub.infomentor.se"
 MODERN_BASE_URL = "https://im.infomentor.se"
 LEGACY_BASE_URL = "https://infomentor.se/swedish/production/mentor/"
 
-# Request delay to be respectful to InfoMentor servers
+# Minimum spacing between request starts to a host that has signalled throttling;
+# hosts that have not are not delayed at all
 REQUEST_DELAY = 0.3  # Reduced from 0.8s to 0.3s - mobile apps are typically faster
 
+# Back-off after a throttled response without a usable Retry-After: REQUEST_DELAY
+# doubled per consecutive throttled response, capped here. Server-provided
+# Retry-After values are capped to the same bound.
+THROTTLE_BACKOFF_MAX = 30.0
+
+# Upper bound on requests one InfoMentorAuth has in flight at once, so concurrent
+# verification, diagnostics and pupil switches cannot fan out without limit
+MAX_CONCURRENT_REQUESTS = 8
+
+# Server-side sessions typically time out after about 8 hours
+AUTH_TTL_SECONDS = 8 * 3600
+
+# A successful authentication check is trusted for this long, so repeated
+# verification within one login flow does not re-probe every endpoint
+AUTH_VERIFY_CACHE_SECONDS = 5.0
+
+# A confirmed pupil switch is assumed to still hold on the server for this long
+PUPIL_SWITCH_TTL_SECONDS = 10.0
+
 # Headers to mimic modern browser behaviour more closely
-DEFAULT_HEADERS = {
+DEFAULT_HEADERS: Mapping[str, str] = MappingProxyType({
 	"Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
 	"Accept-Encoding": "gzip, deflate, br, zstd",
 	"Accept-Language": "sv-SE,sv;q=0.9,en-US;q=0.8,en;q=0.7",
@@ -35,7 +60,297 @@ DEFAULT_HEADERS = {
 	"Sec-Fetch-User": "?1",
 	"Upgrade-Insecure-Requests": "1",
 	"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36",
-}
+})
+
+# Pre-built, read-only header sets for the three OAuth form POSTs.
+# aiohttp copies request headers into its own multidict, so sharing is safe.
+_OAUTH_LOGIN_REFERER = f"{HUB_BASE_URL}/authentication/authentication/login?apitype=im1&forceOAuth=true"
+_OAUTH_TOKEN_POST_HEADERS: Mapping[str, str] = MappingProxyType({
+	**DEFAULT_HEADERS,
+	"Content-Type": "application/x-www-form-urlencoded",
+	"Origin": HUB_BASE_URL,
+	"Referer": _OAUTH_LOGIN_REFERER,
+	"Sec-Fetch-Site": "cross-site",
+	"Sec-Fetch-Dest": "document",
+})
+_CREDENTIALS_POST_HEADERS: Mapping[str, str] = MappingProxyType({
+	**DEFAULT_HEADERS,
+	"Content-Type": "application/x-www-form-urlencoded",
+	"Origin": "https://infomentor.se",
+	"Sec-Fetch-Site": "same-origin",
+	"Sec-Fetch-Dest": "document",
+})
+# Fields that press the login button on the credential form. They never change,
+# so they are encoded once and appended to the per-login part of the body.
+_LOGIN_BUTTON_FIELDS: Mapping[str, str] = MappingProxyType({
+	'__EVENTTARGET': 'login_ascx$btnLogin',
+	'__EVENTARGUMENT': '',
+})
+_LOGIN_BUTTON_FORM_SUFFIX = b"&" + urlencode(_LOGIN_BUTTON_FIELDS).encode()
+_SECOND_OAUTH_TOKEN_POST_HEADERS: Mapping[str, str] = MappingProxyType({
+	**_OAUTH_TOKEN_POST_HEADERS,
+	"Sec-Fetch-Site": "same-site",
+})
+
+# Read-only header sets for requests whose Referer never changes
+_LOGIN_CALLBACK_REFERER_HEADERS: Mapping[str, str] = MappingProxyType({
+	**DEFAULT_HEADERS,
+	"Referer": f"{HUB_BASE_URL}/Authentication/Authentication/LoginCallback",
+})
+_HUB_ROOT_REFERER_HEADERS: Mapping[str, str] = MappingProxyType({**DEFAULT_HEADERS, "Referer": f"{HUB_BASE_URL}/"})
+_DIRECT_LOGIN_POST_HEADERS: Mapping[str, str] = MappingProxyType({
+	**DEFAULT_HEADERS,
+	"Content-Type": "application/x-www-form-urlencoded",
+	"Referer": LEGACY_BASE_URL,
+	"Origin": "https://infomentor.se",
+})
+
+# Delay before the modern switch endpoint is tried alongside the hub one
+SWITCH_HEDGE_DELAY = 0.2
+
+# Back-off between checks that a pupil switch has reached the hub session
+SWITCH_CONFIRM_DELAYS = (0.05, 0.1, 0.2, 0.4)
+_SELECTED_PUPIL_NAME_RE = re.compile(r'selectedPupilName\s*:\s*["\']([^"\']+)["\']', re.IGNORECASE)
+
+# Pupil switch requests only differ in their Referer
+_HUB_SWITCH_HEADERS: Mapping[str, str] = MappingProxyType({**DEFAULT_HEADERS, "Referer": f"{HUB_BASE_URL}/#/"})
+_MODERN_SWITCH_HEADERS: Mapping[str, str] = MappingProxyType({**DEFAULT_HEADERS, "Referer": f"{MODERN_BASE_URL}/"})
+
+# Body markers used to judge the page returned after the second OAuth token.
+# They are matched against one lowercased copy of the body: CPython's substring
+# search over that copy is several times faster than a case-insensitive regex
+# alternation, which falls back to a per-character scan.
+_AUTH_SUCCESS_MARKERS = ("dashboard", "logout", "pupil", "elev")
+_AUTH_FAILURE_MARKERS = ("login_ascx", "txtnotandanafn", "txtlykilord", "invalid", "fel")
+
+# Lowercased field names of the InfoMentor credential form, and the broader set
+# that also recognises a generic login form
+_CREDENTIAL_FIELD_MARKERS = ("txtnotandanafn", "txtlykilord")
+_LOGIN_FORM_FIELD_MARKERS = _CREDENTIAL_FIELD_MARKERS + ("password", "username")
+
+# Lowercased body markers showing the LoginCallback page already has pupil data
+_CALLBACK_PUPIL_MARKERS = ("pupil", "elev", "student", "dashboard")
+
+# Signs that the credential POST was accepted even though no second OAuth token
+# followed: the final URL, then the lowercased body
+_CREDENTIALS_ACCEPTED_URL_MARKERS = ("default.aspx", "hub.infomentor.se")
+_CREDENTIALS_ACCEPTED_MARKERS = ("logout", "dashboard")
+
+# Markers for the dashboard reached after LoginCallback, and for the page returned
+# by the direct-login form; matched the same way, against one lowercased copy
+_DASHBOARD_PUPIL_MARKERS = ("pupil", "elev", "student")
+_DASHBOARD_LOGIN_MARKERS = ("login", "authentication")
+_DIRECT_LOGIN_SUCCESS_MARKERS = (
+	"student-menu",  # Main menu for students
+	"pupil-selection",  # Pupil selection
+	"dashboard",  # Dashboard elements
+	"mentor-main",  # Main mentor interface
+	"logout",  # Logout link indicates successful login
+	"logga ut",  # Swedish logout
+)
+_DIRECT_LOGIN_ERROR_MARKERS = ("felaktigt", "error", "failed", "invalid", "wrong")  # "felaktigt" is Swedish for incorrect
+
+# Markers of an authenticated page, matched against the raw (undecoded) body.
+# "switchpupil" needs no entry of its own as it always contains "pupil".
+_AUTH_INDICATORS = (b"logout", b"pupil", b"elev", b"dashboard")
+
+
+# OAuth token and ASP.NET form field patterns used during the credential flow
+_OAUTH_TOKEN_VALUE_RE = re.compile(r'oauth_token"\s+value="([\w+=/]+)"')
+_OAUTH_TOKEN_INPUT_RE = re.compile(r'<input[^>]*name=["\']oauth_token["\'][^>]*value=["\']([^"\']+)["\']', re.IGNORECASE)
+_OAUTH_TOKEN_PARAM_RE = re.compile(r'oauth_token=([^&"\']+)')
+_VIEWSTATE_FIELDS = ('__VIEWSTATE', '__VIEWSTATEGENERATOR', '__EVENTVALIDATION')
+_VIEWSTATE_FIELD_RE = re.compile(r'(__VIEWSTATE|__VIEWSTATEGENERATOR|__EVENTVALIDATION)["\'][^>]*value=["\']([^"\']+)["\']')
+_HIDDEN_INPUT_RE = re.compile(r'<input[^>]*type=["\']hidden["\'][^>]*name=["\']([^"\']+)["\'][^>]*value=["\']([^"\']*)["\']', re.IGNORECASE)
+
+# Pupil data embedded in the hub page, in the order they are tried. Each pattern
+# stops just before the opening bracket of a JSON value; the value itself is
+# decoded from there with _decode_json_at, which balances nested brackets and
+# never backtracks the way a lazy ".*?" capture does on large pages.
+# Every pattern is paired with a lowercase literal that any match must contain,
+# so patterns whose keyword is absent from the page are never run.
+_JSON_PUPIL_PATTERNS: Tuple[Tuple[str, re.Pattern], ...] = tuple((keyword, re.compile(p, re.IGNORECASE)) for keyword, p in (
+	# InfoMentor Hub specific patterns (for modern hub interface)
+	('imhome', r'IMHome\.home\.homeData\s*=\s*(?=\{)'),  # The homeData object with pupil info
+	('pupils', r'"pupils"\s*:\s*(?=\[)'),                # The pupils array specifically
+	('imhome', r'IMHome\s*=\s*(?=\{)'),                  # The main IMHome JavaScript object
+	('init', r'init\s*:\s*(?=\{)'),                      # The init object within IMHome
+	
+	# Standard JSON assignment patterns
+	('pupils', r'var\s+pupils\s*=\s*(?=\[)'),
+	('pupils', r'pupils\s*:\s*(?=\[)'),
+	('children', r'"?children"?\s*:\s*(?=\[)'),  # Quoted or bare key
+	('students', r'"?students"?\s*:\s*(?=\[)'),
+	
+	# Angular/Vue.js data patterns
+	('ng-init', r'ng-init[^>]*pupils\s*=\s*(?=\[)'),
+	('v-data', r'v-data[^>]*pupils\s*=\s*(?=\[)'),
+	('data-pupils', r'data-pupils=["\'](?=\[)'),
+	
+	# Look specifically for pupil switcher data
+	('switchpupilurl', r'"switchPupilUrl"[^}]*"hybridMappingId"[^}]*(?=\{)'),
+))
+_HOMEDATA_RE = re.compile(r'IMHome\.home\.homeData\s*=\s*(?=\{)', re.IGNORECASE)
+_JSON_DECODER = json.JSONDecoder()
+_IMHOME_INIT_RE = re.compile(r'IMHome\s*=\s*\{[^}]*init\s*:\s*\{([^}]*selectedPupilName[^}]*)\}', re.DOTALL | re.IGNORECASE)
+_INIT_PUPIL_ID_RE = re.compile(r'(\d{6,12})')  # Extended range for longer IDs
+_HYBRID_PUPIL_RE = re.compile(r'"hybridMappingId"\s*:\s*"[^|]*\|(\d{4,8})\|[^"]*"[^}]*"name"\s*:\s*"([^"]+)"', re.IGNORECASE | re.DOTALL)
+
+# Pattern prefixes that, followed by an ID, tie that ID to a pupil or to a
+# parent/user account. The ID differs per call, so these are joined at use.
+_PUPIL_ID_CONTEXTS = ('SwitchPupil/', '"pupilId".*', '"elevId".*', '"studentId".*')
+_PARENT_ID_CONTEXTS = ('"userId".*', '"parentId".*', '"guardianId".*', 'parent.*', 'guardian.*')
+
+# Name fragments that mark a parent, user or system account rather than a pupil
+_NON_PUPIL_NAME_MARKERS = (
+	'parent', 'förälder', 'guardian', 'vårdnadshavare',
+	'user', 'användare', 'account', 'konto',
+	'admin', 'administrator', 'staff', 'personal',
+	'@', 'email', 'mail'  # Email addresses
+)
+
+# Pupil switcher entries (switch ID and name), read for pupil discovery and the switch ID mapping
+_SWITCH_PUPIL_RE = re.compile(r'"switchPupilUrl"\s*:\s*"[^"]*SwitchPupil/(\d+)"[^}]*"name"\s*:\s*"([^"]+)"', re.IGNORECASE)
+_HYBRID_MAPPING_ID_RE = re.compile(r'"hybridMappingId"\s*:\s*"[^|]*\|(\d+)\|')
+
+# Pupil ID patterns on the legacy default page
+_LEGACY_PUPIL_PATTERNS: Tuple[re.Pattern, ...] = tuple(re.compile(p, re.IGNORECASE) for p in (
+	r'pupil[^0-9]*(\d+)',
+	r'elevid[^0-9]*(\d+)',
+	r'id["\']?\s*:\s*["\']?(\d+)["\']?',
+))
+
+# Pupil ID patterns on the legacy dashboard. The specific ones name a pupil field
+# or an embedded JSON array; the fuzzy catch-alls match almost any number near a
+# keyword and only run when the specific ones find nothing.
+_LEGACY_DASHBOARD_SPECIFIC_PATTERNS: Tuple[re.Pattern, ...] = tuple(re.compile(p, re.IGNORECASE | re.DOTALL) for p in (
+	r'data-pupil-id=["\']?(\d+)["\']?',
+	r'pupil-id["\']?\s*:\s*["\']?(\d+)["\']?',
+	# Look for JavaScript arrays/objects with pupil data
+	r'var\s+pupils\s*=\s*(\[.*?\]);',
+	r'pupils\s*:\s*(\[.*?\])',
+	r'children\s*:\s*(\[.*?\])',
+	r'"children"\s*:\s*(\[.*?\])',
+	r'students\s*:\s*(\[.*?\])',
+	r'"students"\s*:\s*(\[.*?\])',
+))
+_LEGACY_DASHBOARD_FUZZY_PATTERNS: Tuple[re.Pattern, ...] = _LEGACY_PUPIL_PATTERNS + (
+	re.compile(r'value=["\']?(\d{8,12})["\']?', re.IGNORECASE),  # 8-12 digit IDs
+)
+_PUPIL_ID_DIGITS_RE = re.compile(r'["\']?(\d{8,12})["\']?')
+
+# Base headers for the auto-submitted OpenID form; only the Referer is added per
+# post. Posts to an InfoMentor host send its Origin and are cross-site when the
+# form came from the hub; posts to an external IdP send the hub Origin.
+_INFOMENTOR_DOMAIN = "infomentor.se"
+_HUB_HOST = urlparse(HUB_BASE_URL).hostname
+_OPENID_SAME_ORIGIN_HEADERS: Mapping[str, str] = MappingProxyType({
+	**DEFAULT_HEADERS,
+	"Origin": "https://infomentor.se",
+	"Sec-Fetch-Site": "same-origin",
+	"Sec-Fetch-Dest": "document",
+})
+_OPENID_CROSS_SITE_HEADERS: Mapping[str, str] = MappingProxyType({
+	**_OPENID_SAME_ORIGIN_HEADERS,
+	"Sec-Fetch-Site": "cross-site",
+})
+_OPENID_EXTERNAL_ACTION_HEADERS: Mapping[str, str] = MappingProxyType({
+	**_OPENID_SAME_ORIGIN_HEADERS,
+	"Origin": HUB_BASE_URL,
+})
+_OPENID_FORM_MARKERS = ('id="openid_message"', "id='openid_message'")
+# Auth method selection page: texts of the offered login methods (case-sensitive)
+_PASSWORD_OPTION_INDICATORS = (
+	"Lösenord",          # Swedish
+	"Password",          # English
+	"L%C3%B6senord",     # URL encoded
+	"L&#246;senord",     # HTML entity encoded
+	"L&#37;c3&#37;b6senord", # Double URL encoded
+	"lösenord",          # Lowercase
+	"password",          # Lowercase English
+)
+_AUTH_METHOD_INDICATORS = _PASSWORD_OPTION_INDICATORS + (
+	"smartid",           # SmartID (might be in the content)
+	"SmartID",           # SmartID capitalized
+	"App",               # App authentication
+	"Tjänstekort",       # Service card
+	"Tj&#228;nstekort",  # HTML entity encoded service card
+	"SAML",              # SAML authentication
+)
+# Auth method selection: links to the password login, most specific first
+_PASSWORD_LINK_RES = tuple(
+	re.compile(pattern, re.IGNORECASE | re.DOTALL)
+	for pattern in (
+		r'<a[^>]*href=["\']([^"\']*L[^"\']*c3[^"\']*b6senord[^"\']*)["\'][^>]*>.*?L&#246;senord.*?</a>',  # HTML entity with URL check
+		r'<a[^>]*href=["\']([^"\']*)["\'][^>]*>.*?Lösenord.*?</a>',
+		r'<a[^>]*href=["\']([^"\']*)["\'][^>]*>.*?Password.*?</a>',
+		r'<a[^>]*href=["\']([^"\']*)["\'][^>]*>.*?lösenord.*?</a>',
+		r'<a[^>]*href=["\']([^"\']*)["\'][^>]*>.*?password.*?</a>',
+		r'<a[^>]*href=["\']([^"\']*)["\'][^>]*>.*?L&#246;senord.*?</a>',  # HTML entity fallback
+		r'<a[^>]*href=["\']([^"\']*)["\'][^>]*>.*?L&#37;c3&#37;b6senord.*?</a>',  # Double encoded fallback
+	)
+)
+# Direct credential login form: action and credential inputs
+_LOGIN_FORM_ACTION_RE = re.compile(r'<form[^>]*action=["\']([^"\']*)["\'][^>]*>', re.IGNORECASE)
+_USERNAME_FIELD_RES = (
+	re.compile(r'<input[^>]*name=["\']([^"\']*)["\'][^>]*(?:type=["\']text["\']|type=["\']email["\'])', re.IGNORECASE),
+	re.compile(r'<input[^>]*(?:type=["\']text["\']|type=["\']email["\'])[^>]*name=["\']([^"\']*)["\']', re.IGNORECASE),
+)
+_PASSWORD_FIELD_RES = (
+	re.compile(r'<input[^>]*name=["\']([^"\']*)["\'][^>]*type=["\']password["\']', re.IGNORECASE),
+	re.compile(r'<input[^>]*type=["\']password["\'][^>]*name=["\']([^"\']*)["\']', re.IGNORECASE),
+)
+# School selection page: the repeater's url/number inputs and title spans
+_IDP_REPEATER_INPUT_RE = re.compile(r'<input\b[^>]*IdpListRepeater\$ctl\d+\$(?:url|number)[^>]*>', re.IGNORECASE)
+_IDP_REPEATER_FIELD_RE = re.compile(r'login_ascx\$IdpListRepeater\$ctl(\d+)\$(url|number)', re.IGNORECASE)
+_IDP_REPEATER_TITLE_RE = re.compile(r'<span[^>]*id=["\']login_ascx_IdpListRepeater_ctl(\d+)_title["\'][^>]*>([^<]+)</span>', re.IGNORECASE)
+_OPENID_FORM_TAG_RE = re.compile(r'<form\b[^>]*\bid=["\']openid_message["\'][^>]*>', re.IGNORECASE)
+_FORM_END_RE = re.compile(r'</form\s*>', re.IGNORECASE)
+_INPUT_TAG_RE = re.compile(r'<input\b[^>]*>', re.IGNORECASE)
+# One attribute of an already-isolated tag: double-quoted, single-quoted or bare value
+_TAG_ATTRIBUTE_RE = re.compile(r'([^\s=/>"\']+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s"\'>]+))')
+# Hub dashboard: auto-submit form target, and the login link on the error page
+_FORM_ACTION_RE = re.compile(r'action=["\']([^"\']+)["\']', re.IGNORECASE)
+_HUB_LOGIN_LINK_RE = re.compile(r'href=\"(https://hub\.infomentor\.se[^\"]*Authentication/Authentication/Login[^\"]*)\"', re.IGNORECASE)
+
+# Diagnostic probes only look for short markers; plain gzip keeps the transfer
+# small and is always decodable incrementally by aiohttp
+_DIAGNOSTIC_HEADERS: Mapping[str, str] = MappingProxyType({**DEFAULT_HEADERS, "Accept-Encoding": "gzip"})
+_DIAG_TIMEOUT = aiohttp.ClientTimeout(total=5.0, connect=2.0)
+
+# Shared request timeouts; ClientTimeout is immutable so one instance serves every call
+_SWITCH_TIMEOUT = aiohttp.ClientTimeout(total=30.0, connect=10.0)
+_SHORT_REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=10)
+# Default for every auth request that does not pass its own; bounds a stalled TLS
+# handshake or response instead of falling back to the session's five minutes
+_LOGIN_TIMEOUT = aiohttp.ClientTimeout(total=30.0, connect=10.0)
+
+# Pages that only render with authenticated content. The hub's "/#/" variant is
+# the same request on the wire as "/", so it is not probed separately.
+_AUTH_VERIFY_ENDPOINTS: Tuple[str, ...] = (
+	f"{HUB_BASE_URL}/",
+	f"{MODERN_BASE_URL}/",
+	"https://infomentor.se/Swedish/Production/mentor/default.aspx",
+)
+
+# Upper bound on a whole diagnose_auth_state run, across all probes
+DIAGNOSTIC_DEADLINE_SECONDS = 8.0
+
+# Endpoints probed by diagnose_auth_state as (name, url, method). Only the legacy
+# page is checked for auth content; the others just need a status, so HEAD
+# skips their bodies. The hub's "/#/" fragment never reaches the server, so
+# only the hub root is probed.
+_DIAGNOSTIC_PROBES: Tuple[Tuple[str, str, str], ...] = (
+	("hub_root", f"{HUB_BASE_URL}/", "HEAD"),
+	("modern_root", f"{MODERN_BASE_URL}/", "HEAD"),
+	("legacy_default", "https://infomentor.se/Swedish/Production/mentor/default.aspx", "GET"),
+)
+
+
+# Cookies that carry the authenticated session, and the hosts whose cookies are
+# backed up and restored
+_ESSENTIAL_COOKIES = frozenset({'ASP.NET_SessionId', '.ASPXAUTH'})
+_INFOMENTOR_COOKIE_URLS: Tuple[URL, ...] = (URL(HUB_BASE_URL), URL(MODERN_BASE_URL), URL(LEGACY_BASE_URL))
 
 
 # Debug file paths
@@ -44,12 +359,29 @@ DEBUG_FILE_OAUTH = "/tmp/infomentor_debug_oauth.html"
 DEBUG_FILE_DASHBOARD = "/tmp/infomentor_debug_dashboard.html"
 
 
+# Debug file writes in flight; held so the tasks are not garbage collected
+_DEBUG_WRITE_TASKS: set[asyncio.Task] = set()
+
+
+def _dump_debug_file(path: str, content: str) -> None:
+	"""Save a debugging copy of a page without holding up the caller.
+
+	The files are debugging aids only, so nothing is written unless DEBUG logging
+	is enabled for this module. The write runs as a background task that the
+	login flow never waits for. Must be called from within a running event loop.
+	"""
+	if not _LOGGER.isEnabledFor(logging.DEBUG):
+		return
+	task = asyncio.get_running_loop().create_task(_write_text_file_async(path, content))
+	_DEBUG_WRITE_TASKS.add(task)
+	task.add_done_callback(_DEBUG_WRITE_TASKS.discard)
+
+
 async def _write_text_file_async(path: str, content: str) -> None:
 	"""Write text to a file off the event loop to avoid blocking.
 
 	This uses asyncio.to_thread to ensure file IO does not block the HA event loop.
 	"""
-
 	def _write():
 		with open(path, 'w', encoding='utf-8') as f:
 			f.write(content)
@@ -58,7 +390,144 @@ async def _write_text_file_async(path: str, content: str) -> None:
 		await asyncio.to_thread(_write)
 	except Exception as err:
 		# Keep failures quiet at debug level to avoid noisy logs
-		_LOGGER.debug(f"Could not save debug file {path}: {err}")
+		_LOGGER.debug("Could not save debug file %s: %s", path, err)
+	else:
+		_LOGGER.debug("Saved debug file %s", path)
+
+
+def _tag_attributes(tag: str) -> Dict[str, str]:
+	"""Parse the attributes of a single start tag, in any order.
+	
+	Names are lowercased and values have their HTML entities decoded, as a
+	browser would submit them. The first occurrence of a name wins.
+	"""
+	attributes: Dict[str, str] = {}
+	for name, double_quoted, single_quoted, bare in _TAG_ATTRIBUTE_RE.findall(tag):
+		attributes.setdefault(name.lower(), html.unescape(double_quoted or single_quoted or bare))
+	return attributes
+
+
+def _parse_openid_form(page: str) -> Tuple[str, Dict[str, str]]:
+	"""Return the action and hidden inputs of the auto-submit OpenID form.
+	
+	Only inputs between the form's start tag and its closing tag are collected.
+	Attributes may come in any order. The action falls back to the legacy base
+	URL when the form has none.
+	"""
+	form_match = _OPENID_FORM_TAG_RE.search(page)
+	if not form_match:
+		return LEGACY_BASE_URL, {}
+	action_url = _tag_attributes(form_match.group(0)).get('action') or LEGACY_BASE_URL
+	end_match = _FORM_END_RE.search(page, form_match.end())
+	end = end_match.start() if end_match else len(page)
+	inputs: Dict[str, str] = {}
+	for input_match in _INPUT_TAG_RE.finditer(page, form_match.end(), end):
+		attributes = _tag_attributes(input_match.group(0))
+		if attributes.get('type', '').lower() == 'hidden' and 'name' in attributes:
+			inputs[attributes['name']] = attributes.get('value', '')
+	return action_url, inputs
+
+
+def _has_openid_form(page: str) -> bool:
+	"""Whether the page carries the auto-submit OpenID/WS-Fed form.
+	
+	Pages without the form, the common case, are rejected by a single scan for
+	the bare id before the quoted variants are checked.
+	"""
+	return 'openid_message' in page and any(marker in page for marker in _OPENID_FORM_MARKERS)
+
+
+async def _response_contains(resp: "aiohttp.ClientResponse", needles: Tuple[bytes, ...], chunk_size: int = 65536) -> bool:
+	"""Stream the response body and stop at the first chunk containing any needle.
+
+	Needles must be lowercase; each chunk is lowercased once and searched with
+	plain substring checks. A short tail of the previous chunk is carried over
+	so needles split across chunk boundaries are still found.
+	"""
+	overlap = max(map(len, needles)) - 1
+	tail = b""
+	async for chunk in resp.content.iter_chunked(chunk_size):
+		window = tail + chunk.lower()
+		if any(needle in window for needle in needles):
+			return True
+		tail = window[-overlap:]
+	return False
+
+
+def _decode_json_at(text: str, pos: int) -> Any:
+	"""Decode the JSON value starting at text[pos]; None if it is not valid JSON."""
+	try:
+		return _JSON_DECODER.raw_decode(text, pos)[0]
+	except ValueError:
+		return None
+
+
+async def _response_search(resp: "aiohttp.ClientResponse", pattern: "re.Pattern[str]", overlap: int = 512, chunk_size: int = 65536) -> Optional["re.Match[str]"]:
+	"""Stream the response body and return the first match of pattern.
+
+	Chunks are decoded incrementally with the response charset. The last
+	``overlap`` characters are carried over so a match split across chunk
+	boundaries is still found, provided it is no longer than that. The rest of
+	the body is not read once a match is found.
+	"""
+	decoder = codecs.getincrementaldecoder(resp.charset or "utf-8")(errors="replace")
+	tail = ""
+	async for chunk in resp.content.iter_chunked(chunk_size):
+		window = tail + decoder.decode(chunk)
+		match = pattern.search(window)
+		if match:
+			return match
+		tail = window[-overlap:]
+	return pattern.search(tail + decoder.decode(b"", final=True))
+
+
+class _RequestPacer:
+	"""Delay requests to a host only after it has signalled throttling.
+	
+	A 429 or 503 response, or ``X-RateLimit-Remaining: 0``, holds the host back
+	for its ``Retry-After`` or an exponential back-off, and request starts to it
+	are then spaced at least ``interval`` seconds apart. The next successful
+	response clears that state, so an unthrottled login is never delayed.
+	"""
+	
+	def __init__(self, interval: float) -> None:
+		self._interval = interval
+		self._next_start: Dict[str, float] = {}
+		self._strikes: Dict[str, int] = {}  # Consecutive throttled responses per host
+	
+	async def wait(self, url: str) -> None:
+		host = urlparse(url).netloc
+		if host not in self._strikes:
+			return
+		loop = asyncio.get_running_loop()
+		now = loop.time()
+		start = max(now, self._next_start.get(host, 0.0))
+		# Reserve the slot before sleeping so concurrent callers queue up behind it
+		self._next_start[host] = start + self._interval
+		if start > now:
+			await asyncio.sleep(start - now)
+	
+	def observe(self, resp: "aiohttp.ClientResponse") -> None:
+		"""Update the host's throttling state from a received response."""
+		host = resp.url.raw_authority
+		throttled = resp.status in (429, 503) or resp.headers.get("X-RateLimit-Remaining") == "0"
+		if not throttled:
+			if host in self._strikes:
+				del self._strikes[host]
+				self._next_start.pop(host, None)
+			return
+		strikes = self._strikes.get(host, 0) + 1
+		self._strikes[host] = strikes
+		retry_after = resp.headers.get("Retry-After", "")
+		if retry_after.isdigit():
+			delay = float(retry_after)
+		else:
+			# HTTP-date values are rare here; treat them like a missing header
+			delay = self._interval * 2 ** strikes
+		now = asyncio.get_running_loop().time()
+		hold_until = now + min(delay, THROTTLE_BACKOFF_MAX)
+		self._next_start[host] = max(self._next_start.get(host, 0.0), hold_until)
+		_LOGGER.debug("Throttled by %s (status %s); holding requests for %.1fs", host, resp.status, hold_until - now)
 
 
 class _FormSubmissionResult:
@@ -77,81 +546,141 @@ class SchoolOption:
 	number: Optional[str] = None
 
 
-async def _auto_submit_openid_form(session: aiohttp.ClientSession, html: str, referer: str) -> _FormSubmissionResult:
+def _parse_school_options(page: str) -> List[Tuple[str, SchoolOption]]:
+	"""Collect the school options of an IdpListRepeater selection page.
+	
+	The url/number inputs and the title spans are each read in one pass over
+	the page, then joined on their repeater control id. Options keep the order
+	of their url inputs; a control without a title is skipped.
+	
+	Returns:
+		(control id, option) pairs
+	"""
+	urls: Dict[str, str] = {}
+	numbers: Dict[str, str] = {}
+	for input_match in _IDP_REPEATER_INPUT_RE.finditer(page):
+		attributes = _tag_attributes(input_match.group(0))
+		field_match = _IDP_REPEATER_FIELD_RE.fullmatch(attributes.get('name', ''))
+		if not field_match or 'value' not in attributes:
+			continue
+		control_id, field = field_match.groups()
+		fields = urls if field.lower() == 'url' else numbers
+		fields.setdefault(control_id, attributes['value'].strip())
+	
+	titles: Dict[str, str] = {}
+	for control_id, raw_title in _IDP_REPEATER_TITLE_RE.findall(page):
+		titles.setdefault(control_id, html.unescape(raw_title.strip()))
+	
+	return [
+		(control_id, SchoolOption(title=titles[control_id], url=url, number=numbers.get(control_id)))
+		for control_id, url in urls.items()
+		if control_id in titles
+	]
+
+
+async def _auto_submit_openid_form(session: aiohttp.ClientSession, page: str, referer: str, pacer: Optional[_RequestPacer] = None) -> _FormSubmissionResult:
 	"""Detect and auto-submit OpenID/WS-Fed forms present in HTML.
 
 	Returns _FormSubmissionResult with executed flag and last response data.
 	"""
 	try:
-		import re as _re
-		if 'id="openid_message"' not in html and 'id=\'openid_message\'' not in html:
+		if not _has_openid_form(page):
 			return _FormSubmissionResult(False)
 		# Loop a few times in case of chained auto-submit forms
-		current_html = html
+		current_html = page
 		current_url = referer
 		for _ in range(3):
-			if 'id="openid_message"' not in current_html and 'id=\'openid_message\'' not in current_html:
+			if not _has_openid_form(current_html):
 				break
-			# Extract form action
-			action_match = _re.search(r'<form[^>]*id=["\']openid_message["\'][^>]*action=["\']([^"\']+)["\']', current_html, _re.IGNORECASE)
-			action_url = action_match.group(1) if action_match else LEGACY_BASE_URL
+			# Extract form action and hidden inputs
+			action_url, inputs = _parse_openid_form(current_html)
 			# Normalise relative action
 			if action_url and not action_url.startswith('http'):
 				action_url = _urljoin(current_url, action_url)
-			# Extract hidden inputs
-			inputs = {}
-			for name, value in _re.findall(r'<input[^>]*type=["\']hidden["\'][^>]*name=["\']([^"\']+)["\'][^>]*value=["\']([^"\']*)["\']', current_html, _re.IGNORECASE):
-				inputs[name] = value
 			# Post the form
-			headers = DEFAULT_HEADERS.copy()
-			headers.update({
-				"Content-Type": "application/x-www-form-urlencoded",
-				"Origin": HUB_BASE_URL if "infomentor.se" not in action_url else "https://infomentor.se",
-				"Referer": current_url,
-				"Sec-Fetch-Site": "cross-site" if "hub.infomentor.se" in current_url and "infomentor.se" in action_url else "same-origin",
-				"Sec-Fetch-Dest": "document",
-			})
-			from urllib.parse import urlencode as _urlencode
-			await asyncio.sleep(REQUEST_DELAY)
-			async with session.post(action_url, headers=headers, data=_urlencode(inputs), allow_redirects=True) as resp:
+			# aiohttp url-encodes a dict body and sets the form Content-Type itself
+			action_host = urlparse(action_url).hostname or ""
+			if action_host == _INFOMENTOR_DOMAIN or action_host.endswith("." + _INFOMENTOR_DOMAIN):
+				cross_site = urlparse(current_url).hostname == _HUB_HOST
+				base_headers = _OPENID_CROSS_SITE_HEADERS if cross_site else _OPENID_SAME_ORIGIN_HEADERS
+			else:
+				base_headers = _OPENID_EXTERNAL_ACTION_HEADERS
+			headers = {**base_headers, "Referer": current_url}
+			if pacer is not None:
+				await pacer.wait(action_url)
+			async with session.post(action_url, headers=headers, data=inputs, allow_redirects=True, timeout=_LOGIN_TIMEOUT) as resp:
+				if pacer is not None:
+					pacer.observe(resp)
 				current_html = await resp.text()
 				current_url = str(resp.url)
-				_LOGGER.debug(f"Auto-submitted OpenID form to {action_url}; status={resp.status}, final_url={resp.url}")
+				_LOGGER.debug("Auto-submitted OpenID form to %s; status=%s, final_url=%s", action_url, resp.status, resp.url)
 		return _FormSubmissionResult(True, current_url, current_html)
 	except Exception as e:
-		_LOGGER.debug(f"Auto-submit OpenID form handling failed: {e}")
+		_LOGGER.debug("Auto-submit OpenID form handling failed: %s", e)
 		return _FormSubmissionResult(False)
 
 
-def _choose_best_school_option(
-	options: List[SchoolOption],
-	stored_url: Optional[str],
-	stored_name: Optional[str],
-	stored_number: Optional[str],
-	username: Optional[str],
-) -> Tuple[Optional[SchoolOption], List[Tuple[str, str, int, int, Optional[str]]]]:
-	"""Choose the most suitable school option based on stored data and heuristics."""
-	if not options:
-		return (None, [])
+# School option scores: (lowercase keywords, points), applied once when any of
+# the keywords occurs in the lowercased title or URL
+_SCHOOL_TITLE_SCORES: Tuple[Tuple[Tuple[str, ...], int], ...] = (
+	# Real kommun/municipality entries should score highest
+	# Most users authenticate to their local kommun, not demo/test sites
+	(('kommun',), 200),
+	(('övrigt', 'ovrigt'), -100),  # Heavy penalty for "Other" entries
+	# User type indicators (but lower priority than kommun)
+	(('elever', 'student'), 30),
+	(('vårdnadshavare', 'vardnadshavare', 'parent'), 25),
+	(('pupil',), 20),
+	(('personal', 'staff'), 15),
+	# School type indicators
+	(('skola', 'school'), 10),
+	(('barn',), 5),
+	(('förskola', 'forskola'), 5),
+)
+_SCHOOL_URL_SCORES: Tuple[Tuple[Tuple[str, ...], int], ...] = (
+	# Prefer standard SSO URLs used by most municipalities
+	(('sso.infomentor.se/login.ashx?idp=',), 150),  # Standard kommun SSO URL pattern
+	(('ims-grandid-api.infomentor.se/login/initial',), 120),  # Alternative auth method for some kommuns
+	(('communeid',), 30),  # Commune ID parameter
+	(('/demo/',), -300),  # Heavy penalty for demo URLs
+	(('://idp',), 100),  # External kommun-specific IdPs
+	(('chooseauthmech',), -5),  # Slightly penalize if stuck at auth method selection
+)
+
+
+def _keyword_score(text: str, table: Tuple[Tuple[Tuple[str, ...], int], ...]) -> int:
+	"""Sum the points of every table entry with a keyword in ``text``."""
+	return sum(points for keywords, points in table if any(keyword in text for keyword in keywords))
+
+
+# Mail providers whose domain says nothing about the user's school
+_GENERIC_MAIL_DOMAINS = frozenset({
+	"gmail.com",
+	"hotmail.com",
+	"outlook.com",
+	"icloud.com",
+	"me.com",
+	"mac.com",
+	"yahoo.com",
+	"protonmail.com",
+	"live.com",
+	"msn.com",
+})
 
+
+@lru_cache(maxsize=32)
+def _username_clues(username: Optional[str]) -> Tuple[str, ...]:
+	"""Derive school hints from the username's email domain, if it has one.
+	
+	Depends only on the username, which is the same on every login, so the
+	result is cached.
+	"""
 	username_clues: List[str] = []
 	if username:
 		username_lower = username.lower()
 		if '@' in username_lower:
 			domain = username_lower.split('@', 1)[1].strip()
-			generic_domains = {
-				"gmail.com",
-				"hotmail.com",
-				"outlook.com",
-				"icloud.com",
-				"me.com",
-				"mac.com",
-				"yahoo.com",
-				"protonmail.com",
-				"live.com",
-				"msn.com",
-			}
-			if domain and domain not in generic_domains:
+			if domain and domain not in _GENERIC_MAIL_DOMAINS:
 				username_clues.append(domain)
 				primary = domain.split('.')[0]
 				if primary and len(primary) >= 3 and primary not in username_clues:
@@ -160,9 +689,26 @@ def _choose_best_school_option(
 					part = part.strip()
 					if part and len(part) >= 3 and part not in username_clues:
 						username_clues.append(part)
+	return tuple(username_clues)
+
+
+def _choose_best_school_option(
+	options: List[SchoolOption],
+	stored_url: Optional[str],
+	stored_name: Optional[str],
+	stored_number: Optional[str],
+	username: Optional[str],
+) -> Tuple[Optional[SchoolOption], List[Tuple[str, str, int, int, Optional[str]]]]:
+	"""Choose the most suitable school option based on stored data and heuristics."""
+	if not options:
+		return (None, [])
+
+	username_clues = _username_clues(username)
 
 	scored: List[Tuple[int, int, SchoolOption]] = []
 	stored_school_found = False
+	# Every option is still scored: the stored school gets a boost, not a bypass
+	stored_name_lower = stored_name.lower() if stored_name else None
 	
 	for idx, option in enumerate(options):
 		lower_title = option.title.lower()
@@ -177,7 +723,7 @@ def _choose_best_school_option(
 		elif stored_url and option.url == stored_url:
 			is_stored_match = True
 			stored_school_found = True
-		elif stored_name and stored_name.lower() == lower_title:
+		elif stored_name_lower == lower_title:
 			is_stored_match = True
 			stored_school_found = True
 		
@@ -185,65 +731,27 @@ def _choose_best_school_option(
 		# This allows better schools to override if the stored one is clearly wrong
 		if is_stored_match:
 			score += 500
-			_LOGGER.debug(f"Found stored school match: '{option.title}' (+500 points)")
+			_LOGGER.debug("Found stored school match: '%s' (+500 points)", option.title)
 
-		if stored_name and stored_name.lower() == lower_title:
+		if stored_name_lower == lower_title:
 			score += 100  # Additional bonus for name match
 		
-		# Real kommun/municipality entries should score highest
-		# Most users authenticate to their local kommun, not demo/test sites
-		if 'kommun' in lower_title:
-			score += 200  # Increased significantly - real municipalities
+		# Title and URL keyword scores from the tables above
+		score += _keyword_score(lower_title, _SCHOOL_TITLE_SCORES)
+		score += _keyword_score(lower_url, _SCHOOL_URL_SCORES)
 		
 		# Penalize demo/test entries heavily - most users don't want these
-		if 'övrigt' in lower_title or 'ovrigt' in lower_title:
-			score -= 100  # Heavy penalty for "Other" entries
-		if 'demo' in lower_title.lower() or 'demo' in lower_url:
+		if 'demo' in lower_title or 'demo' in lower_url:
 			score -= 200  # Very heavy penalty for demo sites
-		if 'test' in lower_title.lower() or '/test' in lower_url:
+		if 'test' in lower_title or '/test' in lower_url:
 			score -= 150  # Heavy penalty for test sites
 		
-		# User type indicators (but lower priority than kommun)
-		if 'elever' in lower_title or 'student' in lower_title or 'students' in lower_title:
-			score += 30
-		if 'vårdnadshavare' in lower_title or 'vardnadshavare' in lower_title or 'parent' in lower_title:
-			score += 25
-		if 'pupil' in lower_title:
-			score += 20
-		if 'personal' in lower_title or 'staff' in lower_title:
-			score += 15
-		
-		# School type indicators
-		if 'skola' in lower_title or 'school' in lower_title:
-			score += 10
-		if 'barn' in lower_title:
-			score += 5
-		if 'förskola' in lower_title or 'forskola' in lower_title:
-			score += 5
-
-		# URL scoring - prefer standard SSO URLs used by most municipalities
-		if 'sso.infomentor.se/login.ashx?idp=' in lower_url:
-			score += 150  # Standard kommun SSO URL pattern
-		
-		if 'ims-grandid-api.infomentor.se/login/initial' in lower_url:
-			score += 120  # Alternative auth method for some kommuns
-		
-		if 'communeid' in lower_url:
-			score += 30  # Commune ID parameter
-		
 		# Penalize non-production URLs
-		if '/demo/' in lower_url:
-			score -= 300  # Heavy penalty for demo URLs
-		if 'test' in lower_url and 'mentor.is' in lower_url:
-			score -= 250  # Heavy penalty for test environments
-		if 'mentor.is' in lower_url and 'demo' not in lower_url and 'test' not in lower_url:
-			score -= 50  # Slight penalty for .is domain (Icelandic, less common for Swedish users)
-		
-		# External IdP URLs (kommun-specific auth servers)
-		if lower_url.startswith('https://idp') or '://idp' in lower_url:
-			score += 100  # These are valid kommun-specific IdPs
-		if 'chooseauthmech' in lower_url:
-			score -= 5  # Slightly penalize if stuck at auth method selection
+		if 'mentor.is' in lower_url:
+			if 'test' in lower_url:
+				score -= 250  # Heavy penalty for test environments
+			elif 'demo' not in lower_url:
+				score -= 50  # Slight penalty for .is domain (Icelandic, less common for Swedish users)
 
 		# Username matching is not reliable for InfoMentor
 		# All auth happens on infomentor.se domains, so email domain won't match
@@ -297,7 +805,9 @@ class InfoMentorAuth:
 		"""Initialise authentication handler.
 		
 		Args:
-			session: aiohttp session to use for requests
+			session: aiohttp session to use for requests. It should keep
+				connections alive across the login steps, as Home Assistant's
+				shared session and client.create_session() both do.
 			storage: Optional storage for persisting school selection
 		"""
 		self.session = session
@@ -306,66 +816,120 @@ class InfoMentorAuth:
 		self.pupil_ids: list[str] = []
 		self.pupil_names: dict[str, str] = {}  # Maps pupil_id -> pupil_name
 		self.pupil_switch_ids: dict[str, str] = {}  # Maps pupil_id -> switch_id
-		self._last_auth_time: Optional[float] = None
-		self._auth_cookies_backup: Optional[Dict[str, str]] = None
+		self._switch_urls: dict[str, Tuple[str, str]] = {}  # Maps pupil_id -> (hub, modern) switch URLs
+		self._inflight_switch: dict[str, asyncio.Task] = {}  # Maps pupil_id -> running switch
+		self._switch_lock = asyncio.Lock()  # The server holds one selected pupil per session
+		self._hub_html: Optional[str] = None  # Hub page from pupil discovery, consumed by the switch mapping
+		self._pacer = _RequestPacer(REQUEST_DELAY)
+		self._request_slots = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+		self._auth_expires_at: Optional[float] = None  # time.monotonic() deadline of the current login
+		self._auth_verified_at: Optional[float] = None
+		self._current_pupil_id: Optional[str] = None
+		self._current_pupil_at: Optional[float] = None
+		self._auth_cookies_backup: Optional[Dict[str, Dict[str, str]]] = None  # Maps host -> {name: value}
 		self._username: Optional[str] = None
 		self._password: Optional[str] = None
 		self._preferred_school_number: Optional[str] = None
 		
+	async def _request(self, method: str, url: str, **kwargs: Any) -> "aiohttp.ClientResponse":
+		"""Send a request once the pacer allows it and a request slot is free.
+		
+		The pacer is waited on before a slot is taken, so a throttled host does
+		not tie up slots that requests to other hosts could use. The slot is held
+		until the response headers arrive, not while the body is read, so nested
+		requests made while handling a response cannot deadlock.
+		The caller owns the response and must release it; ``async with`` does so.
+		Requests without an explicit ``timeout`` use ``_LOGIN_TIMEOUT``, and every
+		response is passed to the pacer so throttling slows later requests.
+		"""
+		kwargs.setdefault("timeout", _LOGIN_TIMEOUT)
+		await self._pacer.wait(url)
+		async with self._request_slots:
+			resp = await self.session.request(method, url, **kwargs)
+		self._pacer.observe(resp)
+		return resp
+	
+	def _snapshot_cookies(self) -> Tuple[Dict[str, Dict[str, str]], frozenset]:
+		"""Collect the cookies the jar would send to each InfoMentor host.
+		
+		Hosts are kept apart because the same cookie name, such as
+		ASP.NET_SessionId, carries a different value on each of them.
+		
+		Returns:
+			InfoMentor cookies as host -> {name: value}, and the essential auth
+			cookie names found on any host
+		"""
+		backup: Dict[str, Dict[str, str]] = {}
+		found: set = set()
+		# filter_cookies only looks at cookies matching each host and skips expired
+		# ones, so cookies from other integrations sharing the session are ignored
+		for url in _INFOMENTOR_COOKIE_URLS:
+			cookies = {name: morsel.value for name, morsel in self.session.cookie_jar.filter_cookies(url).items()}
+			if cookies:
+				backup[url.host] = cookies
+				found.update(cookies)
+		return backup, _ESSENTIAL_COOKIES.intersection(found)
+	
 	def _backup_auth_cookies(self) -> None:
 		"""Backup authentication cookies for potential restoration."""
-		if self.session.cookie_jar:
-			self._auth_cookies_backup = {}
-			for cookie in self.session.cookie_jar:
-				try:
-					# Check if this is an InfoMentor-related cookie
-					domain = str(cookie.get('domain', '')) if hasattr(cookie, 'get') else str(getattr(cookie, 'domain', ''))
-					if any(infomentor_domain in domain for infomentor_domain in ['infomentor.se', '.infomentor.se']):
-						# Handle different cookie formats safely
-						cookie_name = None
-						cookie_value = None
-						
-						# Try multiple ways to get the cookie name
-						if hasattr(cookie, 'get'):
-							cookie_name = cookie.get('name') or cookie.get('key')
-						else:
-							cookie_name = getattr(cookie, 'name', None) or getattr(cookie, 'key', None)
-						
-						# Try multiple ways to get the cookie value
-						if hasattr(cookie, 'get'):
-							cookie_value = cookie.get('value')
-						else:
-							cookie_value = getattr(cookie, 'value', None)
-						
-						# If we still don't have a value, try converting the whole cookie to string
-						if not cookie_value:
-							cookie_value = str(cookie)
-						
-						if cookie_name and cookie_value and cookie_name != cookie_value:
-							self._auth_cookies_backup[cookie_name] = cookie_value
-				except (KeyError, AttributeError, TypeError) as e:
-					_LOGGER.debug(f"Skipping problematic cookie during backup: {e}")
-					continue
-			
-			_LOGGER.debug(f"Backed up {len(self._auth_cookies_backup)} auth cookies")
-		else:
-			_LOGGER.debug("No cookie jar available for backup")
+		backup, _ = self._snapshot_cookies()
+		self._auth_cookies_backup = backup
+		_LOGGER.debug("Backed up %s auth cookies from %s hosts", sum(map(len, backup.values())), len(backup))
 	
 	def _restore_auth_cookies(self) -> bool:
-		"""Attempt to restore authentication cookies."""
+		"""Attempt to restore authentication cookies, each to the host it came from."""
 		if not self._auth_cookies_backup:
 			return False
 		
 		try:
-			for base_url in (HUB_BASE_URL, MODERN_BASE_URL, LEGACY_BASE_URL):
-				for name, value in self._auth_cookies_backup.items():
-					self.session.cookie_jar.update_cookies({name: value}, response_url=base_url)
-			_LOGGER.debug(f"Restored {len(self._auth_cookies_backup)} authentication cookies")
+			for base_url in _INFOMENTOR_COOKIE_URLS:
+				cookies = self._auth_cookies_backup.get(base_url.host)
+				if cookies:
+					self.session.cookie_jar.update_cookies(cookies, response_url=base_url)
+			_LOGGER.debug("Restored authentication cookies for %s hosts", len(self._auth_cookies_backup))
 			return True
 		except Exception as e:
 			_LOGGER.warning(f"Failed to restore auth cookies: {e}")
 			return False
 	
+	def _pupil_snapshot(self) -> Dict[str, Any]:
+		"""Return the pupil details that belong with the current auth cookies."""
+		return {
+			"pupil_ids": list(self.pupil_ids),
+			"pupil_names": dict(self.pupil_names),
+			"switch_ids": dict(self.pupil_switch_ids),
+		}
+	
+	async def _load_pupil_snapshot(self) -> Optional[Dict[str, Any]]:
+		"""Load the pupil details saved with the stored cookies.
+		
+		Returns:
+			The snapshot in the form of _pupil_snapshot(), or None when no pupils
+			were stored (cookies saved by older versions carry none)
+		"""
+		try:
+			pupils = await self.storage.get_auth_pupils()
+		except Exception as err:
+			_LOGGER.debug("Could not load stored pupil details: %s", err)
+			return None
+		
+		pupil_ids = [str(pupil_id) for pupil_id in pupils.get("pupil_ids") or []]
+		if not pupil_ids:
+			return None
+		return {
+			"pupil_ids": pupil_ids,
+			"pupil_names": dict(pupils.get("pupil_names") or {}),
+			"switch_ids": dict(pupils.get("switch_ids") or {}),
+		}
+	
+	def _apply_pupil_snapshot(self, pupils: Dict[str, Any]) -> None:
+		"""Adopt pupil details loaded by _load_pupil_snapshot()."""
+		self.pupil_ids = pupils["pupil_ids"]
+		self.pupil_names = pupils["pupil_names"]
+		self.pupil_switch_ids = pupils["switch_ids"]
+		self._switch_urls.clear()
+		_LOGGER.debug("Restored %s pupils from stored session", len(self.pupil_ids))
+	
 	async def try_restore_session(self) -> bool:
 		"""Attempt to reuse stored cookies instead of running the full OAuth flow."""
 		if not self.storage:
@@ -374,22 +938,45 @@ class InfoMentorAuth:
 		try:
 			cookies, saved_at = await self.storage.get_auth_cookies()
 		except Exception as err:
-			_LOGGER.debug(f"Could not load stored cookies: {err}")
+			_LOGGER.debug("Could not load stored cookies: %s", err)
 			return False
 		
 		if not cookies:
 			_LOGGER.debug("No stored InfoMentor cookies available for reuse")
 			return False
 		
+		# Cookies older than the server-side session lifetime cannot be valid, so
+		# skip the verification requests and go straight to a full login. Without
+		# a timestamp their age, and so their remaining lifetime, is unknown.
+		remaining_lifetime = AUTH_TTL_SECONDS - (time.time() - saved_at.timestamp()) if saved_at is not None else 0.0
+		if remaining_lifetime <= 0:
+			_LOGGER.info("Stored InfoMentor cookies are older than the session lifetime; clearing cache")
+			await self.storage.clear_auth_cookies()
+			return False
+		
+		# Earlier versions stored one flat name -> value dict for all hosts, which
+		# cannot be told apart again
+		if not all(isinstance(host_cookies, dict) for host_cookies in cookies.values()):
+			_LOGGER.debug("Stored cookies use the old single-host format; a full login is needed")
+			return False
+		
+		# A session without its pupils is of no use to the caller, which would
+		# only retry get_pupil_ids() against the empty list; log in instead
+		pupils = await self._load_pupil_snapshot()
+		if pupils is None:
+			_LOGGER.debug("Stored cookies have no pupil details; a full login is needed")
+			return False
+		
 		self._auth_cookies_backup = cookies
 		if not self._restore_auth_cookies():
 			_LOGGER.debug("Stored cookies could not be applied to the session")
 			return False
 		
 		if await self._verify_authentication_status():
-			import time
 			self.authenticated = True
-			self._last_auth_time = time.time()
+			# The session was issued when the cookies were saved, not now
+			self._auth_expires_at = time.monotonic() + remaining_lifetime
+			self._apply_pupil_snapshot(pupils)
 			_LOGGER.info("Reused stored InfoMentor cookies; skipping full authentication")
 			return True
 		
@@ -399,31 +986,18 @@ class InfoMentorAuth:
 	
 	def is_auth_likely_expired(self) -> bool:
 		"""Check if authentication is likely expired based on time and session state."""
-		if not self.authenticated or not self._last_auth_time:
+		if not self.authenticated or self._auth_expires_at is None:
 			return True
 		
-		# Check if authentication is older than 8 hours (typical session timeout)
-		import time
-		if time.time() - self._last_auth_time > 8 * 3600:
+		# Check if authentication is older than 8 hours (typical session timeout).
+		# The deadline is monotonic, so wall-clock adjustments cannot move it.
+		if time.monotonic() > self._auth_expires_at:
 			_LOGGER.debug("Authentication likely expired due to age")
 			return True
 		
-		# Check if we have essential cookies
-		if not self.session.cookie_jar:
-			_LOGGER.debug("No cookie jar available")
-			return True
-		
-		essential_cookies = ['ASP.NET_SessionId', '.ASPXAUTH']
-		found_cookies = []
-		for cookie in self.session.cookie_jar:
-			try:
-				name = cookie.get('name', '') if hasattr(cookie, 'get') else getattr(cookie, 'name', getattr(cookie, 'key', ''))
-				if name in essential_cookies:
-					found_cookies.append(name)
-			except (KeyError, AttributeError, TypeError):
-				# Skip problematic cookies
-				continue
-		
+		# Check if we have essential cookies; the jar is read live because cookies
+		# can expire or be cleared between calls
+		_, found_cookies = self._snapshot_cookies()
 		if not found_cookies:
 			_LOGGER.debug("No essential authentication cookies found")
 			return True
@@ -440,13 +1014,16 @@ class InfoMentorAuth:
 		Returns:
 			True if authentication successful
 		"""
-		_LOGGER.error("*** LOGIN METHOD CALLED v0.0.53 *** username=%s", username)
+		_LOGGER.debug("Login method called: username=%s", username)
 		try:
 			_LOGGER.info("Starting InfoMentor OAuth authentication flow!!")
 			# Store for potential reauthentication
 			self._username = username
 			self._password = password
 			self._preferred_school_number = None
+			self._auth_verified_at = None
+			self._current_pupil_id = None
+			self._hub_html = None
 			
 			if self.storage:
 				try:
@@ -454,33 +1031,33 @@ class InfoMentorAuth:
 					if stored_school_number:
 						self._preferred_school_number = stored_school_number
 						self._apply_last_used_idp_cookie(stored_school_number)
-						_LOGGER.debug(f"Applied stored IdP preference #{stored_school_number} to session")
+						_LOGGER.debug("Applied stored IdP preference #%s to session", stored_school_number)
 				except Exception as pref_err:
-					_LOGGER.debug(f"Could not apply stored IdP preference: {pref_err}")
+					_LOGGER.debug("Could not apply stored IdP preference: %s", pref_err)
 			
 			# Step 1: Get OAuth token (primary method, confirmed by user)
-			_LOGGER.error("*** STEP 1 STARTING - Getting OAuth token v0.0.53 ***")
+			_LOGGER.debug("Step 1 starting - getting OAuth token")
 			try:
 				oauth_token = await self._get_oauth_token()
-				_LOGGER.error(f"*** OAUTH TOKEN RESULT v0.0.53 *** token={oauth_token[:20] if oauth_token else 'None'}...")
+				_LOGGER.debug("OAuth token result: token=%s...", oauth_token[:20] if oauth_token else 'None')
 				
 				if oauth_token:
-					_LOGGER.error("*** STEP 2 STARTING - OAuth completion v0.0.53 ***")
+					_LOGGER.debug("Step 2 starting - OAuth completion")
 					await self._complete_oauth_to_modern_domain(oauth_token, username, password)
-					_LOGGER.error("*** STEP 2 COMPLETED v0.0.53 ***")
+					_LOGGER.debug("Step 2 completed")
 				else:
-					_LOGGER.error("*** NO OAUTH TOKEN - Trying direct login fallback v0.0.53 ***")
+					_LOGGER.debug("No OAuth token - trying direct login fallback")
 					await self._direct_login_with_credentials(username, password)
 			except Exception as oauth_err:
-				_LOGGER.error(f"*** OAUTH FLOW FAILED v0.0.53 *** error={oauth_err}")
-				_LOGGER.error("*** FALLBACK - Trying direct login v0.0.53 ***")
+				_LOGGER.debug("OAuth flow failed: error=%s", oauth_err)
+				_LOGGER.debug("Fallback - trying direct login")
 				
 				# Fallback to direct login if OAuth fails
 				try:
 					await self._direct_login_with_credentials(username, password)
-					_LOGGER.error("*** DIRECT LOGIN FALLBACK COMPLETED v0.0.53 ***")
+					_LOGGER.debug("Direct login fallback completed")
 				except Exception as fallback_err:
-					_LOGGER.error(f"*** ALL LOGIN METHODS FAILED v0.0.53 *** oauth_err={oauth_err}, fallback_err={fallback_err}")
+					_LOGGER.warning("All login methods failed: oauth_err=%s, fallback_err=%s", oauth_err, fallback_err)
 					raise oauth_err  # Prefer to show OAuth error since that's the primary method
 			
 			# Step 3: Get pupil IDs from modern interface
@@ -503,27 +1080,26 @@ class InfoMentorAuth:
 						await self.storage.clear_selected_school()
 						self._preferred_school_number = None
 					except Exception as clear_err:
-						_LOGGER.debug(f"Could not clear stored school preference: {clear_err}")
+						_LOGGER.debug("Could not clear stored school preference: %s", clear_err)
 				
 				# Don't mark as authenticated if we have no pupil IDs
 				# This forces re-authentication on the next attempt
-				_LOGGER.error("*** AUTHENTICATION FAILED - NO PUPIL IDS FOUND v0.0.40 ***")
+				_LOGGER.debug("Authentication failed - no pupil IDs found")
 				self.authenticated = False
 				raise InfoMentorAuthError("Authentication failed - no pupil IDs found")
 			else:
-				_LOGGER.info(f"*** AUTHENTICATION SUCCESS v0.0.40 *** - {len(self.pupil_ids)} pupils")
+				_LOGGER.debug("Authentication success: %s pupils", len(self.pupil_ids))
 				# Mark as authenticated and track timing
 				self.authenticated = True
-				import time
-				self._last_auth_time = time.time()
+				self._auth_expires_at = time.monotonic() + AUTH_TTL_SECONDS
 				
 				# Backup authentication cookies for potential restoration
 				self._backup_auth_cookies()
 				if self.storage and self._auth_cookies_backup:
 					try:
-						await self.storage.save_auth_cookies(self._auth_cookies_backup)
+						await self.storage.save_auth_cookies(self._auth_cookies_backup, self._pupil_snapshot())
 					except Exception as cookie_err:
-						_LOGGER.debug(f"Could not persist auth cookies: {cookie_err}")
+						_LOGGER.debug("Could not persist auth cookies: %s", cookie_err)
 			
 			_LOGGER.info("Authentication completed successfully")
 			return True
@@ -542,29 +1118,29 @@ class InfoMentorAuth:
 
 		Handles auto-submit OpenID forms and credential forms without requiring a prior oauth_token.
 		"""
-		headers = DEFAULT_HEADERS.copy()
+		headers = DEFAULT_HEADERS
 		login_url = f"{HUB_BASE_URL}/Authentication/Authentication/Login?apiType=IM1&forceOAuth=true"
 		last_text = ""
 		last_url = login_url
 		# Visit login page
-		await asyncio.sleep(REQUEST_DELAY)
-		async with self.session.get(login_url, headers=headers, allow_redirects=True) as resp:
+		async with await self._request("GET", login_url, headers=headers, allow_redirects=True) as resp:
 			last_text = await resp.text()
 			last_url = str(resp.url)
-			_LOGGER.debug(f"Login page status={resp.status}, url={last_url}")
+			_LOGGER.debug("Login page status=%s, url=%s", resp.status, last_url)
 		# Handle auto-submit if present
-		if ('id="openid_message"' in last_text) or ('id=\'openid_message\'' in last_text):
+		if _has_openid_form(last_text):
 			_LOGGER.debug("Auto-submit form detected on login page; submitting...")
-			result = await _auto_submit_openid_form(self.session, last_text, referer=last_url)
+			result = await _auto_submit_openid_form(self.session, last_text, referer=last_url, pacer=self._pacer)
 			if result.executed:
 				last_text = result.final_text or last_text
 				last_url = result.final_url or last_url
 		# If a credential form is present, submit credentials
-		if any(key in last_text.lower() for key in ['txtnotandanafn', 'txtlykilord']):
+		last_lower = last_text.lower()
+		if any(key in last_lower for key in _CREDENTIAL_FIELD_MARKERS):
 			await self._submit_credentials_and_handle_second_oauth(last_text, username, password, last_url)
 			return
 		# If an oauth_token appears, submit second token
-		second_oauth_match = re.search(r'oauth_token"\s+value="([\w+=/]+)"', last_text)
+		second_oauth_match = _OAUTH_TOKEN_VALUE_RE.search(last_text)
 		if second_oauth_match:
 			await self._submit_second_oauth_token(second_oauth_match.group(1))
 			return
@@ -573,15 +1149,14 @@ class InfoMentorAuth:
 	
 	async def _get_oauth_token(self) -> Optional[str]:
 		"""Get OAuth token from initial OAuth endpoint."""
-		_LOGGER.info("*** STARTING OAUTH TOKEN EXTRACTION v0.0.39 ***")
+		_LOGGER.debug("Starting OAuth token extraction")
 		
 		# Get OAuth token from the OAuth login endpoint
 		oauth_url = f"{HUB_BASE_URL}/Authentication/Authentication/Login?apiType=IM1&forceOAuth=true&apiInstance="
-		headers = DEFAULT_HEADERS.copy()
-		await asyncio.sleep(REQUEST_DELAY)  # Be respectful to the server
+		headers = DEFAULT_HEADERS
 		
 		try:
-			async with self.session.get(oauth_url, headers=headers, allow_redirects=True) as resp:
+			async with await self._request("GET", oauth_url, headers=headers, allow_redirects=True) as resp:
 				_LOGGER.info(f"OAuth request to {oauth_url} returned status: {resp.status}")
 				_LOGGER.info(f"Final URL: {resp.url}")
 				
@@ -589,8 +1164,7 @@ class InfoMentorAuth:
 				_LOGGER.info(f"Response content length: {len(text)}")
 				
 				# Save initial response for debugging
-				await _write_text_file_async(DEBUG_FILE_INITIAL, text)
-				_LOGGER.info(f"Saved initial OAuth response to {DEBUG_FILE_INITIAL}")
+				_dump_debug_file(DEBUG_FILE_INITIAL, text)
 				
 				# Look for OAuth token in the response
 				oauth_token = None
@@ -599,14 +1173,14 @@ class InfoMentorAuth:
 				if 'id="openid_message"' in text:
 					_LOGGER.info("Found auto-submit form in initial response")
 					# Extract OAuth token from hidden input
-					oauth_match = re.search(r'<input[^>]*name=["\']oauth_token["\'][^>]*value=["\']([^"\']+)["\']', text, re.IGNORECASE)
+					oauth_match = _OAUTH_TOKEN_INPUT_RE.search(text)
 					if oauth_match:
 						oauth_token = oauth_match.group(1)
 						_LOGGER.info(f"Found OAuth token in form: {oauth_token[:20]}...")
 						
 						# Auto-submit this form to get to the credential page
 						_LOGGER.info("Auto-submitting initial OAuth form...")
-						form_result = await _auto_submit_openid_form(self.session, text, str(resp.url))
+						form_result = await _auto_submit_openid_form(self.session, text, str(resp.url), pacer=self._pacer)
 						if form_result.executed:
 							_LOGGER.info("Auto-submitted initial OAuth form successfully")
 							# The form submission result is not needed for the OAuth token extraction
@@ -615,7 +1189,7 @@ class InfoMentorAuth:
 				
 				# If no OAuth token found in form, try URL patterns
 				if not oauth_token:
-					oauth_match = re.search(r'oauth_token=([^&"\']+)', text)
+					oauth_match = _OAUTH_TOKEN_PARAM_RE.search(text)
 					if oauth_match:
 						oauth_token = oauth_match.group(1)
 						_LOGGER.info(f"Found OAuth token in URL: {oauth_token[:20]}...")
@@ -639,53 +1213,43 @@ class InfoMentorAuth:
 	async def _complete_oauth_to_modern_domain(self, oauth_token: str, username: str, password: str) -> None:
 		"""Complete OAuth flow with improved LoginCallback handling."""
 		try:
-			_LOGGER.error("*** STARTING ENHANCED OAUTH COMPLETION v0.0.53 ***")
+			_LOGGER.debug("Starting enhanced OAuth completion")
 			
 			# Stage 1: Submit initial OAuth token to get credential form
-			headers = DEFAULT_HEADERS.copy()
-			headers.update({
-				"Content-Type": "application/x-www-form-urlencoded",
-				"Origin": HUB_BASE_URL,
-				"Referer": f"{HUB_BASE_URL}/authentication/authentication/login?apitype=im1&forceOAuth=true",
-				"Sec-Fetch-Site": "cross-site",
-				"Sec-Fetch-Dest": "document",
-			})
-			
 			oauth_data = f"oauth_token={oauth_token}"
-			_LOGGER.error(f"*** POSTING OAUTH TOKEN v0.0.53 *** to {LEGACY_BASE_URL}")
+			_LOGGER.debug("Posting OAuth token to %s", LEGACY_BASE_URL)
 			
-			await asyncio.sleep(REQUEST_DELAY)  # Be respectful to the server
-			async with self.session.post(
+			async with await self._request(
+				"POST",
 				LEGACY_BASE_URL,
-				headers=headers,
+				headers=_OAUTH_TOKEN_POST_HEADERS,
 				data=oauth_data,
 				allow_redirects=True
 			) as resp:
 				stage1_text = await resp.text()
-				_LOGGER.error(f"*** STAGE 1 RESPONSE v0.0.53 *** status={resp.status} url={resp.url}")
-				_LOGGER.error(f"*** STAGE 1 LENGTH v0.0.53 *** {len(stage1_text)} chars")
+				_LOGGER.debug("Stage 1 response: status=%s url=%s", resp.status, resp.url)
+				_LOGGER.debug("Stage 1 length: %s chars", len(stage1_text))
 				
 				# Save stage 1 response for debugging
-				await _write_text_file_async(DEBUG_FILE_OAUTH, stage1_text)
-				_LOGGER.error(f"*** SAVED OAUTH DEBUG FILE v0.0.53 *** {DEBUG_FILE_OAUTH}")
+				_dump_debug_file(DEBUG_FILE_OAUTH, stage1_text)
 				
 				# Check if we already got a LoginCallback redirect
 				if "LoginCallback" in str(resp.url):
-					_LOGGER.error("*** RECEIVED EARLY LOGINCALLBACK v0.0.53 ***")
+					_LOGGER.debug("Received early LoginCallback")
 					await self._handle_login_callback(str(resp.url), stage1_text)
 					return
 			
 			# Some flows render auto-submit form here; handle it
-			if ('id="openid_message"' in stage1_text) or ('id=\'openid_message\'' in stage1_text):
+			if _has_openid_form(stage1_text):
 				_LOGGER.info("Detected auto-submit form during stage 1; submitting...")
-				result = await _auto_submit_openid_form(self.session, stage1_text, referer=str(resp.url))
+				result = await _auto_submit_openid_form(self.session, stage1_text, referer=str(resp.url), pacer=self._pacer)
 				if result.executed:
 					stage1_text = result.final_text or stage1_text
 					_LOGGER.info("Stage 1 auto-submit form completed")
 					
 					# Check if auto-submit led to LoginCallback
 					if result.final_url and "LoginCallback" in result.final_url:
-						_LOGGER.error("*** AUTO-SUBMIT LED TO LOGINCALLBACK v0.0.53 ***")
+						_LOGGER.debug("Auto-submit led to LoginCallback")
 						await self._handle_login_callback(result.final_url, stage1_text)
 						return
 				else:
@@ -695,32 +1259,34 @@ class InfoMentorAuth:
 			# Note: We don't need to "select" a school by navigating to a URL
 			# Instead, we submit ALL the school fields along with credentials in one POST
 			# InfoMentor will route us to the correct school based on our username/password
-			_LOGGER.info(f"*** CHECKING FOR SCHOOL FORM FIELDS v0.0.98 *** IdpListRepeater: {'IdpListRepeater' in stage1_text}")
-			if "IdpListRepeater" in stage1_text:
-				_LOGGER.info("*** DETECTED SCHOOL SELECTION FIELDS IN FORM v0.0.98 *** (will submit all fields with credentials)")
+			has_school_fields = "IdpListRepeater" in stage1_text
+			_LOGGER.debug("Checking for school form fields: IdpListRepeater: %s", has_school_fields)
+			if has_school_fields:
+				_LOGGER.debug("Detected school selection fields in form (will submit all fields with credentials)")
 			else:
-				_LOGGER.info("*** NO SCHOOL SELECTION FIELDS v0.0.98 ***")
+				_LOGGER.debug("No school selection fields")
 			
 			# Check if we need to submit credentials
-			_LOGGER.error(f"*** CHECKING FOR CREDENTIALS v0.0.53 *** txtnotandanafn: {'txtnotandanafn' in stage1_text.lower()}, txtlykilord: {'txtlykilord' in stage1_text.lower()}")
-			if any(field in stage1_text.lower() for field in ['txtnotandanafn', 'txtlykilord']):
-				_LOGGER.error("*** FOUND CREDENTIAL FORM - SUBMITTING v0.0.53 ***")
+			stage1_lower = stage1_text.lower()
+			has_username_field = 'txtnotandanafn' in stage1_lower
+			has_password_field = 'txtlykilord' in stage1_lower
+			_LOGGER.debug("Checking for credentials: txtnotandanafn: %s, txtlykilord: %s", has_username_field, has_password_field)
+			if has_username_field or has_password_field:
+				_LOGGER.debug("Found credential form - submitting")
 				
 				# Extract and submit credentials
 				await self._submit_credentials_and_handle_second_oauth(stage1_text, username, password, str(resp.url))
-				_LOGGER.error("*** CREDENTIAL SUBMISSION COMPLETED v0.0.53 ***")
+				_LOGGER.debug("Credential submission completed")
 			else:
-				_LOGGER.error("*** NO CREDENTIAL FORM FOUND v0.0.53 ***")
-				_LOGGER.error(f"*** STAGE 1 SNIPPET v0.0.53 *** {stage1_text[:500]}...")
+				_LOGGER.debug("No credential form found")
+				_LOGGER.debug("Stage 1 snippet: %s...", stage1_text[:500])
 		except Exception as oauth_completion_err:
-			_LOGGER.error(f"*** OAUTH COMPLETION EXCEPTION v0.0.53 *** {oauth_completion_err}")
+			_LOGGER.debug("OAuth completion exception: %s", oauth_completion_err)
 			raise
 	
 	async def _handle_login_callback(self, callback_url: str, response_text: str) -> None:
 		"""Handle LoginCallback URL with oauth_token and oauth_verifier."""
-		from urllib.parse import urlparse, parse_qs
-		
-		_LOGGER.error(f"*** HANDLING LOGINCALLBACK v0.0.53 *** {callback_url}")
+		_LOGGER.debug("Handling LoginCallback: %s", callback_url)
 		
 		# Parse the callback URL to extract OAuth parameters
 		parsed_url = urlparse(callback_url)
@@ -729,29 +1295,29 @@ class InfoMentorAuth:
 		oauth_token = query_params.get('oauth_token', [None])[0]
 		oauth_verifier = query_params.get('oauth_verifier', [None])[0]
 		
-		_LOGGER.error(f"*** CALLBACK OAUTH TOKEN v0.0.53 *** {oauth_token[:20] if oauth_token else 'None'}...")
-		_LOGGER.error(f"*** CALLBACK OAUTH VERIFIER v0.0.53 *** {oauth_verifier[:20] if oauth_verifier else 'None'}...")
+		_LOGGER.debug("Callback OAuth token: %s...", oauth_token[:20] if oauth_token else 'None')
+		_LOGGER.debug("Callback OAuth verifier: %s...", oauth_verifier[:20] if oauth_verifier else 'None')
 		
 		if not oauth_token or not oauth_verifier:
-			_LOGGER.error("*** INCOMPLETE OAUTH CALLBACK - MISSING TOKEN OR VERIFIER v0.0.53 ***")
+			_LOGGER.debug("Incomplete OAuth callback - missing token or verifier")
 			return
 		
 		# Save the callback response for debugging
-		await _write_text_file_async("/tmp/infomentor_oauth_callback.html", response_text)
-		_LOGGER.error("*** SAVED OAUTH CALLBACK DEBUG FILE v0.0.53 ***")
+		_dump_debug_file("/tmp/infomentor_oauth_callback.html", response_text)
 		
 		# Check if the callback response already contains pupil data
-		if any(indicator in response_text.lower() for indicator in ['pupil', 'elev', 'student', 'dashboard']):
-			_LOGGER.error("*** CALLBACK CONTAINS PUPIL DATA v0.0.53 ***")
+		response_lower = response_text.lower()
+		if any(indicator in response_lower for indicator in _CALLBACK_PUPIL_MARKERS):
+			_LOGGER.debug("Callback contains pupil data")
 		else:
-			_LOGGER.error("*** CALLBACK REQUIRES ADDITIONAL PROCESSING v0.0.53 ***")
+			_LOGGER.debug("Callback requires additional processing")
 			
 			# Try to navigate to the dashboard using the callback parameters
 			await self._navigate_to_dashboard_with_oauth_params(oauth_token, oauth_verifier)
 	
 	async def _navigate_to_dashboard_with_oauth_params(self, oauth_token: str, oauth_verifier: str) -> None:
 		"""Navigate to dashboard using OAuth token and verifier."""
-		_LOGGER.error("*** NAVIGATING TO DASHBOARD WITH OAUTH PARAMS v0.0.53 ***")
+		_LOGGER.debug("Navigating to dashboard with OAuth params")
 		
 		# Common dashboard URLs to try
 		dashboard_urls = [
@@ -760,30 +1326,40 @@ class InfoMentorAuth:
 			f"https://hub.infomentor.se/home",
 		]
 		
-		headers = DEFAULT_HEADERS.copy()
-		headers["Referer"] = f"{HUB_BASE_URL}/Authentication/Authentication/LoginCallback"
-		
+		# Fetch one at a time in priority order and stop at the first page with
+		# pupil data: these requests run mid-handshake and can set session
+		# cookies, so a lower-priority page must not overwrite the winner's
 		for dashboard_url in dashboard_urls:
-			try:
-				_LOGGER.error(f"*** TRYING DASHBOARD URL v0.0.53 *** {dashboard_url}")
-				async with self.session.get(dashboard_url, headers=headers, allow_redirects=True) as resp:
-					dashboard_text = await resp.text()
-					_LOGGER.error(f"*** DASHBOARD RESPONSE v0.0.53 *** {resp.status} -> {resp.url}")
-					
-					# Check if this contains pupil data
-					if any(indicator in dashboard_text.lower() for indicator in ['pupil', 'elev', 'student']):
-						_LOGGER.error("*** FOUND PUPIL DATA IN DASHBOARD v0.0.53 ***")
-						await _write_text_file_async("/tmp/infomentor_oauth_dashboard.html", dashboard_text)
-						break
-					elif "login" in dashboard_text.lower() or "authentication" in dashboard_text.lower():
-						_LOGGER.error("*** DASHBOARD REQUIRES ADDITIONAL AUTH v0.0.53 ***")
-						continue
-					else:
-						_LOGGER.error("*** DASHBOARD STATUS UNCLEAR v0.0.53 ***")
-						
-			except Exception as e:
-				_LOGGER.error(f"*** DASHBOARD NAVIGATION ERROR v0.0.53 *** {e}")
-				continue
+			dashboard_text = await self._fetch_callback_dashboard(dashboard_url)
+			if dashboard_text is not None:
+				_dump_debug_file("/tmp/infomentor_oauth_dashboard.html", dashboard_text)
+				break
+	
+	async def _fetch_callback_dashboard(self, dashboard_url: str) -> Optional[str]:
+		"""Fetch a dashboard URL after LoginCallback.
+		
+		Returns:
+			The page text if it contains pupil data, otherwise None. Errors are
+			logged and count as no pupil data.
+		"""
+		try:
+			_LOGGER.debug("Trying dashboard URL: %s", dashboard_url)
+			async with await self._request("GET", dashboard_url, headers=_LOGIN_CALLBACK_REFERER_HEADERS, allow_redirects=True) as resp:
+				dashboard_text = await resp.text()
+				_LOGGER.debug("Dashboard response: %s -> %s", resp.status, resp.url)
+				
+				# Check if this contains pupil data
+				dashboard_lower = dashboard_text.lower()
+				if any(marker in dashboard_lower for marker in _DASHBOARD_PUPIL_MARKERS):
+					_LOGGER.debug("Found pupil data in dashboard")
+					return dashboard_text
+				elif any(marker in dashboard_lower for marker in _DASHBOARD_LOGIN_MARKERS):
+					_LOGGER.debug("Dashboard requires additional auth")
+				else:
+					_LOGGER.debug("Dashboard status unclear")
+		except Exception as e:
+			_LOGGER.debug("Dashboard navigation error: %s", e)
+		return None
 	
 	async def _submit_credentials_and_handle_second_oauth(self, form_html: str, username: str, password: str, form_url: str) -> None:
 		"""Submit credentials and handle the second OAuth token."""
@@ -792,62 +1368,58 @@ class InfoMentorAuth:
 		# Extract form fields
 		form_data = {}
 		
-		# ViewState fields for ASP.NET
-		for field in ['__VIEWSTATE', '__VIEWSTATEGENERATOR', '__EVENTVALIDATION']:
-			pattern = f'{field}["\'][^>]*value=["\']([^"\']+)["\']'
-			match = re.search(pattern, form_html)
-			if match:
-				form_data[field] = match.group(1)
-		
 		# Extract ALL hidden input fields (including school selection fields)
 		# This is crucial - the form contains all school options as hidden fields
 		# InfoMentor needs these to properly route the authentication
-		hidden_pattern = r'<input[^>]*type=["\']hidden["\'][^>]*name=["\']([^"\']+)["\'][^>]*value=["\']([^"\']*)["\']'
-		hidden_matches = re.findall(hidden_pattern, form_html, re.IGNORECASE)
-		for field_name, field_value in hidden_matches:
-			# Don't override the viewstate fields we already extracted
-			if field_name not in form_data:
-				form_data[field_name] = field_value
+		for field_name, field_value in _HIDDEN_INPUT_RE.findall(form_html):
+			# The first input with a given name wins
+			form_data.setdefault(field_name, field_value)
+		
+		# ASP.NET renders its ViewState fields as hidden inputs, so the pass above
+		# normally finds them; the ones it missed are looked for in one more pass,
+		# keeping the first value of each
+		missing = {field for field in _VIEWSTATE_FIELDS if not form_data.get(field)}
+		if missing:
+			for match in _VIEWSTATE_FIELD_RE.finditer(form_html):
+				field = match.group(1)
+				if field in missing:
+					form_data[field] = match.group(2)
+					missing.discard(field)
+					if not missing:
+						break
 		
 		_LOGGER.info(f"Extracted {len(form_data)} form fields (including school selection fields)")
 		
 		# Set form submission fields (these override any hidden fields with same names)
+		for field in _LOGIN_BUTTON_FIELDS:
+			form_data.pop(field, None)
 		form_data.update({
-			'__EVENTTARGET': 'login_ascx$btnLogin',
-			'__EVENTARGUMENT': '',
 			'login_ascx$txtNotandanafn': username,
 			'login_ascx$txtLykilord': password,
 		})
+		form_body = urlencode(form_data).encode() + _LOGIN_BUTTON_FORM_SUFFIX
 		
-		headers = DEFAULT_HEADERS.copy()
-		headers.update({
-			"Content-Type": "application/x-www-form-urlencoded",
-			"Origin": "https://infomentor.se",
-			"Referer": form_url,
-			"Sec-Fetch-Site": "same-origin",
-			"Sec-Fetch-Dest": "document",
-		})
-		
-		from urllib.parse import urlencode
+		headers = {**_CREDENTIALS_POST_HEADERS, "Referer": form_url}
 		
-		await asyncio.sleep(REQUEST_DELAY)  # Be respectful to the server
-		async with self.session.post(
+		async with await self._request(
+			"POST",
 			form_url,
 			headers=headers,
-			data=urlencode(form_data),
+			data=form_body,
 			allow_redirects=True
 		) as resp:
 			cred_text = await resp.text()
-			_LOGGER.error(f"*** CREDENTIALS RESPONSE v0.0.53 *** status={resp.status} url={resp.url}")
+			_LOGGER.debug("Credentials response: status=%s url=%s", resp.status, resp.url)
 			
 			# Check if credentials led to LoginCallback
 			if "LoginCallback" in str(resp.url):
-				_LOGGER.error("*** CREDENTIALS LED TO LOGINCALLBACK v0.0.53 ***")
+				_LOGGER.debug("Credentials led to LoginCallback")
 				await self._handle_login_callback(str(resp.url), cred_text)
 				return
 			
 			# Check for credential rejection first
-			if "login_ascx" in cred_text.lower() and "txtnotandanafn" in cred_text.lower():
+			cred_text_lower = cred_text.lower()
+			if "login_ascx" in cred_text_lower and "txtnotandanafn" in cred_text_lower:
 				# If we still see the login form, credentials were likely rejected
 				_LOGGER.error("Credentials appear to have been rejected")
 				# Log a truncated snippet to aid debugging
@@ -858,93 +1430,71 @@ class InfoMentorAuth:
 				raise InfoMentorAuthError("Invalid credentials - login form still present after submission")
 			
 			# Look for second OAuth token in the response
-			second_oauth_match = re.search(r'oauth_token"\s+value="([\w+=/]+)"', cred_text)
+			second_oauth_match = _OAUTH_TOKEN_VALUE_RE.search(cred_text)
 			if second_oauth_match:
 				second_oauth_token = second_oauth_match.group(1)
-				_LOGGER.error(f"*** FOUND SECOND OAUTH TOKEN v0.0.53 *** {second_oauth_token[:10]}...")
+				_LOGGER.debug("Found second OAuth token: %s...", second_oauth_token[:10])
 				
 				# Submit the second OAuth token
 				await self._submit_second_oauth_token(second_oauth_token)
 			else:
-				_LOGGER.error("*** NO SECOND OAUTH TOKEN v0.0.53 *** - checking authentication state")
+				_LOGGER.debug("No second OAuth token - checking authentication state")
 				
 				# Check for signs of successful authentication
-				success_indicators = [
-					"default.aspx" in str(resp.url).lower(),
-					"hub.infomentor.se" in str(resp.url).lower(),
-					"logout" in cred_text.lower(),
-					"dashboard" in cred_text.lower()
-				]
-				
-				if any(success_indicators):
-					_LOGGER.error("*** CREDENTIALS ACCEPTED WITHOUT SECOND OAUTH v0.0.53 ***")
+				final_url_lower = str(resp.url).lower()
+				if (
+					any(marker in final_url_lower for marker in _CREDENTIALS_ACCEPTED_URL_MARKERS)
+					or any(marker in cred_text_lower for marker in _CREDENTIALS_ACCEPTED_MARKERS)
+				):
+					_LOGGER.debug("Credentials accepted without second OAuth")
 				else:
-					_LOGGER.error("*** UNCLEAR AUTHENTICATION STATE v0.0.53 ***")
+					_LOGGER.debug("Unclear authentication state")
 					# Continue anyway as the authentication might still work
 	
 	async def _submit_second_oauth_token(self, oauth_token: str) -> None:
 		"""Submit the second OAuth token to complete authentication."""
 		_LOGGER.debug("Submitting second OAuth token")
 		
-		headers = DEFAULT_HEADERS.copy()
-		headers.update({
-			"Content-Type": "application/x-www-form-urlencoded",
-			"Origin": HUB_BASE_URL,
-			"Referer": f"{HUB_BASE_URL}/authentication/authentication/login?apitype=im1&forceOAuth=true",
-			"Sec-Fetch-Site": "same-site",
-			"Sec-Fetch-Dest": "document",
-		})
-		
 		oauth_data = f"oauth_token={oauth_token}"
 		
-		async with self.session.post(
+		async with await self._request(
+			"POST",
 			LEGACY_BASE_URL,
-			headers=headers,
+			headers=_SECOND_OAUTH_TOKEN_POST_HEADERS,
 			data=oauth_data,
 			allow_redirects=True
 		) as resp:
 			final_text = await resp.text()
-			_LOGGER.error(f"*** SECOND OAUTH RESPONSE v0.0.53 *** {resp.status}, URL: {resp.url}")
+			_LOGGER.debug("Second OAuth response: %s, URL: %s", resp.status, resp.url)
 			
 			# Check if second OAuth led to LoginCallback
 			if "LoginCallback" in str(resp.url):
-				_LOGGER.error("*** SECOND OAUTH LED TO LOGINCALLBACK v0.0.53 ***")
+				_LOGGER.debug("Second OAuth led to LoginCallback")
 				await self._handle_login_callback(str(resp.url), final_text)
 				return
 			
 			# More robust authentication verification
-			auth_success_indicators = [
-				"default.aspx" in str(resp.url).lower(),  # Successfully redirected to main page
-				"hub.infomentor.se" in str(resp.url),  # Redirected to hub
-				"dashboard" in final_text.lower(),
-				"logout" in final_text.lower(),
-				"pupil" in final_text.lower(),
-				"elev" in final_text.lower()
-			]
-			
-			auth_failure_indicators = [
-				"login_ascx" in final_text.lower(),
-				"txtnotandanafn" in final_text.lower(),
-				"txtlykilord" in final_text.lower(),
-				"invalid" in final_text.lower(),
-				"fel" in final_text.lower()  # Swedish for "error"
-			]
+			final_url = str(resp.url)
+			final_text_lower = final_text.lower()
+			auth_succeeded = (
+				"default.aspx" in final_url.lower()  # Successfully redirected to main page
+				or "hub.infomentor.se" in final_url  # Redirected to hub
+				or any(marker in final_text_lower for marker in _AUTH_SUCCESS_MARKERS)
+			)
 			
 			# Check for positive indicators first
-			if any(auth_success_indicators):
+			if auth_succeeded:
 				_LOGGER.debug("Two-stage OAuth completed successfully - found success indicators")
 				# Touch modern root to ensure cookies are set on modern domain too
 				try:
-					headers2 = DEFAULT_HEADERS.copy()
-					headers2["Referer"] = f"{HUB_BASE_URL}/"
-					async with self.session.get(f"{MODERN_BASE_URL}/", headers=headers2, allow_redirects=True) as modern_resp:
-						_LOGGER.debug(f"Touched modern root, status={modern_resp.status}")
+					async with await self._request("GET", f"{MODERN_BASE_URL}/", headers=_HUB_ROOT_REFERER_HEADERS, allow_redirects=True) as modern_resp:
+						_LOGGER.debug("Touched modern root, status=%s", modern_resp.status)
 				except Exception as e_touch:
-					_LOGGER.debug(f"Touching modern root failed: {e_touch}")
+					_LOGGER.debug("Touching modern root failed: %s", e_touch)
 				return
 			
-			# Check for negative indicators
-			if any(auth_failure_indicators):
+			# Check for negative indicators ("fel" is Swedish for "error")
+			if any(marker in final_text_lower for marker in _AUTH_FAILURE_MARKERS):
 				_LOGGER.warning("Two-stage OAuth may not have completed fully - found failure indicators")
 				# Log a truncated snippet to aid debugging
 				try:
@@ -967,15 +1517,13 @@ class InfoMentorAuth:
 				{"Im1_Ck_LastUsedIdp": str(school_number)},
 				response_url="https://infomentor.se/swedish/production/mentor/",
 			)
-			_LOGGER.debug(f"Set Im1_Ck_LastUsedIdp cookie to {school_number}")
+			_LOGGER.debug("Set Im1_Ck_LastUsedIdp cookie to %s", school_number)
 		except Exception as cookie_err:
-			_LOGGER.debug(f"Unable to set Im1_Ck_LastUsedIdp cookie: {cookie_err}")
+			_LOGGER.debug("Unable to set Im1_Ck_LastUsedIdp cookie: %s", cookie_err)
 	
-	async def _handle_school_selection(self, html: str, referer: str) -> None:
+	async def _handle_school_selection(self, page: str, referer: str) -> None:
 		"""Handle automatic school/municipality selection."""
-		_LOGGER.info("*** PROCESSING SCHOOL SELECTION v0.0.90 ***")
-		
-		import re as _re
+		_LOGGER.debug("Processing school selection")
 		
 		# First, check if we have a previously selected school preference
 		stored_school_url = None
@@ -985,40 +1533,23 @@ class InfoMentorAuth:
 			try:
 				stored_school_url, stored_school_name, stored_school_number = await self.storage.get_selected_school_details()
 				if stored_school_url or stored_school_name or stored_school_number:
-					_LOGGER.info(
-						f"*** FOUND STORED SCHOOL PREFERENCE v0.0.90 *** "
-						f"url={stored_school_url} name={stored_school_name} number={stored_school_number}"
-					)
+					_LOGGER.debug("Found stored school preference: url=%s name=%s number=%s", stored_school_url, stored_school_name, stored_school_number)
 			except Exception as e:
-				_LOGGER.debug(f"Could not load stored school preference: {e}")
+				_LOGGER.debug("Could not load stored school preference: %s", e)
 		
 		# Extract all school options from the selection page
-		# Look for input fields with URLs and their corresponding titles
-		url_pattern = r'<input[^>]*name=["\']login_ascx\$IdpListRepeater\$ctl(\d+)\$url["\'][^>]*value=["\']([^"\']*)["\']'
-		url_matches = _re.findall(url_pattern, html, _re.IGNORECASE)
+		parsed_options = _parse_school_options(page)
 		
-		_LOGGER.error(f"*** FOUND {len(url_matches)} SCHOOL OPTIONS v0.0.76 ***")
+		_LOGGER.debug("Found %s school options", len(parsed_options))
 		
 		# Save school selection page for debugging
-		await _write_text_file_async("/tmp/infomentor_school_selection.html", html)
-		_LOGGER.error("*** SAVED SCHOOL SELECTION PAGE v0.0.76 *** /tmp/infomentor_school_selection.html")
+		_dump_debug_file("/tmp/infomentor_school_selection.html", page)
 		
 		# Log all available schools for debugging
 		school_options: List[SchoolOption] = []
-		for control_id, url in url_matches:
-			title_pattern = f'<span[^>]*id=["\']login_ascx_IdpListRepeater_ctl{control_id}_title["\'][^>]*>([^<]+)</span>'
-			title_match = _re.search(title_pattern, html, _re.IGNORECASE)
-			if title_match:
-				import html as html_module
-				raw_title = title_match.group(1).strip()
-				title = html_module.unescape(raw_title)
-				decoded_url = html_module.unescape(url.strip())
-				number_pattern = f'<input[^>]*name=["\']login_ascx\\$IdpListRepeater\\$ctl{control_id}\\$number["\'][^>]*value=["\']([^"\']*)["\']'
-				number_match = _re.search(number_pattern, html, _re.IGNORECASE)
-				school_number = html_module.unescape(number_match.group(1).strip()) if number_match else None
-				option = SchoolOption(title=title, url=decoded_url, number=school_number)
-				school_options.append(option)
-				_LOGGER.error(f"*** AVAILABLE SCHOOL v0.0.90 *** [{control_id}] #{school_number or 'n/a'}: '{title}' -> {decoded_url}")
+		for control_id, option in parsed_options:
+			school_options.append(option)
+			_LOGGER.debug("Available school: [%s] #%s: '%s' -> %s", control_id, option.number or 'n/a', option.title, option.url)
 		
 		selected_option, scored_options = _choose_best_school_option(
 			school_options,
@@ -1030,10 +1561,7 @@ class InfoMentorAuth:
 		
 		if scored_options:
 			for rank, (title, url, score, order, number) in enumerate(scored_options[:5], start=1):
-				_LOGGER.error(
-					f"*** SCHOOL SCORECARD v0.0.90 *** rank={rank} score={score} order={order} "
-					f"number={number} '{title}' -> {url}"
-				)
+				_LOGGER.debug("School scorecard: rank=%s score=%s order=%s number=%s '%s' -> %s", rank, score, order, number, title, url)
 		
 		if not selected_option:
 			_LOGGER.warning("No suitable school found in selection page")
@@ -1042,110 +1570,78 @@ class InfoMentorAuth:
 		school_name = selected_option.title
 		school_url = selected_option.url
 		school_number = selected_option.number
-		_LOGGER.info(f"*** CHOSEN SCHOOL v0.0.90 *** {school_name} -> {school_url}")
+		_LOGGER.debug("Chosen school: %s -> %s", school_name, school_url)
 		if school_number:
 			self._preferred_school_number = school_number
 			self._apply_last_used_idp_cookie(school_number)
 		
 		# Navigate to the selected school's authentication URL
-		headers = DEFAULT_HEADERS.copy()
-		headers.update({
-			"Referer": referer,
-		})
+		headers = {**DEFAULT_HEADERS, "Referer": referer}
 		
 		# Save the selected school for future use
 		if self.storage and school_url and school_name:
 			try:
 				await self.storage.save_selected_school_url(school_url, school_name, school_number)
 			except Exception as e:
-				_LOGGER.debug(f"Could not save selected school: {e}")
+				_LOGGER.debug("Could not save selected school: %s", e)
 		
 		try:
-			await asyncio.sleep(REQUEST_DELAY)
-			_LOGGER.error(f"*** ATTEMPTING SCHOOL SELECTION v0.0.75 *** {school_name} -> {school_url}")
+			_LOGGER.debug("Attempting school selection: %s -> %s", school_name, school_url)
 			
 			# Try with a shorter timeout and better error handling
-			timeout = aiohttp.ClientTimeout(total=10)
-			async with self.session.get(school_url, headers=headers, allow_redirects=True, timeout=timeout) as resp:
-				_LOGGER.error(f"*** SCHOOL SELECTION SUCCESS v0.0.75 *** {resp.status} -> {resp.url}")
+			async with await self._request("GET", school_url, headers=headers, allow_redirects=True, timeout=_SHORT_REQUEST_TIMEOUT) as resp:
+				_LOGGER.debug("School selection success: %s -> %s", resp.status, resp.url)
 				selection_text = await resp.text()
 				
 				# Handle authentication method selection page immediately
-				_LOGGER.error(f"*** AUTH METHOD CHECK v0.0.47 *** chooseAuthmech: {'chooseAuthmech' in str(resp.url)}")
-				_LOGGER.error(f"*** PAGE CONTENT SAMPLE v0.0.47 *** {selection_text[:1000]}...")
-				_LOGGER.error(f"*** PAGE CONTENT LENGTH v0.0.47 *** {len(selection_text)} chars")
-				
-				# Check for multiple possible authentication method texts in the complete content
-				auth_method_indicators = [
-					"Lösenord",          # Swedish
-					"Password",          # English  
-					"L%C3%B6senord",     # URL encoded
-					"L&#246;senord",     # HTML entity encoded
-					"L&#37;c3&#37;b6senord", # Double URL encoded  
-					"lösenord",          # Lowercase
-					"password",          # Lowercase English
-					"smartid",           # SmartID (might be in the content)
-					"SmartID",           # SmartID capitalized
-					"App",               # App authentication
-					"Tjänstekort",       # Service card
-					"Tj&#228;nstekort",  # HTML entity encoded service card
-					"SAML"               # SAML authentication
-				]
-				
-				found_indicators = [indicator for indicator in auth_method_indicators if indicator in selection_text]
-				_LOGGER.error(f"*** FOUND AUTH INDICATORS v0.0.48 *** {found_indicators}")
+				selection_url = str(resp.url)
+				is_auth_method_page = "chooseAuthmech" in selection_url
+				_LOGGER.debug("Auth method check: chooseAuthmech: %s", is_auth_method_page)
+				_LOGGER.debug("Page content sample: %s...", selection_text[:1000])
+				_LOGGER.debug("Page content length: %s chars", len(selection_text))
 				
-				# Check for password option with HTML entities and encodings
-				password_indicators = ["Lösenord", "Password", "L%C3%B6senord", "L&#246;senord", "L&#37;c3&#37;b6senord", "lösenord", "password"]
-				has_password_option = any(indicator in selection_text for indicator in password_indicators)
-				_LOGGER.error(f"*** PASSWORD OPTION CHECK v0.0.48 *** {has_password_option}")
+				# The full indicator scan only feeds the debug log
+				if _LOGGER.isEnabledFor(logging.DEBUG):
+					found_indicators = [indicator for indicator in _AUTH_METHOD_INDICATORS if indicator in selection_text]
+					_LOGGER.debug("Found auth indicators: %s", found_indicators)
 				
-				if "chooseAuthmech" in str(resp.url):
+				if is_auth_method_page:
+					# Check for password option with HTML entities and encodings
+					has_password_option = any(indicator in selection_text for indicator in _PASSWORD_OPTION_INDICATORS)
+					_LOGGER.debug("Password option check: %s", has_password_option)
 					if has_password_option:
-						_LOGGER.error("*** DETECTED AUTH METHOD SELECTION v0.0.47 ***")
-						await self._handle_auth_method_selection(selection_text, str(resp.url))
+						_LOGGER.debug("Detected auth method selection")
+						await self._handle_auth_method_selection(selection_text, selection_url)
 					else:
 						# Fallback: Try to construct password URL from URL parameters
-						_LOGGER.error("*** NO PASSWORD IN CONTENT - TRYING URL FALLBACK v0.0.47 ***")
-						if "L%C3%B6senord" in str(resp.url):
-							await self._handle_auth_method_fallback(str(resp.url))
+						_LOGGER.debug("No password in content - trying URL fallback")
+						if "L%C3%B6senord" in selection_url:
+							await self._handle_auth_method_fallback(selection_url)
 					# Note: Don't return here, let the flow continue to check for more redirects
 				elif 'id="openid_message"' in selection_text:
-					_LOGGER.error("*** SCHOOL RETURNED AUTO-SUBMIT FORM v0.0.43 ***")
-					form_result = await _auto_submit_openid_form(self.session, selection_text, str(resp.url))
+					_LOGGER.debug("School returned auto-submit form")
+					form_result = await _auto_submit_openid_form(self.session, selection_text, selection_url, pacer=self._pacer)
 					if form_result.executed:
-						_LOGGER.error("*** SCHOOL AUTO-SUBMIT COMPLETED v0.0.43 ***")
+						_LOGGER.debug("School auto-submit completed")
 					
 		except Exception as e:
-			_LOGGER.error(f"*** SCHOOL SELECTION FAILED v0.0.43 *** {e}")
-			_LOGGER.error(f"*** PROBLEMATIC URL v0.0.43 *** {school_url}")
+			_LOGGER.debug("School selection failed: %s", e)
+			_LOGGER.debug("Problematic URL: %s", school_url)
 			
 			# If school selection fails, try to continue without it
 			# Some accounts might not need explicit school selection
-			_LOGGER.error("*** CONTINUING WITHOUT SCHOOL SELECTION v0.0.43 ***")
+			_LOGGER.debug("Continuing without school selection")
 
-	async def _handle_auth_method_selection(self, html: str, page_url: str) -> None:
+	async def _handle_auth_method_selection(self, page: str, page_url: str) -> None:
 		"""Handle authentication method selection by choosing password login."""
-		_LOGGER.error("*** PROCESSING AUTH METHOD SELECTION v0.0.44 ***")
-		
-		import re as _re
+		_LOGGER.debug("Processing auth method selection")
 		
 		# Look for the password option with multiple possible texts including HTML entities
-		password_patterns = [
-			r'<a[^>]*href=["\']([^"\']*L[^"\']*c3[^"\']*b6senord[^"\']*)["\'][^>]*>.*?L&#246;senord.*?</a>',  # HTML entity with URL check
-			r'<a[^>]*href=["\']([^"\']*)["\'][^>]*>.*?Lösenord.*?</a>',
-			r'<a[^>]*href=["\']([^"\']*)["\'][^>]*>.*?Password.*?</a>',
-			r'<a[^>]*href=["\']([^"\']*)["\'][^>]*>.*?lösenord.*?</a>',
-			r'<a[^>]*href=["\']([^"\']*)["\'][^>]*>.*?password.*?</a>',
-			r'<a[^>]*href=["\']([^"\']*)["\'][^>]*>.*?L&#246;senord.*?</a>',  # HTML entity fallback
-			r'<a[^>]*href=["\']([^"\']*)["\'][^>]*>.*?L&#37;c3&#37;b6senord.*?</a>',  # Double encoded fallback
-		]
-		
 		password_match = None
-		for pattern in password_patterns:
-			password_match = _re.search(pattern, html, _re.IGNORECASE | _re.DOTALL)
+		for pattern in _PASSWORD_LINK_RES:
+			password_match = pattern.search(page)
 			if password_match:
-				_LOGGER.error(f"*** FOUND PASSWORD LINK PATTERN v0.0.46 *** {pattern}")
+				_LOGGER.debug("Found password link pattern: %s", pattern.pattern)
 				break
 		
 		if password_match:
@@ -1153,49 +1649,43 @@ class InfoMentorAuth:
 			
 			# CRITICAL: Decode HTML entities in the URL before using it
 			# The URL often contains things like &#37;c3&#37;b6 which need to be decoded
-			import html
 			password_url = html.unescape(password_url)
-			_LOGGER.error(f"*** DECODED PASSWORD URL v0.0.79 *** {password_url}")
+			_LOGGER.debug("Decoded password URL: %s", password_url)
 			
 			# Handle relative URLs
-			from urllib.parse import urljoin
 			if password_url.startswith('/'):
-				password_url = urljoin(page_url, password_url)
+				password_url = _urljoin(page_url, password_url)
 			elif not password_url.startswith('http'):
 				# Relative path without leading slash
 				base_url = '/'.join(page_url.split('/')[:-1]) + '/'
-				password_url = urljoin(base_url, password_url)
+				password_url = _urljoin(base_url, password_url)
 			
-			_LOGGER.error(f"*** SELECTING PASSWORD AUTH METHOD v0.0.79 *** {password_url}")
+			_LOGGER.debug("Selecting password auth method: %s", password_url)
 			
-			headers = DEFAULT_HEADERS.copy()
-			headers.update({
-				"Referer": page_url,
-			})
+			headers = {**DEFAULT_HEADERS, "Referer": page_url}
 			
 			try:
-				await asyncio.sleep(REQUEST_DELAY)
-				async with self.session.get(password_url, headers=headers, allow_redirects=True) as resp:
-					_LOGGER.error(f"*** AUTH METHOD SELECTION RESULT v0.0.44 *** {resp.status} -> {resp.url}")
+				async with await self._request("GET", password_url, headers=headers, allow_redirects=True) as resp:
+					_LOGGER.debug("Auth method selection result: %s -> %s", resp.status, resp.url)
 					
 					auth_method_text = await resp.text()
 					
 					# Handle any auto-submit forms that might appear
 					if 'id="openid_message"' in auth_method_text:
-						_LOGGER.error("*** AUTH METHOD RETURNED AUTO-SUBMIT FORM v0.0.44 ***")
-						form_result = await _auto_submit_openid_form(self.session, auth_method_text, str(resp.url))
+						_LOGGER.debug("Auth method returned auto-submit form")
+						form_result = await _auto_submit_openid_form(self.session, auth_method_text, str(resp.url), pacer=self._pacer)
 						if form_result.executed:
-							_LOGGER.error("*** AUTH METHOD AUTO-SUBMIT COMPLETED v0.0.44 ***")
+							_LOGGER.debug("Auth method auto-submit completed")
 					
 			except Exception as e:
-				_LOGGER.error(f"*** AUTH METHOD SELECTION FAILED v0.0.44 *** {e}")
+				_LOGGER.debug("Auth method selection failed: %s", e)
 		else:
-			_LOGGER.error("*** NO PASSWORD AUTH METHOD FOUND v0.0.44 ***")
-			_LOGGER.error(f"*** AUTH METHOD PAGE SNIPPET v0.0.44 *** {html[:500]}...")
+			_LOGGER.debug("No password auth method found")
+			_LOGGER.debug("Auth method page snippet: %s...", page[:500])
 
 	async def _handle_auth_method_fallback(self, page_url: str) -> None:
 		"""Fallback method to handle authentication method selection by constructing URL directly."""
-		_LOGGER.error("*** PROCESSING AUTH METHOD FALLBACK v0.0.47 ***")
+		_LOGGER.debug("Processing auth method fallback")
 		
 		# Extract the base URL and try to construct the password selection URL
 		# Example URL: https://idp01.avesta.se/wa/chooseAuthmech?authmechs=App%20-%20SmartID:App%20-%20SmartID;L%C3%B6senord:L%C3%B6senord;Tj%C3%A4nstekort:Tj%C3%A4nstekort
@@ -1214,106 +1704,86 @@ class InfoMentorAuth:
 			f"{base_url.replace('/chooseAuthmech', '/login')}?method=password",
 		]
 		
-		headers = DEFAULT_HEADERS.copy()
-		headers.update({
-			"Referer": page_url,
-		})
+		headers = {**DEFAULT_HEADERS, "Referer": page_url}
 		
 		for password_url in possible_password_urls:
 			try:
-				_LOGGER.error(f"*** TRYING FALLBACK URL v0.0.47 *** {password_url}")
-				await asyncio.sleep(REQUEST_DELAY)
-				
-				async with self.session.get(password_url, headers=headers, allow_redirects=True, timeout=aiohttp.ClientTimeout(total=10)) as resp:
+				_LOGGER.debug("Trying fallback URL: %s", password_url)
+				async with await self._request("GET", password_url, headers=headers, allow_redirects=True, timeout=_SHORT_REQUEST_TIMEOUT) as resp:
 					if resp.status == 200:
-						_LOGGER.error(f"*** FALLBACK URL SUCCESS v0.0.47 *** {resp.status} -> {resp.url}")
+						_LOGGER.debug("Fallback URL success: %s -> %s", resp.status, resp.url)
 						auth_result_text = await resp.text()
 						
 						# Check if this led to a login form or another redirect
-						if any(field in auth_result_text.lower() for field in ['txtnotandanafn', 'txtlykilord', 'password', 'username']):
-							_LOGGER.error("*** FALLBACK LED TO LOGIN FORM v0.0.47 ***")
+						auth_result_lower = auth_result_text.lower()
+						if any(field in auth_result_lower for field in _LOGIN_FORM_FIELD_MARKERS):
+							_LOGGER.debug("Fallback led to login form")
 							return  # Success - let the normal flow handle the login form
 						elif 'id="openid_message"' in auth_result_text:
-							_LOGGER.error("*** FALLBACK RETURNED AUTO-SUBMIT FORM v0.0.47 ***")
-							form_result = await _auto_submit_openid_form(self.session, auth_result_text, str(resp.url))
+							_LOGGER.debug("Fallback returned auto-submit form")
+							form_result = await _auto_submit_openid_form(self.session, auth_result_text, str(resp.url), pacer=self._pacer)
 							if form_result.executed:
-								_LOGGER.error("*** FALLBACK AUTO-SUBMIT COMPLETED v0.0.47 ***")
+								_LOGGER.debug("Fallback auto-submit completed")
 								return
 						else:
-							_LOGGER.error(f"*** FALLBACK URL UNCLEAR RESULT v0.0.47 *** {auth_result_text[:200]}...")
+							_LOGGER.debug("Fallback URL unclear result: %s...", auth_result_text[:200])
 					else:
-						_LOGGER.error(f"*** FALLBACK URL FAILED v0.0.47 *** {resp.status}")
+						_LOGGER.debug("Fallback URL failed: %s", resp.status)
 						
 			except Exception as e:
-				_LOGGER.error(f"*** FALLBACK URL EXCEPTION v0.0.47 *** {password_url} -> {e}")
+				_LOGGER.debug("Fallback URL exception: %s -> %s", password_url, e)
 				continue
 		
-		_LOGGER.error("*** ALL FALLBACK URLS FAILED v0.0.47 ***")
+		_LOGGER.debug("All fallback URLs failed")
 
 	async def _direct_login_with_credentials(self, username: str, password: str) -> None:
 		"""Login directly using username/password on the main InfoMentor login page."""
-		_LOGGER.error("*** STARTING DIRECT LOGIN v0.0.51 ***")
+		_LOGGER.debug("Starting direct login")
 		
 		# Go to the main login page
-		login_url = "https://infomentor.se/swedish/production/mentor/"
-		headers = DEFAULT_HEADERS.copy()
+		login_url = LEGACY_BASE_URL
+		headers = DEFAULT_HEADERS
 		
 		try:
 			# First, get the login page to see the form
-			await asyncio.sleep(REQUEST_DELAY)
-			async with self.session.get(login_url, headers=headers) as resp:
+			async with await self._request("GET", login_url, headers=headers) as resp:
 				login_page = await resp.text()
-				_LOGGER.error(f"*** LOGIN PAGE RESPONSE v0.0.51 *** {resp.status} -> {resp.url}")
-				_LOGGER.error(f"*** LOGIN PAGE LENGTH v0.0.51 *** {len(login_page)} chars")
+				_LOGGER.debug("Login page response: %s -> %s", resp.status, resp.url)
+				_LOGGER.debug("Login page length: %s chars", len(login_page))
 				
 				# Save for debugging
-				await _write_text_file_async("/tmp/infomentor_login_page.html", login_page)
-				_LOGGER.error("*** SAVED LOGIN PAGE v0.0.51 *** /tmp/infomentor_login_page.html")
+				_dump_debug_file("/tmp/infomentor_login_page.html", login_page)
 				
-				# Look for the login form
-				import re
-				
-				# Find the form action URL
-				form_pattern = r'<form[^>]*action=["\']([^"\']*)["\'][^>]*>'
-				form_match = re.search(form_pattern, login_page, re.IGNORECASE)
+				# Find the login form's action URL
+				form_match = _LOGIN_FORM_ACTION_RE.search(login_page)
 				
 				if not form_match:
-					_LOGGER.error("*** NO LOGIN FORM FOUND v0.0.51 ***")
+					_LOGGER.debug("No login form found")
 					raise InfoMentorAuthError("Could not find login form on main page")
 				
 				form_action = form_match.group(1)
-				_LOGGER.error(f"*** FOUND LOGIN FORM v0.0.51 *** action={form_action}")
+				_LOGGER.debug("Found login form: action=%s", form_action)
 				
 				# Look for username and password field names
-				username_patterns = [
-					r'<input[^>]*name=["\']([^"\']*)["\'][^>]*(?:type=["\']text["\']|type=["\']email["\'])',
-					r'<input[^>]*(?:type=["\']text["\']|type=["\']email["\'])[^>]*name=["\']([^"\']*)["\']'
-				]
-				
-				password_patterns = [
-					r'<input[^>]*name=["\']([^"\']*)["\'][^>]*type=["\']password["\']',
-					r'<input[^>]*type=["\']password["\'][^>]*name=["\']([^"\']*)["\']'
-				]
-				
 				username_field = None
 				password_field = None
 				
-				for pattern in username_patterns:
-					match = re.search(pattern, login_page, re.IGNORECASE)
+				for pattern in _USERNAME_FIELD_RES:
+					match = pattern.search(login_page)
 					if match:
 						username_field = match.group(1)
 						break
 				
-				for pattern in password_patterns:
-					match = re.search(pattern, login_page, re.IGNORECASE)
+				for pattern in _PASSWORD_FIELD_RES:
+					match = pattern.search(login_page)
 					if match:
 						password_field = match.group(1)
 						break
 				
-				_LOGGER.error(f"*** LOGIN FIELDS v0.0.51 *** username={username_field}, password={password_field}")
+				_LOGGER.debug("Login fields: username=%s, password=%s", username_field, password_field)
 				
 				if not username_field or not password_field:
-					_LOGGER.error("*** COULD NOT FIND LOGIN FIELDS v0.0.51 ***")
+					_LOGGER.debug("Could not find login fields")
 					raise InfoMentorAuthError("Could not find username/password fields")
 				
 				# Prepare form data
@@ -1323,12 +1793,11 @@ class InfoMentorAuth:
 				}
 				
 				# Look for any hidden fields (CSRF tokens, etc.)
-				hidden_pattern = r'<input[^>]*type=["\']hidden["\'][^>]*name=["\']([^"\']*)["\'][^>]*value=["\']([^"\']*)["\']'
-				hidden_matches = re.findall(hidden_pattern, login_page, re.IGNORECASE)
+				hidden_matches = _HIDDEN_INPUT_RE.findall(login_page)
 				
 				for field_name, field_value in hidden_matches:
 					form_data[field_name] = field_value
-					_LOGGER.error(f"*** HIDDEN FIELD v0.0.51 *** {field_name}={field_value}")
+					_LOGGER.debug("Hidden field: %s=%s", field_name, field_value)
 				
 				# Construct the full form action URL
 				if form_action.startswith('/'):
@@ -1338,104 +1807,83 @@ class InfoMentorAuth:
 				else:
 					form_url = form_action
 				
-				_LOGGER.error(f"*** SUBMITTING LOGIN FORM v0.0.51 *** {form_url}")
-				_LOGGER.error(f"*** FORM DATA v0.0.51 *** {list(form_data.keys())}")
+				_LOGGER.debug("Submitting login form: %s", form_url)
+				_LOGGER.debug("Form data: %s", list(form_data.keys()))
 				
 				# Submit the login form
-				headers.update({
-					"Content-Type": "application/x-www-form-urlencoded",
-					"Referer": login_url,
-					"Origin": "https://infomentor.se"
-				})
-				
-				await asyncio.sleep(REQUEST_DELAY)
-				async with self.session.post(form_url, data=form_data, headers=headers, allow_redirects=True) as resp:
+				async with await self._request("POST", form_url, data=form_data, headers=_DIRECT_LOGIN_POST_HEADERS, allow_redirects=True) as resp:
 					login_result = await resp.text()
-					_LOGGER.error(f"*** LOGIN RESULT v0.0.51 *** {resp.status} -> {resp.url}")
-					_LOGGER.error(f"*** LOGIN RESULT LENGTH v0.0.51 *** {len(login_result)} chars")
+					_LOGGER.debug("Login result: %s -> %s", resp.status, resp.url)
+					_LOGGER.debug("Login result length: %s chars", len(login_result))
 					
 					# Save for debugging
-					await _write_text_file_async("/tmp/infomentor_login_result.html", login_result)
-					_LOGGER.error("*** SAVED LOGIN RESULT v0.0.51 *** /tmp/infomentor_login_result.html")
+					_dump_debug_file("/tmp/infomentor_login_result.html", login_result)
 					
 					# Check if login was successful (look for signs of the main dashboard)
-					success_indicators = [
-						"student-menu",  # Main menu for students
-						"pupil-selection", # Pupil selection
-						"dashboard",  # Dashboard elements
-						"mentor-main", # Main mentor interface
-						"logout",  # Logout link indicates successful login
-						"logga ut"  # Swedish logout
-					]
-					
-					is_success = any(indicator in login_result.lower() for indicator in success_indicators)
+					login_result_lower = login_result.lower()
+					is_success = any(marker in login_result_lower for marker in _DIRECT_LOGIN_SUCCESS_MARKERS)
 					
 					if is_success:
-						_LOGGER.error("*** DIRECT LOGIN SUCCESS v0.0.51 ***")
+						_LOGGER.debug("Direct login success")
 					else:
 						# Check for error messages
-						error_indicators = [
-							"felaktigt",  # Incorrect (Swedish)
-							"error",
-							"failed",
-							"invalid",
-							"wrong"
-						]
-						
-						has_error = any(indicator in login_result.lower() for indicator in error_indicators)
+						has_error = any(marker in login_result_lower for marker in _DIRECT_LOGIN_ERROR_MARKERS)
 						
 						if has_error:
-							_LOGGER.error("*** DIRECT LOGIN FAILED - INVALID CREDENTIALS v0.0.51 ***")
+							_LOGGER.debug("Direct login failed - invalid credentials")
 							raise InfoMentorAuthError("Invalid username or password")
 						else:
-							_LOGGER.error("*** DIRECT LOGIN UNCLEAR RESULT v0.0.51 ***")
-							_LOGGER.error(f"*** RESULT SAMPLE v0.0.51 *** {login_result[:500]}...")
+							_LOGGER.debug("Direct login unclear result")
+							_LOGGER.debug("Result sample: %s...", login_result[:500])
 		
 		except Exception as e:
-			_LOGGER.error(f"*** DIRECT LOGIN EXCEPTION v0.0.51 *** {e}")
+			_LOGGER.debug("Direct login exception: %s", e)
 			raise
 
 	async def _verify_authentication_status(self) -> bool:
 		"""Verify authentication status by attempting to access protected resources."""
-		_LOGGER.debug("Verifying authentication status")
+		if self._auth_verified_at is not None and time.monotonic() - self._auth_verified_at < AUTH_VERIFY_CACHE_SECONDS:
+			_LOGGER.debug("Authentication verified moments ago; skipping endpoint probes")
+			return True
 		
-		test_endpoints = [
-			f"{HUB_BASE_URL}/",
-			f"{HUB_BASE_URL}/#/",
-			f"{MODERN_BASE_URL}/",
-			"https://infomentor.se/Swedish/Production/mentor/default.aspx"
-		]
+		_LOGGER.debug("Verifying authentication status")
 		
-		for endpoint in test_endpoints:
-			try:
-				headers = DEFAULT_HEADERS.copy()
-				async with self.session.get(endpoint, headers=headers, allow_redirects=True) as resp:
-					if resp.status == 200:
-						text = await resp.text()
-						
-						# Check for authenticated content
-						authenticated_indicators = [
-							"logout" in text.lower(),
-							"pupil" in text.lower(),
-							"elev" in text.lower(),
-							"dashboard" in text.lower(),
-							"switchpupil" in text.lower(),
-						]
-						
-						if any(authenticated_indicators):
-							_LOGGER.debug(f"Authentication verified successfully via {endpoint}")
-							return True
-			except Exception as e:
-				_LOGGER.debug(f"Failed to verify authentication via {endpoint}: {e}")
-				continue
+		# The probes are independent GETs, so run them concurrently and stop at the
+		# first endpoint that serves authenticated content
+		pending = {
+			asyncio.create_task(self._probe_auth_endpoint(endpoint)): endpoint
+			for endpoint in _AUTH_VERIFY_ENDPOINTS
+		}
+		try:
+			while pending:
+				done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+				for task in done:
+					endpoint = pending.pop(task)
+					if task.result():
+						_LOGGER.debug("Authentication verified successfully via %s", endpoint)
+						self._auth_verified_at = time.monotonic()
+						return True
+		finally:
+			for task in pending:
+				task.cancel()
 		
 		# If we get here, authentication verification failed
 		_LOGGER.warning("Could not verify authentication status - OAuth may have failed")
 		return False
 	
+	async def _probe_auth_endpoint(self, endpoint: str) -> bool:
+		"""Return True if endpoint serves authenticated content; errors count as False."""
+		try:
+			async with await self._request("GET", endpoint, headers=DEFAULT_HEADERS, allow_redirects=True) as resp:
+				# Check for authenticated content
+				return resp.status == 200 and await _response_contains(resp, _AUTH_INDICATORS)
+		except Exception as e:
+			_LOGGER.debug("Failed to verify authentication via %s: %s", endpoint, e)
+			return False
+	
 	async def _try_alternative_hub_access(self, headers: dict) -> None:
 		"""Try alternative methods to access the hub dashboard."""
-		_LOGGER.error("*** TRYING ALTERNATIVE HUB ACCESS v0.0.53 ***")
+		_LOGGER.debug("Trying alternative hub access")
 		
 		# List of alternative URLs to try
 		alternative_urls = [
@@ -1447,24 +1895,23 @@ class InfoMentorAuth:
 		
 		for alt_url in alternative_urls:
 			try:
-				_LOGGER.error(f"*** TRYING ALTERNATIVE URL v0.0.53 *** {alt_url}")
-				await asyncio.sleep(REQUEST_DELAY)
-				async with self.session.get(alt_url, headers=headers, allow_redirects=True) as resp:
-					_LOGGER.error(f"*** ALTERNATIVE URL RESPONSE v0.0.53 *** {resp.status} -> {resp.url}")
+				_LOGGER.debug("Trying alternative URL: %s", alt_url)
+				async with await self._request("GET", alt_url, headers=headers, allow_redirects=True) as resp:
+					_LOGGER.debug("Alternative URL response: %s -> %s", resp.status, resp.url)
 					
 					# If we get a good response without auto-submit, we might have found the right path
 					alt_text = await resp.text()
 					if len(alt_text) > 10000 and 'id="openid_message"' not in alt_text:
-						_LOGGER.error(f"*** FOUND GOOD ALTERNATIVE v0.0.53 *** {alt_url} -> {len(alt_text)} chars")
-						await _write_text_file_async(f"/tmp/infomentor_hub_alt_{alt_url.split('/')[-1]}.html", alt_text)
+						_LOGGER.debug("Found good alternative: %s -> %s chars", alt_url, len(alt_text))
+						_dump_debug_file(f"/tmp/infomentor_hub_alt_{alt_url.split('/')[-1]}.html", alt_text)
 						break
 			except Exception as e:
-				_LOGGER.error(f"*** ALTERNATIVE URL ERROR v0.0.53 *** {alt_url}: {e}")
+				_LOGGER.debug("Alternative URL error: %s: %s", alt_url, e)
 				continue
 	
 	async def _get_pupil_ids_modern(self) -> list[str]:
 		"""Get pupil IDs from modern InfoMentor Hub interface."""
-		_LOGGER.error("*** GETTING PUPIL IDS FROM HUB v0.0.64 ***")
+		_LOGGER.debug("Getting pupil IDs from hub")
 		
 		# Add loop detection to prevent infinite redirect cycles
 		school_selection_attempts = 0
@@ -1475,39 +1922,38 @@ class InfoMentorAuth:
 		try:
 			# Try the main hub dashboard root (where OAuth leads us)
 			dashboard_url = f"{HUB_BASE_URL}/"
-			headers = DEFAULT_HEADERS.copy()
+			headers = DEFAULT_HEADERS
 			
 			# Try the main hub dashboard root (where OAuth leads us)
-			await asyncio.sleep(REQUEST_DELAY)
-			async with self.session.get(dashboard_url, headers=headers) as resp:
-				_LOGGER.error(f"*** HUB DASHBOARD REQUEST v0.0.64 *** {dashboard_url} -> status: {resp.status}")
+			async with await self._request("GET", dashboard_url, headers=headers) as resp:
+				_LOGGER.debug("Hub dashboard request: %s -> status: %s", dashboard_url, resp.status)
 				text = await resp.text()
-				_LOGGER.error(f"*** HUB DASHBOARD CONTENT LENGTH v0.0.64 *** {len(text)}")
+				hub_root_text = text
+				_LOGGER.debug("Hub dashboard content length: %s", len(text))
 				
 				# Save hub dashboard response for analysis
-				await _write_text_file_async("/tmp/infomentor_hub_dashboard.html", text)
-				_LOGGER.error("*** SAVED HUB DASHBOARD v0.0.53 *** /tmp/infomentor_hub_dashboard.html")
+				_dump_debug_file("/tmp/infomentor_hub_dashboard.html", text)
 				
 				# Handle auto-submit form - try multiple strategies to get real hub content
-				if ('id="openid_message"' in text) or ('id=\'openid_message\'' in text):
+				if _has_openid_form(text):
 					auto_submit_attempts += 1
-					_LOGGER.error(f"*** DETECTED AUTO-SUBMIT FORM ON HUB v0.0.64 *** attempt {auto_submit_attempts}/{max_auto_submit_attempts}")
-					_LOGGER.error(f"*** CONTENT LENGTH IS ONLY {len(text)} - NEED TO GET REAL HUB v0.0.64 ***")
+					_LOGGER.debug("Detected auto-submit form on hub: attempt %s/%s", auto_submit_attempts, max_auto_submit_attempts)
+					_LOGGER.debug("Content length is only %s - need to get real hub", len(text))
 					
 					# Prevent infinite auto-submit loops
 					if auto_submit_attempts > max_auto_submit_attempts:
-						_LOGGER.error(f"*** AUTO-SUBMIT LOOP DETECTED v0.0.64 *** stopping after {auto_submit_attempts} attempts")
+						_LOGGER.debug("Auto-submit loop detected: stopping after %s attempts", auto_submit_attempts)
 						raise InfoMentorAuthError("Auto-submit loop detected - authentication failed")
 					
 					# Check if the auto-submit would take us to legacy interface
-					action_match = re.search(r'action=["\']([^"\']+)["\']', text, re.IGNORECASE)
+					action_match = _FORM_ACTION_RE.search(text)
 					if action_match:
 						action_url = action_match.group(1)
-						_LOGGER.error(f"*** AUTO-SUBMIT ACTION URL v0.0.64 *** {action_url}")
+						_LOGGER.debug("Auto-submit action URL: %s", action_url)
 						
 						# If it would take us to legacy, try alternative approaches first
 						if "infomentor.se/swedish/production/mentor" in action_url.lower():
-							_LOGGER.error("*** AUTO-SUBMIT LEADS TO LEGACY - TRYING ALTERNATIVES v0.0.64 ***")
+							_LOGGER.debug("Auto-submit leads to legacy - trying alternatives")
 							
 							# Strategy 1: Try multiple hub URLs to find one that works
 							hub_alternatives = [
@@ -1520,63 +1966,62 @@ class InfoMentorAuth:
 							found_real_hub = False
 							for alt_url in hub_alternatives:
 								try:
-									_LOGGER.error(f"*** TRYING HUB ALTERNATIVE v0.0.55 *** {alt_url}")
-									await asyncio.sleep(REQUEST_DELAY)
-									async with self.session.get(alt_url, headers=headers, allow_redirects=True) as alt_resp:
+									_LOGGER.debug("Trying hub alternative: %s", alt_url)
+									async with await self._request("GET", alt_url, headers=headers, allow_redirects=True) as alt_resp:
 										alt_text = await alt_resp.text()
-										_LOGGER.error(f"*** ALTERNATIVE RESULT v0.0.55 *** {alt_resp.status} -> {len(alt_text)} chars")
+										_LOGGER.debug("Alternative result: %s -> %s chars", alt_resp.status, len(alt_text))
 										
 										# If we get substantial content without auto-submit, use it
 										if len(alt_text) > 10000 and 'id="openid_message"' not in alt_text:
-											_LOGGER.error(f"*** FOUND REAL HUB CONTENT v0.0.55 *** {alt_url}")
+											_LOGGER.debug("Found real hub content: %s", alt_url)
 											text = alt_text
 											found_real_hub = True
-											await _write_text_file_async("/tmp/infomentor_hub_alternative_success.html", text)
+											_dump_debug_file("/tmp/infomentor_hub_alternative_success.html", text)
 											break
 								except Exception as e:
-									_LOGGER.error(f"*** ALTERNATIVE ERROR v0.0.55 *** {alt_url}: {e}")
+									_LOGGER.debug("Alternative error: %s: %s", alt_url, e)
 									continue
 							
 							# Strategy 2: If alternatives failed, wait and retry main hub URL
 							if not found_real_hub:
-								_LOGGER.error("*** ALTERNATIVES FAILED - WAITING AND RETRYING MAIN HUB v0.0.55 ***")
+								_LOGGER.debug("Alternatives failed - waiting and retrying main hub")
 								await asyncio.sleep(REQUEST_DELAY * 3)  # Wait longer
-								async with self.session.get(dashboard_url, headers=headers) as retry_resp:
+								async with await self._request("GET", dashboard_url, headers=headers) as retry_resp:
 									retry_text = await retry_resp.text()
-									_LOGGER.error(f"*** RETRY RESULT v0.0.55 *** {retry_resp.status} -> {len(retry_text)} chars")
+									_LOGGER.debug("Retry result: %s -> %s chars", retry_resp.status, len(retry_text))
 									
 									if len(retry_text) > 10000 and 'id="openid_message"' not in retry_text:
-										_LOGGER.error("*** RETRY FOUND REAL HUB CONTENT v0.0.55 ***")
+										_LOGGER.debug("Retry found real hub content")
 										text = retry_text
 										found_real_hub = True
 									else:
-										_LOGGER.error("*** RETRY STILL RETURNS AUTO-SUBMIT - PROCEEDING WITH FORM v0.0.55 ***")
+										_LOGGER.debug("Retry still returns auto-submit - proceeding with form")
 							
 							# Strategy 3: If everything failed, follow the auto-submit as last resort
 							if not found_real_hub:
-								_LOGGER.error("*** ALL STRATEGIES FAILED - FOLLOWING AUTO-SUBMIT v0.0.55 ***")
-								form_result = await _auto_submit_openid_form(self.session, text, referer=dashboard_url)
+								_LOGGER.debug("All strategies failed - following auto-submit")
+								form_result = await _auto_submit_openid_form(self.session, text, referer=dashboard_url, pacer=self._pacer)
 								if form_result.executed and form_result.final_text:
 									text = form_result.final_text
-									_LOGGER.error(f"*** USING AUTO-SUBMIT RESULT v0.0.55 *** length={len(text)}")
+									_LOGGER.debug("Using auto-submit result: length=%s", len(text))
 						else:
 							# Safe to follow the auto-submit
-							_LOGGER.error("*** AUTO-SUBMIT SAFE - PROCEEDING v0.0.55 ***")
-							form_result = await _auto_submit_openid_form(self.session, text, referer=dashboard_url)
+							_LOGGER.debug("Auto-submit safe - proceeding")
+							form_result = await _auto_submit_openid_form(self.session, text, referer=dashboard_url, pacer=self._pacer)
 							if form_result.executed and form_result.final_text:
 								text = form_result.final_text
-								_LOGGER.error(f"*** USING AUTO-SUBMIT FINAL RESPONSE v0.0.55 *** length={len(text)}")
+								_LOGGER.debug("Using auto-submit final response: length=%s", len(text))
 					else:
-						_LOGGER.error("*** NO ACTION URL FOUND IN AUTO-SUBMIT FORM v0.0.55 ***")
+						_LOGGER.debug("No action URL found in auto-submit form")
 
 				# Check if school selection fields appear on hub (shouldn't happen if credentials were submitted correctly)
 				if "IdpListRepeater" in text and ("elever" in text or "kommun" in text):
 					school_selection_attempts += 1
-					_LOGGER.error(f"*** UNEXPECTED: SCHOOL SELECTION FIELDS ON HUB v0.0.98 *** attempt {school_selection_attempts}/{max_school_selection_attempts}")
-					_LOGGER.error("*** This suggests credentials were not submitted with all form fields")
+					_LOGGER.debug("Unexpected: school selection fields on hub: attempt %s/%s", school_selection_attempts, max_school_selection_attempts)
+					_LOGGER.debug("This suggests credentials were not submitted with all form fields")
 					
 					if school_selection_attempts > max_school_selection_attempts:
-						_LOGGER.error(f"*** SCHOOL SELECTION LOOP DETECTED v0.0.98 *** stopping after {school_selection_attempts} attempts")
+						_LOGGER.debug("School selection loop detected: stopping after %s attempts", school_selection_attempts)
 						raise InfoMentorAuthError("Unexpected school selection on hub - authentication may have failed")
 					# Don't try to select a school - just continue and hope for the best
 				else:
@@ -1587,36 +2032,38 @@ class InfoMentorAuth:
 					_LOGGER.warning("Detected login error page on dashboard; attempting to restart login flow")
 					# Try to follow the login link if present
 					try:
-						import re as _re
-						login_link_match = _re.search(r'href=\"(https://hub\.infomentor\.se[^\"]*Authentication/Authentication/Login[^\"]*)\"', text, _re.IGNORECASE)
+						login_link_match = _HUB_LOGIN_LINK_RE.search(text)
 						if login_link_match:
 							login_url = login_link_match.group(1)
-							await asyncio.sleep(REQUEST_DELAY)
-							async with self.session.get(login_url, headers=headers, allow_redirects=True) as login_resp:
-								_LOGGER.debug(f"Followed login link, status={login_resp.status}")
+							async with await self._request("GET", login_url, headers=headers, allow_redirects=True) as login_resp:
+								_LOGGER.debug("Followed login link, status=%s", login_resp.status)
 					except Exception as e_login:
-						_LOGGER.debug(f"Following login link failed: {e_login}")
+						_LOGGER.debug("Following login link failed: %s", e_login)
 					# Attempt full re-authentication if we have stored creds
 					try:
 						await self.reauthenticate()
 						# Re-fetch dashboard
-						await asyncio.sleep(REQUEST_DELAY)
-						async with self.session.get(dashboard_url, headers=headers) as resp3:
+						async with await self._request("GET", dashboard_url, headers=headers) as resp3:
 							text = await resp3.text()
-							_LOGGER.debug(f"Dashboard fetch after reauthentication: status={resp3.status}")
+							_LOGGER.debug("Dashboard fetch after reauthentication: status=%s", resp3.status)
 					except Exception as e_reauth:
-						_LOGGER.debug(f"Reauthentication attempt failed: {e_reauth}")
+						_LOGGER.debug("Reauthentication attempt failed: %s", e_reauth)
 
 				# Check if we're on the legacy interface (auto-submit result)
-				if "infomentor.se/swedish/production/mentor/" in str(resp.url) or "mentor/" in text:
-					_LOGGER.error("*** DETECTED LEGACY INTERFACE - USING LEGACY EXTRACTION v0.0.70 ***")
+				on_legacy = "infomentor.se/swedish/production/mentor/" in str(resp.url) or "mentor/" in text
+				if on_legacy:
+					_LOGGER.debug("Detected legacy interface - using legacy extraction")
 					pupil_ids = await self._extract_pupil_ids_legacy(text)
 				else:
-					_LOGGER.error("*** USING HUB JSON EXTRACTION v0.0.70 ***")
+					_LOGGER.debug("Using hub JSON extraction")
 					pupil_ids = self._extract_pupil_ids_from_json(text)
 
 				if pupil_ids:
-					_LOGGER.debug(f"Found {len(pupil_ids)} pupil IDs from dashboard")
+					_LOGGER.debug("Found %s pupil IDs from dashboard", len(pupil_ids))
+					# Hand the page to the switch mapping that runs next only if it is
+					# the hub root as served; fallback pages may lack the switch URLs,
+					# in which case the mapping fetches the hub itself
+					self._hub_html = text if text is hub_root_text and not on_legacy else None
 					return pupil_ids
 				
 				# If no pupil IDs found, try alternative URLs
@@ -1629,44 +2076,41 @@ class InfoMentorAuth:
 				]
 				
 				for alt_url in alternative_urls:
-					_LOGGER.debug(f"Trying alternative URL: {alt_url}")
+					_LOGGER.debug("Trying alternative URL: %s", alt_url)
 					try:
-						await asyncio.sleep(REQUEST_DELAY)
-						async with self.session.get(alt_url, headers=headers) as alt_resp:
-							_LOGGER.debug(f"Alternative URL {alt_url} returned status: {alt_resp.status}")
+						async with await self._request("GET", alt_url, headers=headers) as alt_resp:
+							_LOGGER.debug("Alternative URL %s returned status: %s", alt_url, alt_resp.status)
 						alt_text = await alt_resp.text()
 						# Handle auto-submit forms on alternative URLs as well
-						if ('id="openid_message"' in alt_text) or ('id=\'openid_message\'' in alt_text):
-							_LOGGER.debug(f"Detected OpenID form on {alt_url}; submitting...")
-							form_result = await _auto_submit_openid_form(self.session, alt_text, referer=alt_url)
+						if _has_openid_form(alt_text):
+							_LOGGER.debug("Detected OpenID form on %s; submitting...", alt_url)
+							form_result = await _auto_submit_openid_form(self.session, alt_text, referer=alt_url, pacer=self._pacer)
 							if form_result.executed:
 								# Re-fetch the same alt URL
-								await asyncio.sleep(REQUEST_DELAY)
-								async with self.session.get(alt_url, headers=headers) as alt_resp2:
+								async with await self._request("GET", alt_url, headers=headers) as alt_resp2:
 									alt_text = await alt_resp2.text()
 							# Detect login error pages on alt URLs too
 							if ("Hoppsan" in alt_text or "Loginsida" in alt_text) and "Authentication/Authentication/Login" in alt_text:
 								_LOGGER.warning(f"Detected login error page on {alt_url}; attempting re-authentication")
 								try:
 									await self.reauthenticate()
-									await asyncio.sleep(REQUEST_DELAY)
-									async with self.session.get(alt_url, headers=headers) as alt_resp3:
+									async with await self._request("GET", alt_url, headers=headers) as alt_resp3:
 										alt_text = await alt_resp3.text()
 								except Exception as e_reauth2:
-									_LOGGER.debug(f"Reauthentication via alt URL failed: {e_reauth2}")
+									_LOGGER.debug("Reauthentication via alt URL failed: %s", e_reauth2)
 							# Check if we're on the legacy interface from alternative URL
 							if "infomentor.se/swedish/production/mentor/" in str(alt_resp.url) or "mentor/" in alt_text:
-								_LOGGER.error("*** DETECTED LEGACY INTERFACE FROM ALT URL - USING LEGACY EXTRACTION v0.0.70 ***")
+								_LOGGER.debug("Detected legacy interface from alt URL - using legacy extraction")
 								pupil_ids = await self._extract_pupil_ids_legacy(alt_text)
 							else:
-								_LOGGER.error("*** USING HUB JSON EXTRACTION FROM ALT URL v0.0.70 ***")
+								_LOGGER.debug("Using hub JSON extraction from alt URL")
 								pupil_ids = self._extract_pupil_ids_from_json(alt_text)
 
 							if pupil_ids:
-								_LOGGER.debug(f"Found {len(pupil_ids)} pupil IDs from {alt_url}")
+								_LOGGER.debug("Found %s pupil IDs from %s", len(pupil_ids), alt_url)
 								return pupil_ids
 					except Exception as e:
-						_LOGGER.debug(f"Failed to fetch {alt_url}: {e}")
+						_LOGGER.debug("Failed to fetch %s: %s", alt_url, e)
 						continue
 				
 				# Save debug artefacts and log a snippet if no pupil IDs found
@@ -1674,8 +2118,7 @@ class InfoMentorAuth:
 					_LOGGER.error(f"No pupil IDs found on dashboard. Server response (truncated): {text[:500]}...")
 				except Exception:
 					pass
-				await _write_text_file_async(DEBUG_FILE_DASHBOARD, text)
-				_LOGGER.debug(f"Saved dashboard debug HTML to {DEBUG_FILE_DASHBOARD}")
+				_dump_debug_file(DEBUG_FILE_DASHBOARD, text)
 				# If we still cannot find pupils, raise a specific error for coordinator to handle
 				raise InfoMentorAuthError("Dashboard did not contain pupil data")
 				
@@ -1697,148 +2140,116 @@ class InfoMentorAuth:
 		pupil_ids = []
 		
 		try:
-			# Try multiple JSON extraction patterns
-			json_patterns = [
-				# InfoMentor Hub specific patterns (for modern hub interface)
-				r'IMHome\.home\.homeData\s*=\s*(\{.*?\});',  # The homeData object with pupil info
-				r'"pupils"\s*:\s*(\[.*?\])',               # The pupils array specifically
-				r'IMHome\s*=\s*(\{.*?\});',               # The main IMHome JavaScript object
-				r'init\s*:\s*(\{.*?\}),',                 # The init object within IMHome
-				
-				# Standard JSON assignment patterns
-				r'var\s+pupils\s*=\s*(\[.*?\]);',
-				r'pupils\s*:\s*(\[.*?\])',
-				r'children\s*:\s*(\[.*?\])',
-				r'"children"\s*:\s*(\[.*?\])',
-				r'students\s*:\s*(\[.*?\])',
-				r'"students"\s*:\s*(\[.*?\])',
-				
-				# Angular/Vue.js data patterns
-				r'ng-init[^>]*pupils\s*=\s*(\[.*?\])',
-				r'v-data[^>]*pupils\s*=\s*(\[.*?\])',
-				r'data-pupils=["\'](\[.*?\])["\']',
-				
-				# Look specifically for pupil switcher data
-				r'"switchPupilUrl"[^}]*"hybridMappingId"[^}]*(\{[^}]*\})',
-			]
-			
-			for pattern in json_patterns:
-				matches = re.findall(pattern, html_content, re.DOTALL | re.IGNORECASE)
-				for match in matches:
-					try:
-						# Try to parse as JSON
-						if match.startswith('[') or match.startswith('{'):
-							data = json.loads(match)
-							ids = self._extract_ids_from_data(data)
-							pupil_ids.extend(ids)
-							_LOGGER.debug(f"Extracted {len(ids)} pupil IDs from JSON pattern: {pattern}")
-					except json.JSONDecodeError as e:
-						_LOGGER.debug(f"JSON decode error for pattern {pattern}: {e}")
-						continue
-			
-			# Try InfoMentor Hub specific patterns first - but prioritize pupils array
-			_LOGGER.error(f"*** TRYING HUB-SPECIFIC EXTRACTION v0.0.53 *** found {len(pupil_ids)} from JSON")
+			# Try the authoritative IMHome.home.homeData pupils array first; when it
+			# is present the generic patterns below cannot change the result, so the
+			# page does not need to be scanned with each of them
+			_LOGGER.debug("Trying hub-specific extraction")
 			
 			# Look for the comprehensive pupils array in IMHome.home.homeData - PRIORITY extraction
-			homedata_pattern = r'IMHome\.home\.homeData\s*=\s*(\{.*?"pupils"\s*:\s*\[.*?\].*?\});'
-			homedata_matches = re.findall(homedata_pattern, html_content, re.DOTALL | re.IGNORECASE)
-			
 			hub_specific_pupil_ids = []  # Use separate list for hub-specific extraction
 			hub_specific_pupil_names = {}  # Store names too
 			
-			for homedata_json in homedata_matches:
-				_LOGGER.error(f"*** FOUND HOMEDATA JSON v0.0.54 *** length={len(homedata_json)}")
+			for homedata_match in _HOMEDATA_RE.finditer(html_content):
+				homedata = _decode_json_at(html_content, homedata_match.end())
+				if not isinstance(homedata, dict):
+					_LOGGER.debug("HomeData parsing error: homeData is not a JSON object")
+					continue
+				_LOGGER.debug("Found homeData JSON")
 				try:
-					homedata = json.loads(homedata_json)
 					if 'account' in homedata and 'pupils' in homedata['account']:
 						pupils_data = homedata['account']['pupils']
-						_LOGGER.error(f"*** FOUND PUPILS ARRAY v0.0.54 *** count={len(pupils_data)}")
+						_LOGGER.debug("Found pupils array: count=%s", len(pupils_data))
 						
 						for pupil in pupils_data:
 							pupil_id = str(pupil.get('id', ''))
 							pupil_name = pupil.get('name', '')
-							_LOGGER.error(f"*** PROCESSING PUPIL v0.0.54 *** id={pupil_id} name={pupil_name}")
+							_LOGGER.debug("Processing pupil: id=%s name=%s", pupil_id, pupil_name)
 							if pupil_id and pupil_id not in hub_specific_pupil_ids:
 								hub_specific_pupil_ids.append(pupil_id)
 								hub_specific_pupil_names[pupil_id] = pupil_name
-								_LOGGER.error(f"*** EXTRACTED PUPIL v0.0.54 *** id={pupil_id} name={pupil_name}")
+								_LOGGER.debug("Extracted pupil: id=%s name=%s", pupil_id, pupil_name)
 								
 						# If we found pupils via hub-specific method, prioritize them
 						if hub_specific_pupil_ids:
-							_LOGGER.error(f"*** USING HUB-SPECIFIC PUPILS v0.0.54 *** count={len(hub_specific_pupil_ids)}")
-							pupil_ids = hub_specific_pupil_ids  # Replace any previously found IDs
+							_LOGGER.debug("Using hub-specific pupils: count=%s", len(hub_specific_pupil_ids))
+							pupil_ids = hub_specific_pupil_ids
 							
 							# Store the pupil names for later use
 							self.pupil_names = hub_specific_pupil_names
-							_LOGGER.error(f"*** STORED PUPIL NAMES v0.0.54 *** {self.pupil_names}")
+							_LOGGER.debug("Stored pupil names: %s", self.pupil_names)
 							
 							# Skip filtering for hub-specific pupils since they're from authoritative source
-							_LOGGER.error(f"*** RETURNING HUB-SPECIFIC PUPILS WITHOUT FILTERING v0.0.54 *** {pupil_ids}")
-							return list(set(pupil_ids))  # Remove duplicates and return immediately
+							_LOGGER.debug("Returning hub-specific pupils without filtering: %s", pupil_ids)
+							return pupil_ids  # Already free of duplicates; return immediately
 							
-				except (json.JSONDecodeError, KeyError) as e:
-					_LOGGER.error(f"*** HOMEDATA PARSING ERROR v0.0.53 *** {e}")
+				except (TypeError, KeyError) as e:
+					_LOGGER.debug("HomeData parsing error: %s", e)
+			
+			# Otherwise try multiple JSON extraction patterns. Several patterns can
+			# stop in front of the same value, which only needs decoding once.
+			html_lower = html_content.lower()
+			decoded_offsets = set()
+			for keyword, pattern in _JSON_PUPIL_PATTERNS:
+				if keyword not in html_lower:
+					continue
+				for match in pattern.finditer(html_content):
+					if match.end() in decoded_offsets:
+						continue
+					decoded_offsets.add(match.end())
+					data = _decode_json_at(html_content, match.end())
+					if data is None:
+						_LOGGER.debug("No valid JSON after pattern %s at offset %s", pattern.pattern, match.end())
+						continue
+					ids = self._extract_ids_from_data(data)
+					pupil_ids.extend(ids)
+					_LOGGER.debug("Extracted %s pupil IDs from JSON pattern: %s", len(ids), pattern.pattern)
 			
 			# Fallback: Look for selectedPupilName pattern (single selected pupil)
 			if not pupil_ids:
-				selected_pupil_pattern = r'selectedPupilName\s*:\s*["\']([^"\']+)["\']'
-				selected_matches = re.findall(selected_pupil_pattern, html_content, re.IGNORECASE)
+				selected_matches = _SELECTED_PUPIL_NAME_RE.findall(html_content)
 				for pupil_name in selected_matches:
-					_LOGGER.error(f"*** FOUND SELECTED PUPIL NAME v0.0.53 *** {pupil_name}")
+					_LOGGER.debug("Found selected pupil name: %s", pupil_name)
 					
 				# Look for pupil data in the IMHome.init object specifically
-				imhome_pattern = r'IMHome\s*=\s*\{[^}]*init\s*:\s*\{([^}]*selectedPupilName[^}]*)\}'
-				imhome_matches = re.findall(imhome_pattern, html_content, re.DOTALL | re.IGNORECASE)
+				imhome_matches = _IMHOME_INIT_RE.findall(html_content)
 				for init_content in imhome_matches:
-					_LOGGER.error(f"*** FOUND IMHOME INIT CONTENT v0.0.53 *** {init_content[:200]}...")
+					_LOGGER.debug("Found IMHome init content: %s...", init_content[:200])
 					# Look for any numeric IDs in this context
-					id_pattern = r'(\d{6,12})'  # Extended range for longer IDs
-					potential_ids = re.findall(id_pattern, init_content)
+					potential_ids = _INIT_PUPIL_ID_RE.findall(init_content)
 					for potential_id in potential_ids:
 						if potential_id not in pupil_ids and len(potential_id) >= 6:
 							pupil_ids.append(potential_id)
-							_LOGGER.error(f"*** EXTRACTED PUPIL ID FROM IMHOME v0.0.53 *** {potential_id}")
+							_LOGGER.debug("Extracted pupil ID from IMHome: %s", potential_id)
 			
 			# If JSON extraction didn't find enough, try more specific regex patterns
 			if len(pupil_ids) < 1:  # At least expect one pupil
 				_LOGGER.debug("JSON extraction found few results, trying specific regex patterns")
 				
-				# Look for pupil switcher URLs specifically - these are more reliable
-				switcher_pattern = r'"switchPupilUrl"\s*:\s*"[^"]*SwitchPupil/(\d{4,8})"[^}]*"name"\s*:\s*"([^"]+)"'
-				switcher_matches = re.findall(switcher_pattern, html_content, re.IGNORECASE | re.DOTALL)
-				
-				for pupil_id, name in switcher_matches:
-					# Filter out entries that look like parent/user accounts
-					if self._is_likely_pupil_name(name) and pupil_id not in pupil_ids:
+				# Switcher and hybridMappingId entries share one filter and dedupe step;
+				# entries that look like parent/user accounts are skipped
+				seen = set(pupil_ids)
+				for pupil_id, name, source in self._iter_named_pupil_candidates(html_content, pupil_ids):
+					if pupil_id not in seen and self._is_likely_pupil_name(name):
+						seen.add(pupil_id)
 						pupil_ids.append(pupil_id)
-						_LOGGER.debug(f"Found pupil {pupil_id} with name '{name}' from switcher pattern")
-				
-				# If still not enough, try hybridMappingId pattern (more specific)
-				if len(pupil_ids) < 2:
-					hybrid_pattern = r'"hybridMappingId"\s*:\s*"[^|]*\|(\d{4,8})\|[^"]*"[^}]*"name"\s*:\s*"([^"]+)"'
-					hybrid_matches = re.findall(hybrid_pattern, html_content, re.IGNORECASE | re.DOTALL)
-					
-					for pupil_id, name in hybrid_matches:
-						if self._is_likely_pupil_name(name) and pupil_id not in pupil_ids:
-							pupil_ids.append(pupil_id)
-							_LOGGER.debug(f"Found pupil {pupil_id} with name '{name}' from hybrid pattern")
+						_LOGGER.debug("Found pupil %s with name '%s' from %s pattern", pupil_id, name, source)
 			
 			# Remove duplicates and validate final list
-			unique_pupil_ids = list(set(pupil_ids))
-			_LOGGER.error(f"*** UNIQUE PUPIL IDS v0.0.53 *** {unique_pupil_ids}")
+			unique_pupil_ids = list(dict.fromkeys(pupil_ids))
+			_LOGGER.debug("Unique pupil IDs: %s", unique_pupil_ids)
 			
 			# Filter out any IDs that seem to be parent/user accounts
 			filtered_pupil_ids = []
 			for pupil_id in unique_pupil_ids:
 				is_likely_pupil = self._is_likely_pupil_id(pupil_id, html_content)
-				_LOGGER.error(f"*** FILTERING PUPIL ID v0.0.53 *** {pupil_id} -> likely_pupil={is_likely_pupil}")
+				_LOGGER.debug("Filtering pupil ID: %s -> likely_pupil=%s", pupil_id, is_likely_pupil)
 				if is_likely_pupil:
 					filtered_pupil_ids.append(pupil_id)
-					_LOGGER.error(f"*** KEPT PUPIL ID v0.0.53 *** {pupil_id}")
+					_LOGGER.debug("Kept pupil ID: %s", pupil_id)
 				else:
-					_LOGGER.error(f"*** FILTERED OUT PUPIL ID v0.0.53 *** {pupil_id}")
+					_LOGGER.debug("Filtered out pupil ID: %s", pupil_id)
 			
-			_LOGGER.error(f"*** FINAL FILTERED PUPIL IDS v0.0.53 *** {len(filtered_pupil_ids)} pupils: {filtered_pupil_ids}")
+			_LOGGER.debug("Final filtered pupil IDs: %s pupils: %s", len(filtered_pupil_ids), filtered_pupil_ids)
 			
 			return filtered_pupil_ids
 			
@@ -1846,6 +2257,22 @@ class InfoMentorAuth:
 			_LOGGER.error(f"Error extracting pupil IDs: {e}")
 			return []
 	
+	@staticmethod
+	def _iter_named_pupil_candidates(html_content: str, pupil_ids: list[str]) -> Iterator[Tuple[str, str, str]]:
+		"""Yield ``(pupil_id, name, source)`` from the pupil switcher entries.
+		
+		The switcher URLs are the more reliable source. The hybridMappingId
+		entries are only scanned when fewer than two pupils have been collected
+		into ``pupil_ids`` by the time the switcher entries are exhausted.
+		"""
+		for pupil_id, name in _SWITCH_PUPIL_RE.findall(html_content):
+			# Shorter or longer numbers in a switch URL are not pupil IDs
+			if 4 <= len(pupil_id) <= 8:
+				yield pupil_id, name, "switcher"
+		if len(pupil_ids) < 2:
+			for pupil_id, name in _HYBRID_PUPIL_RE.findall(html_content):
+				yield pupil_id, name, "hybrid"
+	
 	def _is_likely_pupil_name(self, name: str) -> bool:
 		"""Check if a name is likely to belong to a pupil (not a parent/user)."""
 		if not name or len(name.strip()) < 2:
@@ -1854,16 +2281,8 @@ class InfoMentorAuth:
 		name_lower = name.lower().strip()
 		
 		# Filter out obvious non-pupil entries
-		parent_indicators = [
-			'parent', 'förälder', 'guardian', 'vårdnadshavare',
-			'user', 'användare', 'account', 'konto',
-			'admin', 'administrator', 'staff', 'personal',
-			'@', 'email', 'mail'  # Email addresses
-		]
-		
-		for indicator in parent_indicators:
-			if indicator in name_lower:
-				return False
+		if any(marker in name_lower for marker in _NON_PUPIL_NAME_MARKERS):
+			return False
 		
 		# Names that are just numbers are suspicious
 		if name.strip().isdigit():
@@ -1880,34 +2299,22 @@ class InfoMentorAuth:
 		# Look for context around this ID in the HTML
 		# If it's associated with pupil-specific functions, it's likely a pupil
 		
-		pupil_contexts = [
-			f'SwitchPupil/{pupil_id}',
-			f'"pupilId".*{pupil_id}',
-			f'"elevId".*{pupil_id}',
-			f'"studentId".*{pupil_id}',
-		]
-		
-		parent_contexts = [
-			f'"userId".*{pupil_id}',
-			f'"parentId".*{pupil_id}',
-			f'"guardianId".*{pupil_id}',
-			f'parent.*{pupil_id}',
-			f'guardian.*{pupil_id}',
-		]
+		# Every context pattern ends with the ID itself, so none can match when
+		# the ID is absent and the default below applies
+		if pupil_id not in html_content:
+			return True
 		
 		# Check if this ID appears in pupil contexts
-		pupil_context_found = False
-		for pattern in pupil_contexts:
-			if re.search(pattern, html_content, re.IGNORECASE):
-				pupil_context_found = True
-				break
+		pupil_context_found = any(
+			re.search(context + re.escape(pupil_id), html_content, re.IGNORECASE)
+			for context in _PUPIL_ID_CONTEXTS
+		)
 		
 		# Check if this ID appears in parent contexts
-		parent_context_found = False
-		for pattern in parent_contexts:
-			if re.search(pattern, html_content, re.IGNORECASE):
-				parent_context_found = True
-				break
+		parent_context_found = any(
+			re.search(context + re.escape(pupil_id), html_content, re.IGNORECASE)
+			for context in _PARENT_ID_CONTEXTS
+		)
 		
 		# If found in parent context but not pupil context, likely not a pupil
 		if parent_context_found and not pupil_context_found:
@@ -1945,75 +2352,60 @@ class InfoMentorAuth:
 	
 	async def _extract_pupil_ids_legacy(self, html_content: str) -> list[str]:
 		"""Extract pupil IDs from legacy InfoMentor interface."""
-		_LOGGER.error("*** EXTRACTING PUPIL IDS FROM LEGACY INTERFACE v0.0.70 ***")
+		_LOGGER.debug("Extracting pupil IDs from legacy interface")
 
 		try:
 			# We already have the HTML content from the auto-submit result
 			text = html_content
 
 			# Save for debugging
-			await _write_text_file_async("/tmp/infomentor_legacy_dashboard.html", text)
-			_LOGGER.error("*** SAVED LEGACY DASHBOARD FOR DEBUG v0.0.70 ***")
-
-			# Look for legacy pupil patterns - more comprehensive patterns
-			patterns = [
-				# Common pupil ID patterns in legacy interface
-				r'pupil[^0-9]*(\d+)',
-				r'elevid[^0-9]*(\d+)',
-				r'id["\']?\s*:\s*["\']?(\d+)["\']?',
-				r'value=["\']?(\d{8,12})["\']?',  # 8-12 digit IDs
-				r'data-pupil-id=["\']?(\d+)["\']?',
-				r'pupil-id["\']?\s*:\s*["\']?(\d+)["\']?',
-				# Look for JavaScript arrays/objects with pupil data
-				r'var\s+pupils\s*=\s*(\[.*?\]);',
-				r'pupils\s*:\s*(\[.*?\])',
-				r'children\s*:\s*(\[.*?\])',
-				r'"children"\s*:\s*(\[.*?\])',
-				r'students\s*:\s*(\[.*?\])',
-				r'"students"\s*:\s*(\[.*?\])',
-			]
+			_dump_debug_file("/tmp/infomentor_legacy_dashboard.html", text)
 
+			# Look for legacy pupil patterns, most specific first
 			pupil_ids = []
-			for pattern in patterns:
-				matches = re.findall(pattern, text, re.IGNORECASE | re.DOTALL)
-				_LOGGER.debug(f"Pattern '{pattern}' found matches: {matches}")
-
-				if isinstance(matches, list) and matches:
-					if isinstance(matches[0], str) and matches[0].startswith('['):
-						# This is a JSON array, try to extract IDs from it
-						try:
-							# Look for numeric IDs within the JSON
-							json_matches = re.findall(r'["\']?(\d{8,12})["\']?', matches[0])
-							for match in json_matches:
-								if 8 <= len(match) <= 12:  # Reasonable pupil ID length
+			for patterns in (_LEGACY_DASHBOARD_SPECIFIC_PATTERNS, _LEGACY_DASHBOARD_FUZZY_PATTERNS):
+				for pattern in patterns:
+					matches = pattern.findall(text)
+					_LOGGER.debug("Pattern '%s' found matches: %s", pattern.pattern, matches)
+
+					if isinstance(matches, list) and matches:
+						if isinstance(matches[0], str) and matches[0].startswith('['):
+							# This is a JSON array, try to extract IDs from it
+							try:
+								# Look for numeric IDs within the JSON
+								json_matches = _PUPIL_ID_DIGITS_RE.findall(matches[0])
+								for match in json_matches:
+									if 8 <= len(match) <= 12:  # Reasonable pupil ID length
+										pupil_ids.append(match)
+							except:
+								pass
+						else:
+							# Regular matches
+							for match in matches:
+								if isinstance(match, str) and 8 <= len(match) <= 12:
 									pupil_ids.append(match)
-						except:
-							pass
-					else:
-						# Regular matches
-						for match in matches:
-							if isinstance(match, str) and 8 <= len(match) <= 12:
-								pupil_ids.append(match)
-							elif isinstance(match, tuple):
-								for submatch in match:
-									if isinstance(submatch, str) and 8 <= len(submatch) <= 12:
-										pupil_ids.append(submatch)
+								elif isinstance(match, tuple):
+									for submatch in match:
+										if isinstance(submatch, str) and 8 <= len(submatch) <= 12:
+											pupil_ids.append(submatch)
+				if pupil_ids:
+					# The catch-all patterns would only add noise
+					break
 
-			# Remove duplicates and filter for reasonable lengths
-			pupil_ids = list(set(pupil_ids))
-			pupil_ids = [pid for pid in pupil_ids if 8 <= len(pid) <= 12]
+			# Remove duplicates, keeping page order; only 8-12 digit IDs were collected
+			pupil_ids = list(dict.fromkeys(pupil_ids))
 
-			_LOGGER.error(f"*** FOUND LEGACY PUPIL IDS v0.0.70 *** {pupil_ids}")
+			_LOGGER.debug("Found legacy pupil IDs: %s", pupil_ids)
 
 			if pupil_ids:
-				_LOGGER.debug(f"Found {len(pupil_ids)} legacy pupil IDs: {pupil_ids}")
+				_LOGGER.debug("Found %s legacy pupil IDs: %s", len(pupil_ids), pupil_ids)
 				return pupil_ids
 
 		except Exception as e:
 			_LOGGER.error(f"Legacy pupil ID extraction failed: {e}")
 
 		# If no pupil IDs found, try the old method as fallback
-		_LOGGER.error("*** TRYING OLD LEGACY METHOD AS FALLBACK v0.0.70 ***")
+		_LOGGER.debug("Trying old legacy method as fallback")
 		return await self._get_pupil_ids_legacy()
 
 	async def _get_pupil_ids_legacy(self) -> list[str]:
@@ -2021,78 +2413,72 @@ class InfoMentorAuth:
 		try:
 			# Try the legacy default page
 			legacy_url = "https://infomentor.se/swedish/production/mentor/default.aspx"
-			await asyncio.sleep(REQUEST_DELAY)
-			async with self.session.get(legacy_url, headers=DEFAULT_HEADERS) as resp:
+			async with await self._request("GET", legacy_url, headers=DEFAULT_HEADERS) as resp:
 				if resp.status == 200:
 					text = await resp.text()
 
-					# Look for legacy pupil patterns
-					patterns = [
-						r'pupil[^0-9]*(\d+)',
-						r'elevid[^0-9]*(\d+)',
-						r'id["\']?\s*:\s*["\']?(\d+)["\']?',
-					]
-
+					# Look for legacy pupil patterns, skipping duplicates as they are found
 					pupil_ids = []
-					for pattern in patterns:
-						matches = re.findall(pattern, text, re.IGNORECASE)
-						valid_matches = [m for m in matches if 4 <= len(m) <= 12]
-						pupil_ids.extend(valid_matches)
-
-					pupil_ids = list(set(pupil_ids))
+					seen = set()
+					for pattern in _LEGACY_PUPIL_PATTERNS:
+						for match in pattern.findall(text):
+							if match not in seen and 4 <= len(match) <= 12:
+								seen.add(match)
+								pupil_ids.append(match)
 
 					if pupil_ids:
-						_LOGGER.debug(f"Found legacy fallback pupil IDs: {pupil_ids}")
+						_LOGGER.debug("Found legacy fallback pupil IDs: %s", pupil_ids)
 						return pupil_ids
 
 		except Exception as e:
-			_LOGGER.debug(f"Legacy fallback pupil ID extraction failed: {e}")
+			_LOGGER.debug("Legacy fallback pupil ID extraction failed: %s", e)
 
 		return []
 	
 	async def _build_switch_id_mapping(self) -> None:
 		"""Build mapping between pupil IDs and their switch IDs."""
 		_LOGGER.debug("Building pupil ID to switch ID mapping")
+		self._switch_urls.clear()
 		
 		try:
-			# Get the hub page HTML to extract switch URLs
-			headers = DEFAULT_HEADERS.copy()
-			hub_url = f"{HUB_BASE_URL}/#/"
+			# Reuse the hub page the pupil IDs were read from; it is the same
+			# document (the fragment is never sent), so only fetch it if needed
+			page, self._hub_html = self._hub_html, None
+			if page is None:
+				async with await self._request("GET", f"{HUB_BASE_URL}/#/", headers=DEFAULT_HEADERS) as resp:
+					if resp.status != 200:
+						return
+					page = await resp.text()
 			
-			async with self.session.get(hub_url, headers=headers) as resp:
-				if resp.status == 200:
-					html = await resp.text()
-					
-					# Extract switch URLs and pupil names
-					switch_pattern = r'"switchPupilUrl"\s*:\s*"[^"]*SwitchPupil/(\d+)"[^}]*"name"\s*:\s*"([^"]+)"'
-					matches = re.findall(switch_pattern, html, re.IGNORECASE)
+			# Extract switch URLs and pupil names
+			matches = list(_SWITCH_PUPIL_RE.finditer(page))
+			
+			_LOGGER.debug("Found %s switch URL patterns", len(matches))
+			
+			for match in matches:
+				switch_id, name = match.groups()
+				# The switch URL sits inside a flat JSON object; take the
+				# braces around the match rather than re-scanning the page
+				object_start = page.rfind('{', 0, match.start())
+				if object_start >= 0 and page.find('}', object_start, match.start()) < 0:
+					object_end = page.find('}', match.end())
+					json_object = page[object_start:object_end + 1 if object_end >= 0 else len(page)]
 					
-					_LOGGER.debug(f"Found {len(matches)} switch URL patterns")
+					# Extract hybridMappingId from this object
+					hybrid_match = _HYBRID_MAPPING_ID_RE.search(json_object)
 					
-					for switch_id, name in matches:
-						# Look for the JSON object containing this switch URL
-						json_pattern = rf'{{"[^}}]*"switchPupilUrl"[^}}]*SwitchPupil/{re.escape(switch_id)}[^}}]*}}'
-						json_match = re.search(json_pattern, html, re.IGNORECASE | re.DOTALL)
+					if hybrid_match:
+						pupil_id = hybrid_match.group(1)
 						
-						if json_match:
-							json_object = json_match.group(0)
-							
-							# Extract hybridMappingId from this object
-							hybrid_pattern = r'"hybridMappingId"\s*:\s*"[^|]*\|(\d+)\|'
-							hybrid_match = re.search(hybrid_pattern, json_object)
-							
-							if hybrid_match:
-								pupil_id = hybrid_match.group(1)
-								
-								# Only map if this pupil ID was found in our pupil list
-								if pupil_id in self.pupil_ids:
-									self.pupil_switch_ids[pupil_id] = switch_id
-									_LOGGER.debug(f"Mapped pupil {pupil_id} ({name}) to switch ID {switch_id}")
-								else:
-									_LOGGER.debug(f"Found pupil {pupil_id} ({name}) but not in our pupil list")
-					
-					_LOGGER.info(f"Built switch ID mapping for {len(self.pupil_switch_ids)} pupils")
-					
+						# Only map if this pupil ID was found in our pupil list
+						if pupil_id in self.pupil_ids:
+							self.pupil_switch_ids[pupil_id] = switch_id
+							_LOGGER.debug("Mapped pupil %s (%s) to switch ID %s", pupil_id, name, switch_id)
+						else:
+							_LOGGER.debug("Found pupil %s (%s) but not in our pupil list", pupil_id, name)
+			
+			_LOGGER.info(f"Built switch ID mapping for {len(self.pupil_switch_ids)} pupils")
+			
 		except Exception as e:
 			_LOGGER.warning(f"Failed to build switch ID mapping: {e}")
 			# Don't fail authentication if switch mapping fails
@@ -2109,77 +2495,159 @@ class InfoMentorAuth:
 		if pupil_id not in self.pupil_ids:
 			raise InfoMentorAuthError(f"Invalid pupil ID: {pupil_id}")
 		
-		# Use the correct switch ID, not the pupil ID
-		switch_id = self.pupil_switch_ids.get(pupil_id, pupil_id)  # fallback to pupil_id if no mapping
-		_LOGGER.debug(f"Switching to pupil {pupil_id} using switch ID {switch_id}")
+		if self._is_current_pupil(pupil_id):
+			_LOGGER.debug("Pupil %s was selected moments ago; skipping switch", pupil_id)
+			return True
 		
-		# Create timeout configuration to prevent hanging requests
-		timeout = aiohttp.ClientTimeout(total=30.0, connect=10.0)
+		# Concurrent callers for the same pupil share one switch. The task is
+		# shielded so a cancelled caller does not abort it for the others.
+		task = self._inflight_switch.get(pupil_id)
+		if task is None:
+			task = asyncio.create_task(self._perform_switch(pupil_id))
+			self._inflight_switch[pupil_id] = task
+			task.add_done_callback(lambda _: self._inflight_switch.pop(pupil_id, None))
+		else:
+			_LOGGER.debug("Joining switch to pupil %s already in progress", pupil_id)
+		return await asyncio.shield(task)
+	
+	def _is_current_pupil(self, pupil_id: str) -> bool:
+		"""Return True if pupil_id was confirmed as selected within the switch TTL."""
+		return (
+			pupil_id == self._current_pupil_id
+			and self._current_pupil_at is not None
+			and time.monotonic() - self._current_pupil_at < PUPIL_SWITCH_TTL_SECONDS
+		)
+	
+	async def _perform_switch(self, pupil_id: str) -> bool:
+		"""Switch to pupil_id once no switch to another pupil is in progress."""
+		# Switches to different pupils would race for the session's single selected
+		# pupil on the server, so they run one at a time
+		async with self._switch_lock:
+			if self._is_current_pupil(pupil_id):
+				_LOGGER.debug("Pupil %s was selected while waiting; skipping switch", pupil_id)
+				return True
+			return await self._switch_unlocked(pupil_id)
+	
+	async def _switch_unlocked(self, pupil_id: str) -> bool:
+		"""Run the switch requests for pupil_id and wait for the switch to settle."""
+		# Whatever pupil was selected before is no longer guaranteed once requests go out
+		self._current_pupil_id = None
 		
-		# Try hub switch first (this is the main endpoint)
-		hub_switch_url = f"{HUB_BASE_URL}/Account/PupilSwitcher/SwitchPupil/{switch_id}"
+		# Use the correct switch ID, not the pupil ID
+		switch_id = self.pupil_switch_ids.get(pupil_id, pupil_id)  # fallback to pupil_id if no mapping
+		_LOGGER.debug("Switching to pupil %s using switch ID %s", pupil_id, switch_id)
+		
+		# Hub is the main endpoint; modern is a hedge that starts shortly after
+		# so a slow or failing hub does not serialise the fallback behind it.
+		switch_urls = self._switch_urls.get(pupil_id)
+		if switch_urls is None:
+			switch_urls = self._switch_urls[pupil_id] = (
+				f"{HUB_BASE_URL}/Account/PupilSwitcher/SwitchPupil/{switch_id}",
+				f"{MODERN_BASE_URL}/Account/PupilSwitcher/SwitchPupil/{switch_id}",
+			)
+		hub_switch_url, modern_switch_url = switch_urls
 		
-		headers = DEFAULT_HEADERS.copy()
-		headers["Referer"] = f"{HUB_BASE_URL}/#/"
+		async def hedge() -> bool:
+			await asyncio.sleep(SWITCH_HEDGE_DELAY)
+			return await self._try_switch("Modern", modern_switch_url, _MODERN_SWITCH_HEADERS, pupil_id, switch_id)
 		
+		pending = {
+			asyncio.create_task(self._try_switch("Hub", hub_switch_url, _HUB_SWITCH_HEADERS, pupil_id, switch_id)),
+			asyncio.create_task(hedge()),
+		}
+		try:
+			while pending:
+				done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+				if any(task.result() for task in done):
+					break
+			else:
+				_LOGGER.error("All switch attempts failed for pupil %s (switch ID %s)", pupil_id, switch_id)
+				return False
+		finally:
+			for task in pending:
+				task.cancel()
+		
+		# Wait until the switch has taken effect on the server side. This runs once,
+		# for the winning request; the switch attempts only check their status.
+		await self._wait_for_pupil_switch(pupil_id)
+		self._current_pupil_id = pupil_id
+		self._current_pupil_at = time.monotonic()
+		return True
+	
+	async def _try_switch(
+		self,
+		label: str,
+		url: str,
+		headers: Mapping[str, str],
+		pupil_id: str,
+		switch_id: str,
+	) -> bool:
+		"""Issue a single pupil switch request and report whether it was accepted."""
 		try:
-			# Allow redirects and check for successful switch (200 or 302)
-			async with self.session.get(hub_switch_url, headers=headers, allow_redirects=True, timeout=timeout) as resp:
+			# Don't follow the redirect: the 302 itself is the success signal, and any
+			# session cookies it sets are still stored by the cookie jar
+			resp = await self._request("GET", url, headers=headers, allow_redirects=False, timeout=_SWITCH_TIMEOUT)
+			try:
 				# 302 Found is the expected response for successful pupil switch
-				# 200 OK is also acceptable if the redirect was followed
-				success = resp.status in [200, 302]
-				if success:
-					_LOGGER.debug(f"Successfully switched to pupil {pupil_id} via hub endpoint (status: {resp.status})")
-					# Add a longer delay to ensure the switch takes effect on server side
-					await asyncio.sleep(2.0)
+				# 200 OK is also accepted in case an endpoint answers without redirecting
+				if resp.status in [200, 302]:
+					_LOGGER.debug("Successfully switched to pupil %s via %s endpoint (status: %s)", pupil_id, label.lower(), resp.status)
 					return True
-				else:
-					if resp.status == 400:
+				if resp.status == 400:
+					if _LOGGER.isEnabledFor(logging.WARNING):
 						response_text = await resp.text()
-						_LOGGER.warning(f"Hub switch HTTP 400 for pupil {pupil_id} (switch ID {switch_id}): {response_text[:100]}...")
+						_LOGGER.warning("%s switch HTTP 400 for pupil %s (switch ID %s): %s...", label, pupil_id, switch_id, response_text[:100])
 						_LOGGER.warning("HTTP 400 may indicate session expiry or invalid switch ID")
-					else:
-						_LOGGER.warning(f"Hub switch failed for pupil {pupil_id} (switch ID {switch_id}): {resp.status}")
+				else:
+					_LOGGER.warning("%s switch failed for pupil %s (switch ID %s): %s", label, pupil_id, switch_id, resp.status)
+			finally:
+				# Only the status matters; hand the connection back without draining the body
+				resp.release()
 		except asyncio.TimeoutError:
-			_LOGGER.warning(f"Hub switch timed out for pupil {pupil_id} (switch ID {switch_id}) after 30 seconds")
-		except asyncio.CancelledError:
-			_LOGGER.warning(f"Hub switch was cancelled for pupil {pupil_id} (switch ID {switch_id})")
-			# Don't re-raise cancellation immediately, try the fallback first
-		except Exception as e:
-			_LOGGER.warning(f"Hub switch failed for pupil {pupil_id} (switch ID {switch_id}) with exception: {e}")
-		
-		# Fallback to modern switch
-		modern_switch_url = f"{MODERN_BASE_URL}/Account/PupilSwitcher/SwitchPupil/{switch_id}"
+			_LOGGER.warning("%s switch timed out for pupil %s (switch ID %s) after 30 seconds", label, pupil_id, switch_id)
+		except aiohttp.ClientError as e:
+			_LOGGER.warning("%s switch failed for pupil %s (switch ID %s) with exception: %s", label, pupil_id, switch_id, e)
+		return False
+	
+	async def _confirm_pupil_switch(self, pupil_id: str) -> bool:
+		"""Check whether the hub dashboard reports pupil_id as the selected pupil.
 		
-		headers["Referer"] = f"{MODERN_BASE_URL}/"
+		Returns True when the switch is visible, or when it cannot be checked
+		(unknown pupil name or no selection marker on the page).
+		"""
+		expected_name = self.pupil_names.get(pupil_id)
+		if not expected_name:
+			return True
 		
 		try:
-			async with self.session.get(modern_switch_url, headers=headers, allow_redirects=True, timeout=timeout) as resp:
-				success = resp.status in [200, 302]
-				if success:
-					_LOGGER.debug(f"Successfully switched to pupil {pupil_id} via modern endpoint (status: {resp.status})")
-					# Add a longer delay to ensure the switch takes effect
-					await asyncio.sleep(2.0)
-					return True
-				else:
-					_LOGGER.warning(f"Modern switch failed for pupil {pupil_id} (switch ID {switch_id}): {resp.status}")
-		except asyncio.TimeoutError:
-			_LOGGER.warning(f"Modern switch timed out for pupil {pupil_id} (switch ID {switch_id}) after 30 seconds")
-		except asyncio.CancelledError:
-			_LOGGER.warning(f"Modern switch was cancelled for pupil {pupil_id} (switch ID {switch_id})")
-			# Re-raise cancellation after trying both endpoints
-			raise
-		except Exception as e:
-			_LOGGER.warning(f"Modern switch failed for pupil {pupil_id} (switch ID {switch_id}) with exception: {e}")
+			async with await self._request("GET", f"{HUB_BASE_URL}/", headers=_HUB_SWITCH_HEADERS) as resp:
+				if resp.status != 200:
+					return False
+				# The selected pupil sits in the page's bootstrap data, so stop
+				# reading the dashboard once it has been seen
+				match = await _response_search(resp, _SELECTED_PUPIL_NAME_RE)
+		except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+			_LOGGER.debug("Could not confirm switch to pupil %s: %s", pupil_id, e)
+			return False
 		
-		_LOGGER.error(f"All switch attempts failed for pupil {pupil_id} (switch ID {switch_id})")
-		return False
+		if not match:
+			return True
+		return html.unescape(match.group(1)).strip() == expected_name.strip()
+	
+	async def _wait_for_pupil_switch(self, pupil_id: str) -> None:
+		"""Poll with a short back-off until the server reflects the pupil switch."""
+		for delay in SWITCH_CONFIRM_DELAYS:
+			if await self._confirm_pupil_switch(pupil_id):
+				return
+			await asyncio.sleep(delay)
+		_LOGGER.debug("Switch to pupil %s not confirmed by hub; continuing anyway", pupil_id)
 	
 	async def diagnose_auth_state(self) -> dict:
 		"""Diagnose current authentication state for troubleshooting.
 		
 		Returns:
-			Dictionary with diagnostic information
+			Dictionary with diagnostic information. ``session_cookies`` is -1
+			when INFO logging is disabled.
 		"""
 		_LOGGER.debug("Running authentication diagnostics")
 		
@@ -2188,61 +2656,75 @@ class InfoMentorAuth:
 			"pupil_ids_found": len(self.pupil_ids),
 			"pupil_ids": self.pupil_ids,
 			"endpoints_accessible": {},
-			"session_cookies": len(self.session.cookie_jar),
+			# Only counted when the summary below will be logged; -1 otherwise
+			"session_cookies": len(self.session.cookie_jar) if _LOGGER.isEnabledFor(logging.INFO) else -1,
 			"errors": []
 		}
 		
-		# Test access to various endpoints
-		test_endpoints = {
-			"hub_root": f"{HUB_BASE_URL}/",
-			"hub_hash": f"{HUB_BASE_URL}/#/",
-			"modern_root": f"{MODERN_BASE_URL}/",
-			"legacy_default": "https://infomentor.se/Swedish/Production/mentor/default.aspx"
-		}
-		
-		for name, url in test_endpoints.items():
+		async def probe(name: str, url: str, method: str) -> Tuple[str, Dict[str, Any], Optional[str]]:
+			"""Probe one endpoint; errors are reported in the result rather than raised."""
 			try:
-				headers = DEFAULT_HEADERS.copy()
-				async with self.session.get(url, headers=headers, timeout=10) as resp:
-					diagnostics["endpoints_accessible"][name] = {
+				async with await self._request(method, url, headers=_DIAGNOSTIC_HEADERS, allow_redirects=True, timeout=_DIAG_TIMEOUT) as resp:
+					result = {
 						"status": resp.status,
 						"url": str(resp.url),
 						"accessible": resp.status == 200,
 						"has_auth_content": False
 					}
 					
-					if resp.status == 200:
-						text = await resp.text()
-						auth_indicators = [
-							"logout" in text.lower(),
-							"pupil" in text.lower(),
-							"elev" in text.lower(),
-							"dashboard" in text.lower(),
-							"switchpupil" in text.lower()
-						]
-						diagnostics["endpoints_accessible"][name]["has_auth_content"] = any(auth_indicators)
+					if resp.status == 200 and method == "GET":
+						result["has_auth_content"] = await _response_contains(resp, _AUTH_INDICATORS)
+					return name, result, None
 			except Exception as e:
-				diagnostics["endpoints_accessible"][name] = {
+				return name, {
 					"status": "error",
 					"error": str(e),
 					"accessible": False,
 					"has_auth_content": False
+				}, f"Failed to access {name}: {e}"
+		
+		# The probes are independent, so run them concurrently on the shared session.
+		# The overall deadline cancels any probe still outstanding when it expires.
+		tasks: Dict[str, asyncio.Task] = {}
+		try:
+			async with asyncio.timeout(DIAGNOSTIC_DEADLINE_SECONDS):
+				async with asyncio.TaskGroup() as tg:
+					for name, url, method in _DIAGNOSTIC_PROBES:
+						tasks[name] = tg.create_task(probe(name, url, method))
+		except TimeoutError:
+			diagnostics["errors"].append(f"Diagnostics timed out after {DIAGNOSTIC_DEADLINE_SECONDS} seconds")
+		
+		for name, task in tasks.items():
+			if task.cancelled():
+				diagnostics["endpoints_accessible"][name] = {
+					"status": "timeout",
+					"accessible": False,
+					"has_auth_content": False
 				}
-				diagnostics["errors"].append(f"Failed to access {name}: {e}")
+				continue
+			_, result, error = task.result()
+			diagnostics["endpoints_accessible"][name] = result
+			if error:
+				diagnostics["errors"].append(error)
 		
 		# Log diagnostic summary
-		_LOGGER.info(f"Authentication Diagnostics:")
-		_LOGGER.info(f"  - Authenticated: {diagnostics['authenticated']}")
-		_LOGGER.info(f"  - Pupil IDs found: {diagnostics['pupil_ids_found']}")
-		_LOGGER.info(f"  - Session cookies: {diagnostics['session_cookies']}")
-		
-		accessible_endpoints = [name for name, info in diagnostics["endpoints_accessible"].items() if info.get("accessible")]
-		_LOGGER.info(f"  - Accessible endpoints: {accessible_endpoints}")
-		
-		auth_endpoints = [name for name, info in diagnostics["endpoints_accessible"].items() if info.get("has_auth_content")]
-		_LOGGER.info(f"  - Endpoints with auth content: {auth_endpoints}")
+		if _LOGGER.isEnabledFor(logging.INFO):
+			_LOGGER.info("Authentication Diagnostics:")
+			_LOGGER.info("  - Authenticated: %s", diagnostics["authenticated"])
+			_LOGGER.info("  - Pupil IDs found: %s", diagnostics["pupil_ids_found"])
+			_LOGGER.info("  - Session cookies: %s", diagnostics["session_cookies"])
+			
+			accessible_endpoints = []
+			auth_endpoints = []
+			for name, info in diagnostics["endpoints_accessible"].items():
+				if info.get("accessible"):
+					accessible_endpoints.append(name)
+				if info.get("has_auth_content"):
+					auth_endpoints.append(name)
+			_LOGGER.info("  - Accessible endpoints: %s", accessible_endpoints)
+			_LOGGER.info("  - Endpoints with auth content: %s", auth_endpoints)
 		
 		if diagnostics["errors"]:
-			_LOGGER.warning(f"  - Errors encountered: {len(diagnostics['errors'])}")
+			_LOGGER.warning("  - Errors encountered: %s", len(diagnostics["errors"]))
 		
 		return diagnostics 
\ No newline at end of file
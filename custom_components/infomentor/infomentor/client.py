@@ -2,8 +2,10 @@
 
 import json
 import logging
+import re
 from datetime import datetime, time, timedelta
-from typing import List, Optional, Dict, Any
+from types import MappingProxyType
+from typing import List, Optional, Dict, Any, Mapping
 
 import aiohttp
 import asyncio
@@ -17,6 +19,59 @@ from .exceptions import InfoMentorAPIError, InfoMentorConnectionError, InfoMento
 
 _LOGGER = logging.getLogger(__name__)
 
+# Hub and dashboard pages are typically 100-300KB; a larger read buffer means
+# fewer chunk reads and buffer growths while aiohttp decompresses the body.
+_READ_BUFSIZE = 262144
+
+# Connection pooling for a client-owned session. Pupil switching and auth
+# diagnostics hit the hub and modern hosts repeatedly, so keep connections and
+# DNS answers around long enough to skip repeated TLS handshakes and lookups.
+_CONNECTOR_LIMIT_PER_HOST = 8
+_CONNECTOR_KEEPALIVE_TIMEOUT = 75
+_CONNECTOR_DNS_CACHE_TTL = 300
+
+# Read-only header sets for the hub's JSON endpoints; aiohttp copies request
+# headers into its own multidict, so one instance serves every call.
+_AJAX_HEADERS: Mapping[str, str] = MappingProxyType({
+	**DEFAULT_HEADERS,
+	"Accept": "application/json, text/javascript, */*; q=0.01",
+	"X-Requested-With": "XMLHttpRequest",
+})
+_AJAX_JSON_POST_HEADERS: Mapping[str, str] = MappingProxyType({
+	**_AJAX_HEADERS,
+	"Content-Type": "application/json; charset=UTF-8",
+})
+_TIMELINE_APP_DATA_HEADERS: Mapping[str, str] = MappingProxyType({
+	**_AJAX_HEADERS,
+	"Content-Length": "0",
+})
+# The entries request has always reused the app-data headers, Content-Length
+# included, so the server answers with its default page
+_TIMELINE_ENTRIES_HEADERS: Mapping[str, str] = MappingProxyType({
+	**_TIMELINE_APP_DATA_HEADERS,
+	"Content-Type": "application/json; charset=UTF-8",
+})
+_MODERN_REFERER_HEADERS: Mapping[str, str] = MappingProxyType({**DEFAULT_HEADERS, "Referer": f"{MODERN_BASE_URL}/"})
+_HUB_LOGIN_REFERER_HEADERS: Mapping[str, str] = MappingProxyType({
+	**DEFAULT_HEADERS,
+	"Referer": f"{HUB_BASE_URL}/authentication/authentication/login?apitype=im1&forceOAuth=true",
+})
+
+
+def create_session() -> aiohttp.ClientSession:
+	"""Create an aiohttp session tuned for the InfoMentor hosts.
+	
+	Used when the client owns its session; callers running outside Home
+	Assistant can use it to share one pooled session across clients. Must be
+	called from within a running event loop.
+	"""
+	connector = aiohttp.TCPConnector(
+		limit_per_host=_CONNECTOR_LIMIT_PER_HOST,
+		keepalive_timeout=_CONNECTOR_KEEPALIVE_TIMEOUT,
+		ttl_dns_cache=_CONNECTOR_DNS_CACHE_TTL,
+	)
+	return aiohttp.ClientSession(connector=connector, auto_decompress=True, read_bufsize=_READ_BUFSIZE)
+
 
 class InfoMentorClient:
 	"""Client for interacting with InfoMentor API."""
@@ -37,7 +92,7 @@ class InfoMentorClient:
 	async def __aenter__(self):
 		"""Async context manager entry."""
 		if self._own_session:
-			self._session = aiohttp.ClientSession()
+			self._session = create_session()
 		self.auth = InfoMentorAuth(self._session, self.storage)
 		return self
 		
@@ -131,11 +186,7 @@ class InfoMentorClient:
 			await self.switch_pupil(pupil_id)
 			
 		url = f"{HUB_BASE_URL}/Communication/News/GetNewsList"
-		headers = DEFAULT_HEADERS.copy()
-		headers.update({
-			"Accept": "application/json, text/javascript, */*; q=0.01",
-			"X-Requested-With": "XMLHttpRequest",
-		})
+		headers = _AJAX_HEADERS
 		
 		try:
 			async with self._session.get(url, headers=headers) as resp:
@@ -190,22 +241,13 @@ class InfoMentorClient:
 			
 		# First, initialise timeline app data
 		app_data_url = f"{HUB_BASE_URL}/grouptimeline/grouptimeline/appData"
-		headers = DEFAULT_HEADERS.copy()
-		headers.update({
-			"Accept": "application/json, text/javascript, */*; q=0.01",
-			"X-Requested-With": "XMLHttpRequest",
-			"Content-Length": "0",
-		})
-		
-		async with self._session.post(app_data_url, headers=headers) as resp:
+		async with self._session.post(app_data_url, headers=_TIMELINE_APP_DATA_HEADERS) as resp:
 			if resp.status != 200:
 				_LOGGER.warning(f"Failed to initialise timeline app data: HTTP {resp.status}")
 		
 		# Get timeline entries
 		timeline_url = f"{HUB_BASE_URL}/GroupTimeline/GroupTimeline/GetGroupTimelineEntries"
-		headers.update({
-			"Content-Type": "application/json; charset=UTF-8",
-		})
+		headers = _TIMELINE_ENTRIES_HEADERS
 		
 		payload = {
 			"page": page,
@@ -326,11 +368,7 @@ class InfoMentorClient:
 	async def _get_timetable_get_primary(self, pupil_id: Optional[str], start_date: datetime, end_date: datetime) -> List[TimetableEntry]:
 		"""Primary GET method for timetable retrieval."""
 		timetable_url = f"{HUB_BASE_URL}/timetable/timetable/gettimetablelist"
-		headers = DEFAULT_HEADERS.copy()
-		headers.update({
-			"Accept": "application/json, text/javascript, */*; q=0.01",
-			"X-Requested-With": "XMLHttpRequest",
-		})
+		headers = _AJAX_HEADERS
 		
 		params = {
 			"startDate": start_date.strftime('%Y-%m-%d'),
@@ -397,7 +435,8 @@ class InfoMentorClient:
 				_LOGGER.warning(f"Response body: {response_text}")
 				
 				# If GET fails with "Invalid Verb" or similar, raise specific error
-				if "invalid verb" in response_text.lower() or "bad request" in response_text.lower():
+				response_lower = response_text.lower()
+				if "invalid verb" in response_lower or "bad request" in response_lower:
 					raise InfoMentorAPIError("GET method not supported for timetable endpoint")
 				
 				raise InfoMentorAPIError(f"Timetable API error: HTTP {resp.status}")
@@ -446,11 +485,7 @@ class InfoMentorClient:
 		# Try GET request first for time registration API (more reliable)
 		try:
 			time_reg_url = f"{HUB_BASE_URL}/TimeRegistration/TimeRegistration/GetTimeRegistrations/"
-			headers = DEFAULT_HEADERS.copy()
-			headers.update({
-				"Accept": "application/json, text/javascript, */*; q=0.01",
-				"X-Requested-With": "XMLHttpRequest",
-			})
+			headers = _AJAX_HEADERS
 			
 			params = {
 				"startDate": start_date.strftime('%Y-%m-%d'),
@@ -513,7 +548,8 @@ class InfoMentorClient:
 					_LOGGER.warning(f"Time registrations response body: {response_text}")
 					
 					# If GET fails with "Invalid Verb", try POST fallback
-					if "invalid verb" in response_text.lower() or "bad request" in response_text.lower():
+					response_lower = response_text.lower()
+					if "invalid verb" in response_lower or "bad request" in response_lower:
 						_LOGGER.info("Time registration GET failed with verb error, trying POST fallback...")
 						return await self._get_time_registration_post_fallback(pupil_id, start_date, end_date, time_reg_url)
 					
@@ -523,11 +559,7 @@ class InfoMentorClient:
 		# Try alternative time registration calendar data endpoint with GET first
 		try:
 			time_cal_url = f"{HUB_BASE_URL}/TimeRegistration/TimeRegistration/GetCalendarData/"
-			headers = DEFAULT_HEADERS.copy()
-			headers.update({
-				"Accept": "application/json, text/javascript, */*; q=0.01",
-				"X-Requested-With": "XMLHttpRequest",
-			})
+			headers = _AJAX_HEADERS
 			
 			params = {
 				"startDate": start_date.strftime('%Y-%m-%d'),
@@ -574,7 +606,8 @@ class InfoMentorClient:
 					_LOGGER.warning(f"Time reg calendar response body: {response_text}")
 					
 					# If GET fails with "Invalid Verb", try POST fallback
-					if "invalid verb" in response_text.lower() or "bad request" in response_text.lower():
+					response_lower = response_text.lower()
+					if "invalid verb" in response_lower or "bad request" in response_lower:
 						_LOGGER.info("Time reg calendar GET failed with verb error, trying POST fallback...")
 						return await self._get_time_registration_post_fallback(pupil_id, start_date, end_date, time_cal_url)
 					
@@ -588,12 +621,7 @@ class InfoMentorClient:
 	async def _get_time_registration_post_fallback(self, pupil_id: Optional[str], start_date: datetime, end_date: datetime, url: str) -> List[TimeRegistrationEntry]:
 		"""Fallback method to try POST for time registration if GET fails."""
 		try:
-			headers = DEFAULT_HEADERS.copy()
-			headers.update({
-				"Accept": "application/json, text/javascript, */*; q=0.01",
-				"X-Requested-With": "XMLHttpRequest",
-				"Content-Type": "application/json; charset=UTF-8",
-			})
+			headers = _AJAX_JSON_POST_HEADERS
 			
 			payload = {
 				"startDate": start_date.strftime('%Y-%m-%d'),
@@ -701,8 +729,7 @@ class InfoMentorClient:
 			'endDate': end_str
 		}
 		
-		headers = DEFAULT_HEADERS.copy()
-		headers["Referer"] = f"{MODERN_BASE_URL}/"
+		headers = _MODERN_REFERER_HEADERS
 		
 		try:
 			async with self._session.get(url, headers=headers, params=params) as resp:
@@ -783,8 +810,7 @@ class InfoMentorClient:
 		# Fallback: Try to extract pupil name from hub page
 		try:
 			hub_url = f"{HUB_BASE_URL}/#/"
-			headers = DEFAULT_HEADERS.copy()
-			headers["Referer"] = f"{HUB_BASE_URL}/authentication/authentication/login?apitype=im1&forceOAuth=true"
+			headers = _HUB_LOGIN_REFERER_HEADERS
 			
 			async with self._session.get(hub_url, headers=headers) as resp:
 				if resp.status == 200:
@@ -810,9 +836,6 @@ class InfoMentorClient:
 		Returns:
 			Pupil name if found, None otherwise
 		"""
-		import re
-		import json
-		
 		# First try to extract from JSON structures (most reliable)
 		name = self._extract_name_from_json_structure(html_content, pupil_id)
 		if name:
@@ -853,9 +876,6 @@ class InfoMentorClient:
 		Returns:
 			Pupil name if found, None otherwise
 		"""
-		import json
-		import re
-		
 		try:
 			# Look for JSON arrays containing pupil data
 			json_patterns = [
@@ -920,8 +940,6 @@ class InfoMentorClient:
 		Returns:
 			True if name appears valid for a pupil
 		"""
-		import re
-		
 		if not name or len(name.strip()) < 2:
 			return False
 		
@@ -970,17 +988,21 @@ class InfoMentorClient:
 		if not self.authenticated or not self.auth:
 			raise InfoMentorAPIError("Not authenticated. Call login() first.")
 		
-		# Log session state for debugging
+		# Log session state for debugging. This runs before every API call, so skip
+		# the cookie jar scan entirely unless debug logging is on.
+		if not _LOGGER.isEnabledFor(logging.DEBUG):
+			return
 		_LOGGER.debug(f"Authentication state: authenticated={self.authenticated}")
 		_LOGGER.debug(f"Auth object: {self.auth is not None}")
 		_LOGGER.debug(f"Pupil IDs: {len(self.auth.pupil_ids) if self.auth else 'None'}")
 		if self._session and hasattr(self._session, 'cookie_jar'):
-			cookie_count = len(self._session.cookie_jar)
-			_LOGGER.debug(f"Session cookies: {cookie_count} cookies")
-			# Log cookie domains for debugging
+			# Count cookies and collect their domains in one pass over the jar
+			cookie_count = 0
 			domains = set()
 			for cookie in self._session.cookie_jar:
+				cookie_count += 1
 				domains.add(cookie.get('domain', 'no-domain'))
+			_LOGGER.debug(f"Session cookies: {cookie_count} cookies")
 			_LOGGER.debug(f"Cookie domains: {domains}")
 		else:
 			_LOGGER.debug("No session or cookie jar available")
@@ -37,6 +37,7 @@ STORAGE_KEY = "infomentor_cache"
 DATA_RETENTION_DAYS = 14  # Keep data for 2 weeks
 AUTH_COOKIE_KEY = "auth_cookies"
 AUTH_COOKIE_TS_KEY = "auth_cookies_updated"
+AUTH_PUPILS_KEY = "auth_pupils"
 LAST_COMPLETE_SCHEDULE_UPDATE_KEY = "last_complete_schedule_update"
 SELECTED_SCHOOL_NUMBER_KEY = "selected_school_number"
 
@@ -318,12 +319,13 @@ class InfoMentorStorage:
 			SELECTED_SCHOOL_NUMBER_KEY: None,
 			AUTH_COOKIE_KEY: {},
 			AUTH_COOKIE_TS_KEY: None,
+			AUTH_PUPILS_KEY: {},
 		}
 		await self._store.async_save(self._data)
 		_LOGGER.info("Cleared all stored data")
 
-	async def save_auth_cookies(self, cookies: Dict[str, str]) -> None:
-		"""Persist authentication cookies for session reuse."""
+	async def save_auth_cookies(self, cookies: Dict[str, Dict[str, str]], pupils: Optional[Dict[str, Any]] = None) -> None:
+		"""Persist authentication cookies per host, and the pupils they were issued for, for session reuse."""
 		if self._data is None:
 			await self.async_load()
 		
@@ -332,11 +334,12 @@ class InfoMentorStorage:
 		
 		self._data[AUTH_COOKIE_KEY] = cookies or {}
 		self._data[AUTH_COOKIE_TS_KEY] = now_utc.isoformat()
+		self._data[AUTH_PUPILS_KEY] = pupils or {}
 		await self._store.async_save(self._data)
-		_LOGGER.debug(f"Saved {len(cookies or {})} authentication cookies")
+		_LOGGER.debug(f"Saved authentication cookies for {len(cookies or {})} hosts")
 
-	async def get_auth_cookies(self) -> tuple[Dict[str, str], Optional[datetime]]:
-		"""Return stored authentication cookies and the timestamp they were saved."""
+	async def get_auth_cookies(self) -> tuple[Dict[str, Any], Optional[datetime]]:
+		"""Return stored authentication cookies (host -> {name: value}) and the timestamp they were saved."""
 		if self._data is None:
 			await self.async_load()
 		
@@ -350,6 +353,13 @@ class InfoMentorStorage:
 				timestamp = None
 		return cookies, timestamp
 
+	async def get_auth_pupils(self) -> Dict[str, Any]:
+		"""Return the pupil details saved alongside the authentication cookies."""
+		if self._data is None:
+			await self.async_load()
+		
+		return self._data.get(AUTH_PUPILS_KEY) or {}
+
 	async def clear_auth_cookies(self) -> None:
 		"""Remove stored authentication cookies."""
 		if self._data is None:
@@ -357,6 +367,7 @@ class InfoMentorStorage:
 		
 		self._data[AUTH_COOKIE_KEY] = {}
 		self._data[AUTH_COOKIE_TS_KEY] = None
+		self._data[AUTH_PUPILS_KEY] = {}
 		await self._store.async_save(self._data)
 		_LOGGER.debug("Cleared stored authentication cookies")
 
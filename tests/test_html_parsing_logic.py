@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Tests for the HTML and embedded JSON parsing helpers."""
+
+import importlib.util
+import sys
+import types
+from pathlib import Path
+
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+PACKAGE_DIR = BASE_DIR / "custom_components" / "infomentor"
+LIB_DIR = PACKAGE_DIR / "infomentor"
+
+
+infomentor_pkg = types.ModuleType("infomentor")
+infomentor_pkg.__path__ = [str(PACKAGE_DIR)]
+sys.modules.setdefault("infomentor", infomentor_pkg)
+
+
+infomentor_sub_pkg = types.ModuleType("infomentor.infomentor")
+infomentor_sub_pkg.__path__ = [str(LIB_DIR)]
+sys.modules.setdefault("infomentor.infomentor", infomentor_sub_pkg)
+
+
+if "infomentor.infomentor.auth" in sys.modules:
+	auth_module = sys.modules["infomentor.infomentor.auth"]
+else:
+	auth_spec = importlib.util.spec_from_file_location("infomentor.infomentor.auth", LIB_DIR / "auth.py")
+	auth_module = importlib.util.module_from_spec(auth_spec)
+	sys.modules["infomentor.infomentor.auth"] = auth_module
+	assert auth_spec and auth_spec.loader
+	auth_spec.loader.exec_module(auth_module)
+
+
+def test_decode_json_at_reads_one_value_and_ignores_the_rest():
+	page = 'IMHome.home.homeData = {"account": {"pupils": [{"id": 111, "name": "Anna \\u00c5"}]}};\nvar x = 1;'
+	match = auth_module._HOMEDATA_RE.search(page)
+	assert auth_module._decode_json_at(page, match.end()) == {"account": {"pupils": [{"id": 111, "name": "Anna Å"}]}}
+
+
+def test_decode_json_at_returns_none_for_invalid_json():
+	page = "var pupils = {id: 111, name: 'Anna'};"
+	assert auth_module._decode_json_at(page, page.index("{")) is None
+	assert auth_module._decode_json_at(page, len(page)) is None
+
+
+OPENID_PAGE = """<html><body onload="document.forms[0].submit()">
+<input type="hidden" name="before" value="x">
+<form method="post" name="openid_message" id='openid_message' action="https://infomentor.se/swedish/production/mentor/">
+<input value="id_res" type="hidden" name="openid.mode"/>
+<input type=hidden name=openid.ns value="http://specs.openid.net/auth/2.0">
+<input type="HIDDEN" name="openid.return_to" value="https://hub.infomentor.se/?a=1&amp;b=2">
+<input type="submit" name="submit" value="Continue">
+</form>
+<input type="hidden" name="after" value="y">
+</body></html>"""
+
+
+def test_parse_openid_form_collects_hidden_inputs_inside_form():
+	action, inputs = auth_module._parse_openid_form(OPENID_PAGE)
+	assert action == "https://infomentor.se/swedish/production/mentor/"
+	assert inputs == {
+		"openid.mode": "id_res",
+		"openid.ns": "http://specs.openid.net/auth/2.0",
+		"openid.return_to": "https://hub.infomentor.se/?a=1&b=2",
+	}
+
+
+def test_parse_openid_form_falls_back_to_legacy_base_url():
+	page = '<form id="openid_message" method="post"><input type="hidden" name="wresult" value="token"></form>'
+	assert auth_module._parse_openid_form(page) == (auth_module.LEGACY_BASE_URL, {"wresult": "token"})
+	assert auth_module._parse_openid_form("<form id='login'></form>") == (auth_module.LEGACY_BASE_URL, {})
+
+
+SCHOOL_PAGE = """<div class="idp-list">
+<span class="title" id="login_ascx_IdpListRepeater_ctl00_title">Avesta kommun, elever</span>
+<span id='login_ascx_IdpListRepeater_ctl01_title'> Övrigt InfoMentor &amp; SSO Test </span>
+<input type="hidden" name="login_ascx$IdpListRepeater$ctl01$url" value="https://ims-grandid-api.infomentor.se/Login/initial?communeId=0000012345" />
+<input value=" https://sso.infomentor.se/login.ashx?idp=avesta_stu " name="login_ascx$IdpListRepeater$ctl00$url" type="hidden">
+<input type="hidden" name="login_ascx$IdpListRepeater$ctl00$number" value="2084">
+<input type="hidden" name="login_ascx$IdpListRepeater$ctl02$url" value="https://sso.infomentor.se/login.ashx?idp=untitled">
+</div>"""
+
+
+def test_parse_school_options_joins_fields_on_control_id():
+	options = auth_module._parse_school_options(SCHOOL_PAGE)
+	SchoolOption = auth_module.SchoolOption
+	assert options == [
+		("01", SchoolOption("Övrigt InfoMentor & SSO Test", "https://ims-grandid-api.infomentor.se/Login/initial?communeId=0000012345")),
+		("00", SchoolOption("Avesta kommun, elever", "https://sso.infomentor.se/login.ashx?idp=avesta_stu", "2084")),
+	]
+
+
+def test_parse_school_options_without_repeater():
+	assert auth_module._parse_school_options("<form><input name='username'></form>") == []
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""Tests for throttling-aware request pacing."""
+
+import asyncio
+import importlib.util
+import sys
+import types
+from pathlib import Path
+
+from yarl import URL
+
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+PACKAGE_DIR = BASE_DIR / "custom_components" / "infomentor"
+LIB_DIR = PACKAGE_DIR / "infomentor"
+
+
+infomentor_pkg = types.ModuleType("infomentor")
+infomentor_pkg.__path__ = [str(PACKAGE_DIR)]
+sys.modules.setdefault("infomentor", infomentor_pkg)
+
+
+infomentor_sub_pkg = types.ModuleType("infomentor.infomentor")
+infomentor_sub_pkg.__path__ = [str(LIB_DIR)]
+sys.modules.setdefault("infomentor.infomentor", infomentor_sub_pkg)
+
+
+if "infomentor.infomentor.auth" in sys.modules:
+	auth_module = sys.modules["infomentor.infomentor.auth"]
+else:
+	auth_spec = importlib.util.spec_from_file_location("infomentor.infomentor.auth", LIB_DIR / "auth.py")
+	auth_module = importlib.util.module_from_spec(auth_spec)
+	sys.modules["infomentor.infomentor.auth"] = auth_module
+	assert auth_spec and auth_spec.loader
+	auth_spec.loader.exec_module(auth_module)
+
+
+HUB_URL = f"{auth_module.HUB_BASE_URL}/"
+LEGACY_URL = auth_module.LEGACY_BASE_URL
+HUB_HOST = URL(HUB_URL).raw_authority
+
+
+class _FakeResponse:
+	def __init__(self, url, status=200, headers=None):
+		self.url = URL(url)
+		self.status = status
+		self.headers = headers or {}
+
+
+class _FakeSession:
+	"""Answer each request with the next queued status and headers."""
+
+	def __init__(self, replies):
+		self._replies = list(replies)
+		self.started = []
+
+	async def request(self, method, url, **kwargs):
+		self.started.append((url, asyncio.get_running_loop().time()))
+		status, headers = self._replies.pop(0) if self._replies else (200, {})
+		return _FakeResponse(url, status, headers)
+
+
+def _hold(pacer, host=HUB_HOST):
+	"""Seconds the host is still held back, measured from now."""
+	return pacer._next_start.get(host, 0.0) - asyncio.get_running_loop().time()
+
+
+def test_retry_after_holds_host_up_to_cap():
+	async def scenario():
+		pacer = auth_module._RequestPacer(0.3)
+		pacer.observe(_FakeResponse(HUB_URL, 429, {"Retry-After": "5"}))
+		assert 4.9 < _hold(pacer) <= 5
+		pacer.observe(_FakeResponse(HUB_URL, 503, {"Retry-After": "3600"}))
+		assert _hold(pacer) <= auth_module.THROTTLE_BACKOFF_MAX
+
+	asyncio.run(scenario())
+
+
+def test_backoff_doubles_without_retry_after():
+	async def scenario():
+		pacer = auth_module._RequestPacer(0.5)
+		for strikes in (1, 2, 3):
+			pacer.observe(_FakeResponse(HUB_URL, 429))
+			assert 0.5 * 2 ** strikes - 0.1 < _hold(pacer) <= 0.5 * 2 ** strikes
+
+	asyncio.run(scenario())
+
+
+def test_exhausted_rate_limit_counts_as_throttling():
+	async def scenario():
+		pacer = auth_module._RequestPacer(0.3)
+		pacer.observe(_FakeResponse(HUB_URL, 200, {"X-RateLimit-Remaining": "0"}))
+		assert _hold(pacer) > 0
+		pacer.observe(_FakeResponse(HUB_URL, 200, {"X-RateLimit-Remaining": "5"}))
+		assert _hold(pacer) <= 0
+
+	asyncio.run(scenario())
+
+
+def test_success_clears_host_and_unthrottled_hosts_never_wait():
+	async def scenario():
+		pacer = auth_module._RequestPacer(10.0)
+		pacer.observe(_FakeResponse(HUB_URL, 429, {"Retry-After": "20"}))
+		loop = asyncio.get_running_loop()
+		start = loop.time()
+		# Another host is not affected by the throttled one
+		await asyncio.wait_for(pacer.wait(LEGACY_URL), 0.1)
+		pacer.observe(_FakeResponse(HUB_URL, 200))
+		for _ in range(3):
+			await asyncio.wait_for(pacer.wait(HUB_URL), 0.1)
+		assert loop.time() - start < 0.1
+
+	asyncio.run(scenario())
+
+
+def test_throttled_host_spaces_requests_by_interval():
+	async def scenario():
+		pacer = auth_module._RequestPacer(0.05)
+		pacer.observe(_FakeResponse(HUB_URL, 429, {"Retry-After": "0"}))
+		loop = asyncio.get_running_loop()
+		starts = []
+
+		async def go():
+			await pacer.wait(HUB_URL)
+			starts.append(loop.time())
+
+		await asyncio.gather(go(), go(), go())
+		gaps = [later - earlier for earlier, later in zip(starts, starts[1:])]
+		assert all(gap >= 0.045 for gap in gaps)
+
+	asyncio.run(scenario())
+
+
+def test_request_paces_every_call():
+	"""A throttling reply delays the next request sent through _request."""
+
+	async def scenario():
+		session = _FakeSession([(429, {}), (200, {}), (200, {})])
+		auth = auth_module.InfoMentorAuth(session)
+		auth._pacer = auth_module._RequestPacer(0.05)
+		for _ in range(3):
+			await auth._request("GET", HUB_URL)
+		(_, first), (_, second), (_, third) = session.started
+		# One strike without Retry-After backs off for twice the interval
+		assert second - first >= 0.095
+		# The successful second reply cleared the throttling again
+		assert third - second < 0.045
+
+	asyncio.run(scenario())
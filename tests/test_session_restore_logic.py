@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""Tests for reusing stored authentication cookies."""
+
+import asyncio
+import importlib.util
+import sys
+import types
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+PACKAGE_DIR = BASE_DIR / "custom_components" / "infomentor"
+LIB_DIR = PACKAGE_DIR / "infomentor"
+
+
+infomentor_pkg = types.ModuleType("infomentor")
+infomentor_pkg.__path__ = [str(PACKAGE_DIR)]
+sys.modules.setdefault("infomentor", infomentor_pkg)
+
+
+infomentor_sub_pkg = types.ModuleType("infomentor.infomentor")
+infomentor_sub_pkg.__path__ = [str(LIB_DIR)]
+sys.modules.setdefault("infomentor.infomentor", infomentor_sub_pkg)
+
+
+if "infomentor.infomentor.auth" in sys.modules:
+	auth_module = sys.modules["infomentor.infomentor.auth"]
+else:
+	auth_spec = importlib.util.spec_from_file_location("infomentor.infomentor.auth", LIB_DIR / "auth.py")
+	auth_module = importlib.util.module_from_spec(auth_spec)
+	sys.modules["infomentor.infomentor.auth"] = auth_module
+	assert auth_spec and auth_spec.loader
+	auth_spec.loader.exec_module(auth_module)
+
+
+PUPILS = {"pupil_ids": ["111"], "pupil_names": {"111": "Anna"}, "switch_ids": {"111": "9001"}}
+
+
+class _FakeMorsel:
+	def __init__(self, value):
+		self.value = value
+
+
+class _FakeCookieJar:
+	"""Record cookie updates; filter_cookies serves what was set for that host."""
+
+	def __init__(self):
+		self.updates = []
+		self._by_host = {}
+
+	def update_cookies(self, cookies, response_url=None):
+		self.updates.append((response_url.host, dict(cookies)))
+		self._by_host.setdefault(response_url.host, {}).update(cookies)
+
+	def filter_cookies(self, url):
+		return {name: _FakeMorsel(value) for name, value in self._by_host.get(url.host, {}).items()}
+
+
+class _FakeSession:
+	def __init__(self):
+		self.cookie_jar = _FakeCookieJar()
+
+
+class _FakeStorage:
+	def __init__(self, cookies, saved_at, pupils):
+		self._cookies = cookies
+		self._saved_at = saved_at
+		self._pupils = pupils
+		self.cleared = False
+
+	async def get_auth_cookies(self):
+		return self._cookies, self._saved_at
+
+	async def get_auth_pupils(self):
+		return self._pupils
+
+	async def clear_auth_cookies(self):
+		self.cleared = True
+
+
+def _make_auth(storage, verified=True):
+	auth = auth_module.InfoMentorAuth(_FakeSession(), storage)
+	auth.verify_calls = 0
+
+	async def verify():
+		auth.verify_calls += 1
+		return verified
+
+	auth._verify_authentication_status = verify
+	return auth
+
+
+def _stored_cookies():
+	return {
+		"hub.infomentor.se": {"ASP.NET_SessionId": "hub-session", ".ASPXAUTH": "token"},
+		"infomentor.se": {"ASP.NET_SessionId": "legacy-session"},
+	}
+
+
+def _hours_ago(hours):
+	return datetime.now(timezone.utc) - timedelta(hours=hours)
+
+
+def test_restore_adopts_stored_pupils():
+	auth = _make_auth(_FakeStorage(_stored_cookies(), _hours_ago(1), PUPILS))
+	assert asyncio.run(auth.try_restore_session()) is True
+	assert auth.authenticated is True
+	assert auth.pupil_ids == ["111"]
+	assert auth.pupil_switch_ids == {"111": "9001"}
+
+
+def test_restore_without_pupil_snapshot_falls_back_to_login():
+	"""Cookies saved without pupils cannot serve the coordinator; no probes are sent."""
+	auth = _make_auth(_FakeStorage(_stored_cookies(), _hours_ago(1), {}))
+	assert asyncio.run(auth.try_restore_session()) is False
+	assert auth.authenticated is False
+	assert auth.verify_calls == 0
+
+
+def test_restored_session_keeps_its_remaining_lifetime():
+	"""A 7 h old session expires in about an hour, not a fresh AUTH_TTL_SECONDS."""
+	auth = _make_auth(_FakeStorage(_stored_cookies(), _hours_ago(7), PUPILS))
+	assert asyncio.run(auth.try_restore_session()) is True
+	remaining = auth._auth_expires_at - auth_module.time.monotonic()
+	assert auth_module.AUTH_TTL_SECONDS - 7 * 3600 - 60 < remaining <= auth_module.AUTH_TTL_SECONDS - 7 * 3600
+
+
+def test_expired_or_undated_cookies_are_cleared_without_probing():
+	for saved_at in (_hours_ago(9), None):
+		storage = _FakeStorage(_stored_cookies(), saved_at, PUPILS)
+		auth = _make_auth(storage)
+		assert asyncio.run(auth.try_restore_session()) is False
+		assert storage.cleared is True
+		assert auth.verify_calls == 0
+
+
+def test_cookies_are_restored_to_their_own_host():
+	"""A cookie name shared by several hosts keeps each host's value."""
+	auth = _make_auth(_FakeStorage(_stored_cookies(), _hours_ago(1), PUPILS))
+	assert asyncio.run(auth.try_restore_session()) is True
+	assert sorted(auth.session.cookie_jar.updates) == sorted(_stored_cookies().items())
+
+	backup, essential = auth._snapshot_cookies()
+	assert backup == _stored_cookies()
+	assert essential == {"ASP.NET_SessionId", ".ASPXAUTH"}
+
+
+def test_single_host_cookie_format_falls_back_to_login():
+	"""Cookies stored as one flat dict by earlier versions are not replayed."""
+	flat = {"ASP.NET_SessionId": "abc", ".ASPXAUTH": "token"}
+	auth = _make_auth(_FakeStorage(flat, _hours_ago(1), PUPILS))
+	assert asyncio.run(auth.try_restore_session()) is False
+	assert auth.session.cookie_jar.updates == []
+	assert auth.verify_calls == 0
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""Tests for the pupil switch ID mapping and switch confirmation."""
+
+import asyncio
+import importlib.util
+import json
+import sys
+import types
+from pathlib import Path
+
+from yarl import URL
+
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+PACKAGE_DIR = BASE_DIR / "custom_components" / "infomentor"
+LIB_DIR = PACKAGE_DIR / "infomentor"
+
+
+infomentor_pkg = types.ModuleType("infomentor")
+infomentor_pkg.__path__ = [str(PACKAGE_DIR)]
+sys.modules.setdefault("infomentor", infomentor_pkg)
+
+
+infomentor_sub_pkg = types.ModuleType("infomentor.infomentor")
+infomentor_sub_pkg.__path__ = [str(LIB_DIR)]
+sys.modules.setdefault("infomentor.infomentor", infomentor_sub_pkg)
+
+
+if "infomentor.infomentor.auth" in sys.modules:
+	auth_module = sys.modules["infomentor.infomentor.auth"]
+else:
+	auth_spec = importlib.util.spec_from_file_location("infomentor.infomentor.auth", LIB_DIR / "auth.py")
+	auth_module = importlib.util.module_from_spec(auth_spec)
+	sys.modules["infomentor.infomentor.auth"] = auth_module
+	assert auth_spec and auth_spec.loader
+	auth_spec.loader.exec_module(auth_module)
+
+
+HUB_ROOT = f"{auth_module.HUB_BASE_URL}/"
+HUB_HASH = f"{auth_module.HUB_BASE_URL}/#/"
+
+PUPILS_PAGE = "<script>IMHome.home.homeData = %s;</script>" % json.dumps(
+	{"account": {"pupils": [{"id": 111, "name": "Anna"}, {"id": 222, "name": "Ben"}]}}
+)
+SWITCH_ENTRIES = (
+	'{"switchPupilUrl": "/Account/PupilSwitcher/SwitchPupil/9001", "name": "Anna", "hybridMappingId": "x|111|y"}, '
+	'{"switchPupilUrl": "/Account/PupilSwitcher/SwitchPupil/9002", "name": "Ben", "hybridMappingId": "x|222|y"}'
+)
+HUB_PAGE = f"{PUPILS_PAGE}<script>var pupils = [{SWITCH_ENTRIES}];</script>"
+LOGIN_ERROR_PAGE = (
+	'<h1>Hoppsan</h1><a href="https://hub.infomentor.se/Authentication/Authentication/Login?x=1">Loginsida</a>'
+)
+
+
+class _FakeContent:
+	def __init__(self, data):
+		self._data = data
+		self.bytes_read = 0
+
+	async def iter_chunked(self, size):
+		for start in range(0, len(self._data), size):
+			chunk = self._data[start:start + size]
+			self.bytes_read += len(chunk)
+			yield chunk
+
+
+class _FakeResponse:
+	def __init__(self, url, text, status=200):
+		self.url = URL(url)
+		self.status = status
+		self.headers = {}
+		self.charset = "utf-8"
+		self.content = _FakeContent(text.encode("utf-8"))
+		self._text = text
+
+	async def text(self):
+		return self._text
+
+	def release(self):
+		pass
+
+	async def __aenter__(self):
+		return self
+
+	async def __aexit__(self, *exc_info):
+		return False
+
+
+class _FakeSession:
+	"""Serve queued pages per URL; the last page for a URL repeats."""
+
+	def __init__(self, pages, delays=None, statuses=None):
+		self._pages = {url: list(texts) for url, texts in pages.items()}
+		self._delays = delays or {}
+		self._statuses = statuses or {}
+		self.requested = []
+		self.responses = []
+		self.cancelled = []
+
+	async def request(self, method, url, **kwargs):
+		self.requested.append(url)
+		if url in self._delays:
+			try:
+				await asyncio.sleep(self._delays[url])
+			except asyncio.CancelledError:
+				self.cancelled.append(url)
+				raise
+		texts = self._pages.get(url, ["<html></html>"])
+		text = texts.pop(0) if len(texts) > 1 else texts[0]
+		resp = _FakeResponse(url, text, self._statuses.get(url, 200))
+		self.responses.append(resp)
+		return resp
+
+
+async def _discover_and_map(session, reauthenticate=None):
+	auth = auth_module.InfoMentorAuth(session)
+	if reauthenticate is not None:
+		auth.reauthenticate = reauthenticate
+	auth.pupil_ids = await auth._get_pupil_ids_modern()
+	await auth._build_switch_id_mapping()
+	return auth
+
+
+def test_mapping_reuses_hub_root_page():
+	"""The unmodified hub root already lists the switch URLs; it is not fetched again."""
+	session = _FakeSession({HUB_ROOT: [HUB_PAGE]})
+	auth = asyncio.run(_discover_and_map(session))
+	assert auth.pupil_switch_ids == {"111": "9001", "222": "9002"}
+	assert HUB_HASH not in session.requested
+
+
+def test_mapping_fetches_hub_after_fallback_discovery():
+	"""Pupils read from a page other than the served hub root must not feed the mapping."""
+	session = _FakeSession({
+		# Login error page first; after re-authentication the dashboard lists
+		# the pupils but none of their switch URLs
+		HUB_ROOT: [LOGIN_ERROR_PAGE, PUPILS_PAGE],
+		HUB_HASH: [HUB_PAGE],
+	})
+
+	async def reauthenticate():
+		return True
+
+	auth = asyncio.run(_discover_and_map(session, reauthenticate))
+	assert auth.pupil_ids == ["111", "222"]
+	assert auth.pupil_switch_ids == {"111": "9001", "222": "9002"}
+	assert HUB_HASH in session.requested
+
+
+def test_switch_confirmation_stops_reading_at_selected_pupil():
+	"""Only the start of the dashboard is read to find the selected pupil."""
+	page = 'var data = {selectedPupilName: "Ben"};' + "<div></div>" * 100_000
+	session = _FakeSession({HUB_ROOT: [page]})
+	auth = auth_module.InfoMentorAuth(session)
+	auth.pupil_names = {"111": "Anna", "222": "Ben"}
+
+	assert asyncio.run(auth._confirm_pupil_switch("222")) is True
+	assert asyncio.run(auth._confirm_pupil_switch("111")) is False
+	total = len(page.encode("utf-8"))
+	assert all(resp.content.bytes_read < total // 10 for resp in session.responses)
+
+
+def test_hedged_switch_is_confirmed_once(monkeypatch):
+	"""Both switch endpoints may fire, but the dashboard is checked only for the winner."""
+	monkeypatch.setattr(auth_module, "SWITCH_HEDGE_DELAY", 0)
+	hub_switch = f"{auth_module.HUB_BASE_URL}/Account/PupilSwitcher/SwitchPupil/9002"
+	modern_switch = f"{auth_module.MODERN_BASE_URL}/Account/PupilSwitcher/SwitchPupil/9002"
+	session = _FakeSession({HUB_ROOT: ['var data = {selectedPupilName: "Ben"};']}, delays={hub_switch: 0.01, modern_switch: 0.01})
+	auth = auth_module.InfoMentorAuth(session)
+	auth.pupil_ids = ["111", "222"]
+	auth.pupil_names = {"111": "Anna", "222": "Ben"}
+	auth.pupil_switch_ids = {"222": "9002"}
+
+	assert asyncio.run(auth.switch_pupil("222")) is True
+	assert hub_switch in session.requested and modern_switch in session.requested
+	assert session.requested.count(HUB_ROOT) == 1
+
+
+HUB_SWITCH = f"{auth_module.HUB_BASE_URL}/Account/PupilSwitcher/SwitchPupil/%s"
+MODERN_SWITCH = f"{auth_module.MODERN_BASE_URL}/Account/PupilSwitcher/SwitchPupil/%s"
+
+
+def _switch_auth(session):
+	"""An authenticated client for Anna (9001) and Ben (9002) with no selection marker on the hub."""
+	auth = auth_module.InfoMentorAuth(session)
+	auth.pupil_ids = ["111", "222"]
+	auth.pupil_names = {"111": "Anna", "222": "Ben"}
+	auth.pupil_switch_ids = {"111": "9001", "222": "9002"}
+	return auth
+
+
+def test_concurrent_switches_to_same_pupil_share_one_request(monkeypatch):
+	monkeypatch.setattr(auth_module, "SWITCH_HEDGE_DELAY", 10)
+	session = _FakeSession({}, delays={HUB_SWITCH % "9002": 0.01})
+	auth = _switch_auth(session)
+
+	async def scenario():
+		return await asyncio.gather(auth.switch_pupil("222"), auth.switch_pupil("222"), auth.switch_pupil("222"))
+
+	assert asyncio.run(scenario()) == [True, True, True]
+	assert session.requested.count(HUB_SWITCH % "9002") == 1
+	assert session.requested.count(HUB_ROOT) == 1
+	assert auth._inflight_switch == {}
+
+
+def test_switch_to_other_pupil_waits_for_running_switch(monkeypatch):
+	"""The second pupil's switch is only sent after the first one has been confirmed."""
+	monkeypatch.setattr(auth_module, "SWITCH_HEDGE_DELAY", 10)
+	session = _FakeSession({}, delays={HUB_SWITCH % "9001": 0.02})
+	auth = _switch_auth(session)
+
+	async def scenario():
+		return await asyncio.gather(auth.switch_pupil("111"), auth.switch_pupil("222"))
+
+	assert asyncio.run(scenario()) == [True, True]
+	assert session.requested == [HUB_SWITCH % "9001", HUB_ROOT, HUB_SWITCH % "9002", HUB_ROOT]
+	assert auth._current_pupil_id == "222"
+
+
+def test_recent_switch_is_reused_until_ttl_expires(monkeypatch):
+	monkeypatch.setattr(auth_module, "SWITCH_HEDGE_DELAY", 10)
+	session = _FakeSession({})
+	auth = _switch_auth(session)
+
+	assert asyncio.run(auth.switch_pupil("222")) is True
+	sent = len(session.requested)
+	assert asyncio.run(auth.switch_pupil("222")) is True
+	assert len(session.requested) == sent
+
+	auth._current_pupil_at -= auth_module.PUPIL_SWITCH_TTL_SECONDS
+	assert asyncio.run(auth.switch_pupil("222")) is True
+	assert session.requested.count(HUB_SWITCH % "9002") == 2
+
+
+def test_hedge_winner_cancels_slow_hub_request(monkeypatch):
+	monkeypatch.setattr(auth_module, "SWITCH_HEDGE_DELAY", 0)
+	session = _FakeSession({}, delays={HUB_SWITCH % "9002": 10})
+	auth = _switch_auth(session)
+
+	async def scenario():
+		return await asyncio.wait_for(auth.switch_pupil("222"), 1)
+
+	assert asyncio.run(scenario()) is True
+	assert MODERN_SWITCH % "9002" in session.requested
+	assert session.cancelled == [HUB_SWITCH % "9002"]
+	assert auth._current_pupil_id == "222"
+
+
+def test_switch_fails_when_both_endpoints_fail(monkeypatch):
+	monkeypatch.setattr(auth_module, "SWITCH_HEDGE_DELAY", 0)
+	session = _FakeSession({}, statuses={HUB_SWITCH % "9002": 500, MODERN_SWITCH % "9002": 400})
+	auth = _switch_auth(session)
+
+	assert asyncio.run(auth.switch_pupil("222")) is False
+	assert HUB_ROOT not in session.requested
+	assert auth._current_pupil_id is None
+	assert auth._inflight_switch == {}